@@ -3,11 +3,14 @@ from parsons import Table
 import re
 from parsons.utilities import check_env
 from parsons.utilities.api_connector import APIConnector
+from parsons.utilities.paginator import prefetch_pages, PREFETCH_PAGES
 import logging
 
 logger = logging.getLogger(__name__)
 
 API_URL = 'https://actionnetwork.org/api/v2'
+# Action Network allows 4 requests per second
+API_RATE_LIMIT = 4
 
 
 class ActionNetwork(object):
@@ -24,7 +27,8 @@ class ActionNetwork(object):
             "OSDI-API-Token": self.api_token
         }
         self.api_url = API_URL
-        self.api = APIConnector(self.api_url, headers=self.headers)
+        self.api = APIConnector(self.api_url, headers=self.headers, rate_limit=API_RATE_LIMIT,
+                                max_concurrent_requests=PREFETCH_PAGES)
 
     def _get_page(self, object_name, page, per_page=25, filter=None):
         # returns data from one page of results
@@ -45,20 +49,12 @@ class ActionNetwork(object):
         # event_campaigns, campaigns, advocacy_campaigns, signatures, attendances, submissions,
         # donations and outreaches.
         # See Action Network API docs for more info: https://actionnetwork.org/docs/v2/
-        count = 0
-        page = 1
-        return_list = []
-        while True:
-            response = self._get_page(object_name, page, per_page, filter=filter)
-            page = page + 1
-            response_list = response['_embedded'][f"osdi:{object_name}"]
-            if not response_list:
-                return Table(return_list)
-            return_list.extend(response_list)
-            count = count + len(response_list)
-            if limit:
-                if count >= limit:
-                    return Table(return_list[0:limit])
+        # The page numbers are known in advance, so request several pages at once
+        pages = prefetch_pages(
+            get_page=lambda page: self._get_page(object_name, page, per_page, filter=filter),
+            get_items=lambda response: response['_embedded'][f"osdi:{object_name}"],
+            start=1, limit=limit)
+        return Table.from_pages(pages)
 
     def get_people(self, limit=None, per_page=25, page=None, filter=None):
         """
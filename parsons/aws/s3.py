@@ -1,11 +1,33 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import re
+import string
+import time
 import boto3
-from parsons.utilities import files
+from parsons.utilities import files, multipart
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
+# The number of objects or byte ranges to download at once
+S3_WORKERS = 8
+
+# The number of bytes to fetch in each ranged request when streaming objects
+S3_RANGE_SIZE = 8 * 1024 * 1024
+
+# The maximum number of keys S3 will delete in one request
+S3_DELETE_BATCH_SIZE = 1000
+
+# The number of times to try copying a key in transfer_bucket
+S3_TRANSFER_ATTEMPTS = 3
+
+# Parallel listings split the keys after the prefix into ranges that start at each of these
+# characters, which covers the printable ascii characters keys usually start with. Keys that
+# start with other characters are still listed, in the first or last range.
+_KEY_SHARD_CHARS = sorted(string.digits + string.ascii_letters + string.punctuation)
+
 
 class AWSConnection(object):
 
@@ -102,7 +124,7 @@ class S3(object):
         return bucket in self.list_buckets()
 
     def list_keys(self, bucket, prefix=None, suffix=None, regex=None,
-                  date_modified_before=None, date_modified_after=None,
+                  date_modified_before=None, date_modified_after=None, workers=1,
                   **kwargs):
         """
         List the keys in a bucket, along with extra info about each one.
@@ -120,6 +142,10 @@ class S3(object):
                 Limits the response to keys with date modified before
             date_modified_after: datetime.datetime
                 Limits the response to keys with date modified after
+            workers: int
+                The number of listing requests to make at once. If more than 1, the keys are
+                split into ranges by the character after the prefix, and the ranges are listed
+                concurrently. Useful for buckets with many thousands of keys.
             kwargs:
                 Additional arguments for the S3 API call. See `AWS ListObjectsV2 documentation
                 <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Client.list_objects_v2>`_
@@ -130,49 +156,71 @@ class S3(object):
                 'Size', and 'Owner'.
         """
 
-        keys_dict = dict()
         logger.debug(f'Fetching keys in {bucket} bucket')
 
-        continuation_token = None
+        def matches(key):
 
-        while True:
-            args = {'Bucket': bucket}
-            if prefix:
-                args['Prefix'] = prefix
-            if continuation_token:
-                args['ContinuationToken'] = continuation_token
-            args.update(kwargs)
+            # Match suffix
+            if suffix and not key['Key'].endswith(suffix):
+                return False
 
-            resp = self.client.list_objects_v2(**args)
+            # Regex matching
+            if regex and not bool(re.search(regex, key['Key'])):
+                return False
 
-            for key in resp.get('Contents', []):
+            # Match timestamp parsing
+            if date_modified_before and not key['LastModified'] < date_modified_before:
+                return False
 
-                # Match suffix
-                if suffix and not key['Key'].endswith(suffix):
-                    continue
+            if date_modified_after and not key['LastModified'] > date_modified_after:
+                return False
 
-                # Regex matching
-                if regex and not bool(re.search(regex, key['Key'])):
-                    continue
-
-                # Match timestamp parsing
-                if date_modified_before and not key['LastModified'] < date_modified_before:
-                    continue
-
-                if date_modified_after and not key['LastModified'] > date_modified_after:
-                    continue
-
-                # Convert date to iso string
-                key['LastModified'] = key['LastModified'].isoformat()
+            return True
 
-                # Add to output dict
-                keys_dict[key.get('Key')] = key
+        def list_range(start_after, end):
+            # List the keys after start_after, up to and including end
+            keys = []
+            continuation_token = None
+
+            while True:
+                args = {'Bucket': bucket}
+                if prefix:
+                    args['Prefix'] = prefix
+                if start_after:
+                    args['StartAfter'] = start_after
+                if continuation_token:
+                    args['ContinuationToken'] = continuation_token
+                args.update(kwargs)
+
+                resp = self.client.list_objects_v2(**args)
+
+                for key in resp.get('Contents', []):
+                    if end is not None and key['Key'] > end:
+                        return keys
+
+                    if matches(key):
+                        # Convert date to iso string
+                        key['LastModified'] = key['LastModified'].isoformat()
+                        keys.append(key)
+
+                # If more than 1000 results, continue with token
+                if resp.get('NextContinuationToken'):
+                    continuation_token = resp['NextContinuationToken']
+                else:
+                    return keys
+
+        if workers > 1 and 'StartAfter' not in kwargs:
+            # Split the keys into consecutive ranges, which together cover every key
+            bounds = [f'{prefix or ""}{char}' for char in _KEY_SHARD_CHARS]
+            ranges = list(zip([None] + bounds, bounds + [None]))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                shards = list(executor.map(lambda r: list_range(*r), ranges))
+        else:
+            shards = [list_range(None, None)]
 
-            # If more than 1000 results, continue with token
-            if resp.get('NextContinuationToken'):
-                continuation_token = resp['NextContinuationToken']
-            else:
-                break
+        # Add to output dict
+        keys_dict = {key['Key']: key for shard in shards for key in shard}
 
         logger.debug(f'Retrieved {len(keys_dict)} keys')
         return keys_dict
@@ -249,6 +297,60 @@ class S3(object):
 
         self.client.upload_file(local_path, bucket, key, ExtraArgs={'ACL': acl, **kwargs})
 
+    def put_stream(self, bucket, key, parts, acl='bucket-owner-full-control',
+                   workers=multipart.MULTIPART_WORKERS, **kwargs):
+        """
+        Uploads an object to an S3 bucket from parts of its contents, without writing it to a
+        local file. The parts are sent as a multipart upload, uploading several at once while
+        later parts are still being produced. If there is only one part, it is uploaded with
+        a single request. If the upload fails, it is aborted.
+
+        `Args:`
+            bucket: str
+                The bucket name
+            key: str
+                The object key
+            parts: iterable
+                The contents of the object, as bytes. Every part but the last must be at least
+                5 MB.
+            acl: str
+                The S3 permissions on the file
+            workers: int
+                The number of parts to upload at once
+            kwargs:
+                Additional arguments for the S3 API call. See `AWS Create Multipart Upload
+                documentation
+                <https://docs.aws.amazon.com/AmazonS3/latest/API/API_CreateMultipartUpload.html>`_
+                for more info.
+        """
+
+        parts = iter(parts)
+        first = next(parts, b'')
+        second = next(parts, None)
+
+        if second is None:
+            self.client.put_object(Bucket=bucket, Key=key, Body=first, ACL=acl, **kwargs)
+            return
+
+        upload_id = self.client.create_multipart_upload(
+            Bucket=bucket, Key=key, ACL=acl, **kwargs)['UploadId']
+
+        def upload_part(number, data):
+            response = self.client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                               PartNumber=number, Body=data)
+            return {'ETag': response['ETag'], 'PartNumber': number}
+
+        try:
+            uploaded = multipart.upload_parts(itertools.chain([first, second], parts),
+                                              upload_part, workers=workers)
+            self.client.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id,
+                                                  MultipartUpload={'Parts': uploaded})
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            raise
+
+        logger.info(f'Uploaded {len(uploaded)} parts to {bucket}/{key}.')
+
     def remove_file(self, bucket, key):
         """
         Deletes an object from an S3 bucket
@@ -264,6 +366,43 @@ class S3(object):
 
         self.client.delete_object(Bucket=bucket, Key=key)
 
+    def remove_files(self, bucket, keys, workers=S3_WORKERS):
+        """
+        Deletes several objects from an S3 bucket, in batches of up to 1,000 keys per request,
+        with several batches deleted at once.
+
+        `Args:`
+            bucket: str
+                The bucket name
+            keys: list
+                The object keys
+            workers: int
+                The number of batches to delete at once
+        `Returns:`
+            list
+                The keys that could not be deleted
+        """
+
+        keys = list(keys)
+        batches = [keys[i:i + S3_DELETE_BATCH_SIZE]
+                   for i in range(0, len(keys), S3_DELETE_BATCH_SIZE)]
+
+        def delete_batch(batch):
+            resp = self.client.delete_objects(
+                Bucket=bucket,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True})
+            return resp.get('Errors', [])
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            errors = [error for batch_errors in executor.map(delete_batch, batches)
+                      for error in batch_errors]
+
+        for error in errors:
+            logger.error(f"Failed to delete {error['Key']}: {error.get('Message')}")
+
+        logger.info(f'Deleted {len(keys) - len(errors)} keys from {bucket}.')
+        return [error['Key'] for error in errors]
+
     def get_file(self, bucket, key, local_path=None, **kwargs):
         """
         Download an object from S3 to a local file
@@ -294,6 +433,92 @@ class S3(object):
 
         return local_path
 
+    def get_files(self, objects, workers=S3_WORKERS):
+        """
+        Download several objects from S3 to local temp files at once
+
+        `Args:`
+            objects: list
+                A list of ``(bucket, key)`` tuples
+            workers: int
+                The number of objects to download at once
+        `Returns:`
+            list
+                The paths of the new files, in the same order as ``objects``
+        """
+
+        paths = [files.create_temp_file_for_path(key) for _, key in objects]
+
+        def download(bucket, key, local_path):
+            # Clients (unlike resources) are safe to share between threads
+            self.client.download_file(bucket, key, local_path)
+            return local_path
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(download, bucket, key, path)
+                       for (bucket, key), path in zip(objects, paths)]
+            return [future.result() for future in futures]
+
+    def iter_ranges(self, objects, sizes=None, range_size=S3_RANGE_SIZE, prefetch=S3_WORKERS):
+        """
+        Read the contents of several objects from S3, without writing them to disk, as a
+        stream of byte ranges. The ranges are fetched with concurrent ranged GET requests,
+        keeping up to ``prefetch`` ahead of the consumer (including across the end of one
+        object and the start of the next), so at most ``prefetch * range_size`` bytes are
+        held in memory.
+
+        `Args:`
+            objects: list
+                A list of ``(bucket, key)`` tuples
+            sizes: list
+                The size of each object in bytes, if known. Otherwise each object's size is
+                looked up first.
+            range_size: int
+                The number of bytes to fetch in each request
+            prefetch: int
+                The number of ranges to fetch at once
+        `Returns:`
+            generator
+                ``(index, bytes)`` tuples, where ``index`` is the position of the range's
+                object in ``objects``. Ranges are yielded in order.
+        """
+
+        objects = list(objects)
+
+        def get_size(bucket, key):
+            return self.client.head_object(Bucket=bucket, Key=key)['ContentLength']
+
+        def get_range(index, start, end):
+            bucket, key = objects[index]
+            response = self.client.get_object(Bucket=bucket, Key=key,
+                                              Range=f'bytes={start}-{end}')
+            return response['Body'].read()
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            if sizes is None:
+                sizes = list(executor.map(get_size, *zip(*objects))) if objects else []
+
+            ranges = ((index, start, min(start + range_size, size) - 1)
+                      for index, size in enumerate(sizes)
+                      for start in range(0, size, range_size))
+
+            pending = deque()
+            try:
+                for index, start, end in ranges:
+                    if len(pending) >= prefetch:
+                        index_, future = pending.popleft()
+                        yield index_, future.result()
+
+                    pending.append((index, executor.submit(get_range, index, start, end)))
+
+                while pending:
+                    index_, future = pending.popleft()
+                    yield index_, future.result()
+
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
     def get_url(self, bucket, key, expires_in=3600):
         """
         Generates a presigned url for an s3 object.
@@ -318,7 +543,8 @@ class S3(object):
     def transfer_bucket(self, origin_bucket, origin_key, destination_bucket,
                         destination_key=None, suffix=None, regex=None,
                         date_modified_before=None, date_modified_after=None,
-                        public_read=False, remove_original=False, **kwargs):
+                        public_read=False, remove_original=False, workers=S3_WORKERS,
+                        list_workers=1, **kwargs):
         """
         Transfer files between s3 buckets
 
@@ -344,6 +570,11 @@ class S3(object):
                 If the keys should be set to `public-read`
             remove_original: bool
                 If the original keys should be removed after transfer
+            workers: int
+                The number of keys to copy at once. Each copy is tried up to three times.
+            list_workers: int
+                The number of requests to list the keys of a prefix with at once. Only worth
+                raising for prefixes with many thousands of keys. See :meth:`list_keys`.
             kwargs:
                 Additional arguments for the S3 API call. See `AWS download_file docs
                 <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Client.copy>`_
@@ -360,13 +591,14 @@ class S3(object):
                 suffix=suffix,
                 regex=regex,
                 date_modified_before=date_modified_before,
-                date_modified_after=date_modified_after
+                date_modified_after=date_modified_after,
+                workers=list_workers
             )
             key_list = [value['Key'] for value in resp.values()]
         else:
             key_list = [origin_key]
 
-        for key in key_list:
+        def transfer(key):
             # If destination_key is prefix, replace
             if destination_key and destination_key.endswith('/'):
                 dest_key = key.replace(origin_key, destination_key)
@@ -380,15 +612,42 @@ class S3(object):
                 dest_key = key
 
             copy_source = {'Bucket': origin_bucket, 'Key': key}
-            self.client.copy(copy_source, destination_bucket, dest_key, ExtraArgs=kwargs)
-            if remove_original:
+
+            for attempt in range(1, S3_TRANSFER_ATTEMPTS + 1):
                 try:
-                    self.remove_file(origin_bucket, origin_key)
+                    self.client.copy(copy_source, destination_bucket, dest_key,
+                                     ExtraArgs=kwargs)
+                    break
                 except Exception as e:
-                    logger.error('Failed to delete original key: ' + str(e))
+                    if attempt == S3_TRANSFER_ATTEMPTS:
+                        raise
+                    logger.warning(f'Retrying transfer of {key}: {e}')
+                    time.sleep(2 ** attempt)
 
             if public_read:
-                object_acl = self.s3.ObjectAcl(destination_bucket, destination_key)
-                object_acl.put(ACL='public-read')
+                self.client.put_object_acl(Bucket=destination_bucket, Key=dest_key,
+                                           ACL='public-read')
+
+        transferred = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(transfer, key) for key in key_list]
+            try:
+                for future in futures:
+                    future.result()
+                    transferred += 1
+                    if transferred % 1000 == 0:
+                        logger.info(f'Transferred {transferred} of {len(key_list)} keys.')
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        logger.info(f'Transferred {transferred} keys to {destination_bucket}.')
+
+        # Only remove the originals once they have all been copied
+        if remove_original:
+            try:
+                self.remove_files(origin_bucket, key_list, workers=workers)
+            except Exception as e:
+                logger.error('Failed to delete original keys: ' + str(e))
 
         logger.info(f'Finished syncing {len(key_list)} keys')
@@ -0,0 +1,132 @@
+import csv
+import gzip
+import io
+import itertools
+import operator
+
+import petl
+
+from parsons.aws.s3 import S3_RANGE_SIZE, S3_WORKERS
+from parsons.utilities import files
+
+__all__ = [
+    'S3CSVView',
+]
+
+
+class _ChunkReader(io.RawIOBase):
+    # A read-only, file-like object over an iterator of byte strings
+
+    def __init__(self, chunks):
+
+        super().__init__()
+        self._chunks = chunks
+        self._buffer = memoryview(b'')
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+
+        # Track an offset into the current chunk, rather than slicing off what has been read,
+        # which would copy the rest of the chunk on every read
+        while self._offset >= len(self._buffer):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+            self._offset = 0
+
+        size = min(len(b), len(self._buffer) - self._offset)
+        b[:size] = self._buffer[self._offset:self._offset + size]
+        self._offset += size
+
+        return size
+
+
+class S3CSVView(petl.Table):
+    """
+    A petl table that reads CSV files (optionally gzip compressed) directly from S3, without
+    writing them to disk. The files are fetched as concurrent ranged GET requests, which are
+    decompressed and parsed as they arrive, and a bounded number of ranges are fetched ahead
+    of the parser. The files are read one after another as a single table.
+
+    Every file must have a header row, with the same columns. Empty files are skipped. Zip
+    archives can't be read as a stream.
+
+    `Args:`
+        s3: :class:`parsons.S3`
+            The S3 connector
+        objects: list
+            A list of ``(bucket, key)`` tuples
+        sizes: list
+            The size of each object in bytes, if known (eg. from a manifest)
+        range_size: int
+            The number of bytes to fetch in each request
+        prefetch: int
+            The number of ranges to fetch at once
+        encoding: str
+            The encoding of the files. Defaults to the system default, as for ``petl.fromcsv``.
+        errors: str
+            How to handle encoding errors
+        \**csvargs: kwargs
+            ``csv_reader`` optional arguments
+    """  # noqa: W605
+
+    def __init__(self, s3, objects, sizes=None, range_size=S3_RANGE_SIZE, prefetch=S3_WORKERS,
+                 encoding=None, errors='strict', **csvargs):
+
+        for _, key in objects:
+            if files.is_zip_path(key):
+                raise ValueError(f'Zip archives cannot be streamed from S3: {key}')
+
+        self.s3 = s3
+        self.objects = list(objects)
+        self.sizes = sizes
+        self.range_size = range_size
+        self.prefetch = prefetch
+        self.encoding = encoding
+        self.errors = errors
+        self.csvargs = csvargs
+
+    def __iter__(self):
+
+        ranges = self.s3.iter_ranges(self.objects, sizes=self.sizes, range_size=self.range_size,
+                                     prefetch=self.prefetch)
+        header = None
+
+        try:
+            for index, chunks in itertools.groupby(ranges, key=operator.itemgetter(0)):
+                key = self.objects[index][1]
+                stream = io.BufferedReader(_ChunkReader(data for _, data in chunks))
+                if files.is_gzip_path(key):
+                    stream = gzip.GzipFile(fileobj=stream)
+
+                text = io.TextIOWrapper(stream, encoding=self.encoding, errors=self.errors,
+                                        newline='')
+                reader = csv.reader(text, **self.csvargs)
+
+                file_header = next(reader, None)
+                if file_header is None:
+                    continue
+
+                if header is None:
+                    header = tuple(file_header)
+                    width = len(header)
+                    yield header
+
+                elif tuple(file_header) != header:
+                    raise ValueError(f'The columns of {key} do not match the first file')
+
+                # Pad or trim rows to the width of the header, as petl.cat does
+                for row in reader:
+                    if len(row) != width:
+                        row = (row + [None] * width)[:width]
+                    yield tuple(row)
+
+        finally:
+            ranges.close()
+
+        if header is None:
+            yield ()
@@ -1,11 +1,15 @@
+import base64
+import itertools
 import logging
 import os
 from urllib.parse import urlparse
 
 from azure.core.exceptions import ResourceNotFoundError
-from azure.storage.blob import BlobServiceClient, ContentSettings, generate_blob_sas
+from azure.storage.blob import (
+    BlobBlock, BlobServiceClient, ContentSettings, generate_blob_sas
+)
 
-from parsons.utilities import check_env, files
+from parsons.utilities import check_env, files, multipart
 
 logger = logging.getLogger(__name__)
 
@@ -310,6 +314,59 @@ class AzureBlobStorage(object):
         # Return refreshed BlobClient object
         return self.get_blob(container_name, blob_name)
 
+    def put_blob_stream(self, container_name, blob_name, parts,
+                        workers=multipart.MULTIPART_WORKERS, **kwargs):
+        """
+        Puts a blob (aka file) in a container from parts of its contents, without writing it to
+        a local file. Each part is staged as a block, several at once while later parts are
+        still being produced, and the blocks are committed once they have all been staged. If
+        there is only one part, it is uploaded with a single request.
+
+        `Args:`
+            container_name: str
+                The name of the container to store the blob
+            blob_name: str
+                The name of the blob to be stored
+            parts: iterable
+                The contents of the blob, as bytes
+            workers: int
+                The number of blocks to stage at once
+            kwargs:
+                Additional arguments to be supplied to the Azure Blob Storage API when
+                committing the blob. Any keys that belong to the ``ContentSettings`` object will
+                be provided to that class directly.
+        `Returns:`
+            `BlobClient`
+        """
+
+        blob_client = self.get_blob(container_name, blob_name)
+        content_settings, kwargs_dict = self._get_content_settings_from_dict(kwargs)
+
+        parts = iter(parts)
+        first = next(parts, b'')
+        second = next(parts, None)
+
+        if second is None:
+            blob_client.upload_blob(first, overwrite=True, content_settings=content_settings,
+                                    **kwargs_dict)
+
+        else:
+            def stage_block(number, data):
+                # Block ids must all be the same length
+                block_id = base64.b64encode(f'{number:08d}'.encode()).decode()
+                blob_client.stage_block(block_id, data)
+                return BlobBlock(block_id)
+
+            blocks = multipart.upload_parts(itertools.chain([first, second], parts),
+                                            stage_block, workers=workers)
+            blob_client.commit_block_list(blocks, content_settings=content_settings,
+                                          **kwargs_dict)
+
+        logger.info(f'{blob_name} blob put in {container_name} container')
+
+        # Return refreshed BlobClient object
+        return self.get_blob(container_name, blob_name)
+
     def download_blob(self, container_name, blob_name, local_path=None):
         """
         Downloads a blob from a container into the specified file path or a temporary file path
@@ -371,14 +428,17 @@ class AzureBlobStorage(object):
             data_type: str
                 The file format to use when writing the data. One of: `csv` or `json`
             kwargs:
-                Additional keyword arguments to supply to ``put_blob``
+                Additional keyword arguments to supply to ``put_blob_stream`` (for CSV) or
+                ``put_blob`` (for JSON)
         `Returns:`
             `BlobClient`
         """
 
         if data_type == 'csv':
-            local_path = table.to_csv()
-            content_type = 'text/csv'
+            # Stream the CSV straight into the upload, rather than writing a local file first
+            return self.put_blob_stream(container_name, blob_name,
+                                        multipart.csv_parts(table.table),
+                                        content_type='text/csv', **kwargs)
         elif data_type == 'json':
             local_path = table.to_json()
             content_type = 'application/json'
@@ -52,6 +52,9 @@ INT_TYPES = [SMALLINT, MEDIUMINT, INT, BIGINT]
 
 COL_NAME_MAX_LEN = 100
 
+# Number of rows to read at a time when inferring column types
+INFER_BLOCK_SIZE = 10000
+
 IS_CASE_SENSITIVE = False
 
 REPLACE_CHARS = {" ": "_"}
@@ -1,5 +1,18 @@
 import parsons.databases.database.constants as consts
 import ast
+import itertools
+import math
+import re
+
+import petl
+
+from parsons.utilities.value_width import value_width
+
+# Strings that are unambiguously ints or floats. Anything these don't match is classified by
+# DatabaseCreateStatement.detect_data_type. Ints are limited to 18 digits so that they can
+# always be converted.
+_INT_STRING = re.compile(r'[+-]?(0|[1-9][0-9]{0,17})')
+_FLOAT_STRING = re.compile(r'[+-]?[1-9][0-9]*(\.[0-9]*([eE][+-]?[0-9]+)?|[eE][+-]?[0-9]+)')
 
 
 class DatabaseCreateStatement():
@@ -29,6 +42,7 @@ class DatabaseCreateStatement():
         self.COL_NAME_MAX_LEN = consts.COL_NAME_MAX_LEN
         self.IS_CASE_SENSITIVE = consts.IS_CASE_SENSITIVE
         self.REPLACE_CHARS = consts.REPLACE_CHARS
+        self.INFER_BLOCK_SIZE = consts.INFER_BLOCK_SIZE
 
     # This will allow child classes to modify how these columns are handled.
     def _rename_reserved_word(self, col, index=None):
@@ -217,6 +231,175 @@ class DatabaseCreateStatement():
         # Need to determine who makes it all the way down here
         return cmp_type
 
+    def _int_type(self, value):
+        # The smallest int type that will hold value; matches detect_data_type for ints
+
+        if self.SMALLINT_MIN < value < self.SMALLINT_MAX:
+            return self.SMALLINT
+        elif self.MEDIUMINT_MIN < value < self.MEDIUMINT_MAX:
+            return self.MEDIUMINT
+        elif self.INT_MIN < value < self.INT_MAX:
+            return self.INT
+        else:
+            return self.BIGINT
+
+    def _merge_types(self, type1, type2):
+        # The higher of two types, where nulls < ints (by size) < float < varchar
+
+        if not type1:
+            return type2
+        if not type2:
+            return type1
+        if self.VARCHAR in (type1, type2):
+            return self.VARCHAR
+        if self.FLOAT in (type1, type2):
+            return self.FLOAT
+
+        return self.get_bigger_int(type1, type2)
+
+    def _detect_string_type(self, value):
+        # Classify the common kinds of strings without evaluating them
+
+        if _INT_STRING.fullmatch(value):
+            return self._int_type(int(value))
+
+        if _FLOAT_STRING.fullmatch(value):
+            return self.FLOAT
+
+        # A string starting with a letter can only evaluate to a number if it's None
+        if value[:1].isalpha() and value.rstrip() != 'None':
+            return self.VARCHAR
+
+        return self.detect_data_type(value)
+
+    def detect_column_type(self, values, cmp_type=None):
+        """Detect the highest type of a list of values and cmp_type.
+
+        Gives the same result as calling ``detect_data_type`` on each value in
+        turn, but classifies values by their python type first, so ints, floats
+        and most strings never need to be evaluated.
+
+        `Args`:
+            values: list
+                The values to inspect.
+            cmp_type: str
+                The string representation of a type to compare with the
+                values' types.
+        `Returns`:
+            str
+                The string representation of the highest type.
+        """
+        if cmp_type == self.VARCHAR:
+            return cmp_type
+
+        # When parsing bools, a value's type depends on the values seen before it,
+        # so check each value in order
+        if self.DO_PARSE_BOOLS:
+            for value in values:
+                cmp_type = self.detect_data_type(value, cmp_type)
+            return cmp_type
+
+        min_int = max_int = None
+
+        for value in values:
+            value_type = type(value)
+
+            if value is None:
+                continue
+            elif value_type is int:
+                if min_int is None or value < min_int:
+                    min_int = value
+                if max_int is None or value > max_int:
+                    max_int = value
+                continue
+            elif value_type is float:
+                # nan and inf can't be evaluated from their string representation
+                detected = self.FLOAT if math.isfinite(value) else self.VARCHAR
+            elif value_type is str:
+                detected = self._detect_string_type(value)
+            else:
+                detected = self.detect_data_type(value)
+
+            cmp_type = self._merge_types(cmp_type, detected)
+            if cmp_type == self.VARCHAR:
+                return cmp_type
+
+        # An int column's type only depends on its smallest and largest values
+        if min_int is not None:
+            cmp_type = self._merge_types(cmp_type, self._int_type(min_int))
+            cmp_type = self._merge_types(cmp_type, self._int_type(max_int))
+
+        return cmp_type
+
+    def infer_data_types(self, table, null_values=(), sample_size=None):
+        """Infer the type, width and nullability of every column in one pass.
+
+        The table is read a block of rows at a time, and each block is
+        processed a column at a time with ``detect_column_type``.
+
+        `Args`:
+            table: Parsons Table
+                The table to inspect.
+            null_values: tuple
+                Values (in addition to ``None``) that are treated as nulls when
+                detecting types, e.g. ``('NA', '')``.
+            sample_size: int
+                If set, only use the first ``sample_size`` rows to detect
+                types. Widths and nullability are always calculated from every
+                row, so varchar columns are never too narrow, but a value that
+                doesn't fit the type detected from the sample will fail to
+                load.
+        `Returns`:
+            dict
+                ``headers``, ``type_list`` (``None`` for columns with only
+                nulls), ``longest`` (the widest value, in bytes, with ``None``
+                counted as ``'None'``) and ``nullable`` lists, in column order.
+        """
+        headers = table.columns
+        num_columns = len(headers)
+
+        type_list = [None] * num_columns
+        longest = [0] * num_columns
+        nullable = [False] * num_columns
+
+        rows = iter(petl.data(table.table))
+        rows_read = 0
+
+        while True:
+            block = list(itertools.islice(rows, self.INFER_BLOCK_SIZE))
+            if not block:
+                break
+
+            if sample_size is None:
+                type_rows = len(block)
+            else:
+                type_rows = max(0, min(len(block), sample_size - rows_read))
+            rows_read += len(block)
+
+            columns = itertools.islice(itertools.zip_longest(*block), num_columns)
+            for i, column in enumerate(columns):
+                # Nulls count toward the width as 'None', as they always have
+                longest[i] = max(longest[i], max(map(value_width, column)))
+
+                values = [v for v in column if v is not None]
+
+                if null_values:
+                    values = [v for v in values if v not in null_values]
+
+                if len(values) < len(column):
+                    nullable[i] = True
+
+                if type_rows:
+                    type_values = values if type_rows == len(block) else [
+                        v for v in column[:type_rows]
+                        if v is not None and v not in null_values]
+                    type_list[i] = self.detect_column_type(type_values, type_list[i])
+
+        return {'headers': headers,
+                'type_list': type_list,
+                'longest': longest,
+                'nullable': nullable}
+
     def format_column(self, col, index="", replace_chars=None, col_prefix="_"):
         """Format the column to meet database contraints.
 
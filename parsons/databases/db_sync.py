@@ -1,4 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import numbers
+import queue
+import threading
+import time
 
 from parsons.etl.table import Table
 
@@ -24,18 +29,42 @@ class DBSync:
         retries: int
             The number of times to retry if there is an error processing a
             chunk of data. The default value is 0.
+        keyset_pagination: bool
+            Page through the source table by selecting the rows after the last ``order_by``
+            value read, rather than with ``LIMIT`` and ``OFFSET``. Each chunk is then read
+            without rescanning all of the rows before it. The ``order_by`` column (the
+            primary key for incremental syncs) must be unique. The default value is ``False``.
+        read_workers: int
+            The number of threads to read the source table with. If greater than one, the
+            range of ``order_by`` values is split into this many disjoint ranges, which are
+            each read concurrently with keyset pagination. Requires a unique, numeric
+            ``order_by`` column. The default value is 1.
+        pipeline: bool
+            Read the next chunks from the source on a background thread while the previous
+            buffer is being written to the destination, so that reads and writes overlap.
+            The default value is ``False``.
+        queue_size: int
+            The maximum number of chunks that can be read and waiting to be written to the
+            destination when reading on background threads (``pipeline`` or
+            ``read_workers``). Readers wait when the queue is full. The default value is 2.
     `Returns:`
         A DBSync object.
     """
 
     def __init__(self, source_db, destination_db, read_chunk_size=100_000, write_chunk_size=None,
-                 retries=0):
+                 retries=0, keyset_pagination=False, read_workers=1, pipeline=False,
+                 queue_size=2):
 
         self.source_db = source_db
         self.dest_db = destination_db
         self.read_chunk_size = read_chunk_size
         self.write_chunk_size = write_chunk_size or read_chunk_size
         self.retries = retries
+        self.keyset_pagination = keyset_pagination
+        self.read_workers = read_workers
+        self.pipeline = pipeline
+        self.queue_size = queue_size
+        self.last_copy_stats = None
 
     def table_sync_full(self, source_table, destination_table, if_exists='drop',
                         order_by=None, verify_row_count=True, **kwargs):
@@ -62,7 +91,8 @@ class DBSync:
             **kwargs: args
                 Optional copy arguments for destination database.
         `Returns:`
-            ``None``
+            dict
+                Row counts and per-stage timings for the copy. See ``copy_rows``.
         """
 
         # Create the table objects
@@ -100,6 +130,8 @@ class DBSync:
 
         logger.info(f'{source_table} synced: {copied_rows} total rows copied.')
 
+        return self.last_copy_stats
+
     def table_sync_incremental(self, source_table, destination_table, primary_key,
                                distinct_check=True, verify_row_count=True, **kwargs):
         """
@@ -123,7 +155,9 @@ class DBSync:
             **kwargs: args
                 Optional copy arguments for destination database.
         `Returns:`
-            ``None``
+            dict
+                Row counts and per-stage timings for the copy, or ``None`` if the tables
+                were already in sync. See ``copy_rows``.
         """
 
         # Create the table objects
@@ -135,8 +169,8 @@ class DBSync:
         if not destination_tbl.exists:
             logger.info('Destination tables %s does not exist, running a full sync',
                         destination_table)
-            self.table_sync_full(source_table, destination_table, order_by=primary_key, **kwargs)
-            return
+            return self.table_sync_full(source_table, destination_table, order_by=primary_key,
+                                        **kwargs)
 
         # Check that the source table primary key is distinct
         if distinct_check and not source_tbl.distinct_primary_key(primary_key):
@@ -173,10 +207,18 @@ class DBSync:
 
         logger.info(f'{source_table} synced to {destination_table}.')
 
+        return self.last_copy_stats
+
     def copy_rows(self, source_table_name, destination_table_name, cutoff, order_by, **kwargs):
         """
         Copy the rows from the source to the destination.
 
+        Statistics for the copy are stored as a dict in ``last_copy_stats``: the
+        ``rows_read``, ``rows_written``, ``chunks_read`` and ``chunks_written``, the
+        ``read_seconds`` and ``write_seconds`` spent on each side, the ``read_wait_seconds``
+        readers spent waiting on a full queue and the ``write_wait_seconds`` the writer spent
+        waiting for chunks, and the ``total_seconds`` for the copy.
+
         `Args:`
             source_table_name: str
                 Full table path (e.g. ``my_schema.my_table``)
@@ -189,15 +231,95 @@ class DBSync:
             **kwargs: args
                 Optional copy arguments for destination database.
         `Returns:`
-            ``None``
+            int
+                The number of rows written to the destination
         """
 
         # Create the table objects
         source_table = self.source_db.table(source_table_name)
 
+        if self.keyset_pagination and not order_by:
+            raise ValueError('Keyset pagination requires an order_by column.')
+
+        stats = {
+            'rows_read': 0,
+            'rows_written': 0,
+            'chunks_read': 0,
+            'chunks_written': 0,
+            # Time spent reading from the source and writing to the destination
+            'read_seconds': 0.0,
+            'write_seconds': 0.0,
+            # Time readers spent waiting for room in the queue, and time the writer spent
+            # waiting for chunks to arrive; only recorded when reading and writing overlap
+            'read_wait_seconds': 0.0,
+            'write_wait_seconds': 0.0,
+            'total_seconds': 0.0,
+        }
+        start_time = time.monotonic()
+
+        if self.read_workers > 1:
+            total_rows_written = self._copy_rows_parallel(
+                source_table, destination_table_name, cutoff, order_by, stats, **kwargs)
+        elif self.pipeline:
+            total_rows_written = self._copy_rows_pipelined(
+                source_table, destination_table_name, cutoff, order_by, stats, **kwargs)
+        else:
+            total_rows_written = self._copy_rows_serial(
+                source_table, destination_table_name, cutoff, order_by, stats, **kwargs)
+
+        stats['total_seconds'] = time.monotonic() - start_time
+        self.last_copy_stats = stats
+
+        return total_rows_written
+
+    def _read_chunk(self, source_table, cutoff, order_by, offset, last_key):
+        """
+        Read the next chunk of rows from the source table.
+        """
+
+        if self.keyset_pagination:
+            # Seek past the last key we read, rather than skipping an offset
+            return source_table.get_new_rows(primary_key=order_by,
+                                             cutoff_value=last_key,
+                                             chunk_size=self.read_chunk_size)
+        elif cutoff:
+            # If we have a cutoff, we are loading data incrementally -- filter out
+            # any data before our cutoff
+            return source_table.get_new_rows(primary_key=order_by,
+                                             cutoff_value=cutoff,
+                                             offset=offset,
+                                             chunk_size=self.read_chunk_size)
+        else:
+            # Get a chunk
+            return source_table.get_rows(offset=offset,
+                                         chunk_size=self.read_chunk_size,
+                                         order_by=order_by)
+
+    def _write_chunk(self, buffer, destination_table_name, stats, **kwargs):
+        """
+        Write a buffer of rows out to the destination.
+        """
+
+        logger.debug('Copying %s rows to %s', buffer.num_rows, destination_table_name)
+
+        start_time = time.monotonic()
+        self.dest_db.copy(buffer, destination_table_name, if_exists='append', **kwargs)
+        stats['write_seconds'] += time.monotonic() - start_time
+        stats['chunks_written'] += 1
+
+    def _copy_rows_serial(self, source_table, destination_table_name, cutoff, order_by, stats,
+                          **kwargs):
+        """
+        Copy the rows from the source to the destination, alternating between reading a
+        chunk and writing out the buffer.
+        """
+
         # Initialize the Parsons table we will use to store rows before writing
         buffer = Table()
 
+        # The last key we read, when paginating with keyset pagination
+        last_key = cutoff
+
         # Track the number of retries we have left before giving up
         retries_left = self.retries + 1
 
@@ -209,30 +331,22 @@ class DBSync:
         while True:
             try:
                 # Get the records to load into the database
-                if cutoff:
-                    # If we have a cutoff, we are loading data incrementally -- filter out
-                    # any data before our cutoff
-                    rows = source_table.get_new_rows(primary_key=order_by,
-                                                     cutoff_value=cutoff,
-                                                     offset=total_rows_downloaded,
-                                                     chunk_size=self.read_chunk_size)
-                else:
-                    # Get a chunk
-                    rows = source_table.get_rows(offset=total_rows_downloaded,
-                                                 chunk_size=self.read_chunk_size,
-                                                 order_by=order_by)
+                start_time = time.monotonic()
+                rows = self._read_chunk(source_table, cutoff, order_by, total_rows_downloaded,
+                                        last_key)
+                stats['read_seconds'] += time.monotonic() - start_time
 
                 number_of_rows = rows.num_rows
                 total_rows_downloaded += number_of_rows
+                stats['rows_read'] += number_of_rows
 
                 # If we didn't get any data, exit the loop -- there's nothing to load
                 if number_of_rows == 0:
                     # If we have any rows that are unwritten, flush them to the destination database
                     if rows_buffered > 0:
-                        logger.debug('Copying %s rows to %s', rows_buffered, destination_table_name)
-                        self.dest_db.copy(buffer, destination_table_name, if_exists='append',
-                                          **kwargs)
+                        self._write_chunk(buffer, destination_table_name, stats, **kwargs)
                         total_rows_written += rows_buffered
+                        stats['rows_written'] += rows_buffered
 
                         # Reset the buffer
                         rows_buffered = 0
@@ -240,15 +354,20 @@ class DBSync:
 
                     break
 
+                stats['chunks_read'] += 1
+
+                if self.keyset_pagination:
+                    last_key = rows.column_data(order_by)[-1]
+
                 # Add the new rows to our buffer
                 buffer.concat(rows)
                 rows_buffered += number_of_rows
 
                 # If our buffer reaches our write threshold, write it out
                 if rows_buffered >= self.write_chunk_size:
-                    logger.debug('Copying %s rows to %s', rows_buffered, destination_table_name)
-                    self.dest_db.copy(buffer, destination_table_name, if_exists='append', **kwargs)
+                    self._write_chunk(buffer, destination_table_name, stats, **kwargs)
                     total_rows_written += rows_buffered
+                    stats['rows_written'] += rows_buffered
 
                     # Reset the buffer
                     rows_buffered = 0
@@ -268,6 +387,244 @@ class DBSync:
 
         return total_rows_written
 
+    def _copy_rows_pipelined(self, source_table, destination_table_name, cutoff, order_by, stats,
+                             **kwargs):
+        """
+        Copy the rows from the source to the destination, reading the next chunks on a
+        background thread while the buffer is being written.
+        """
+
+        chunks = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        stats_lock = threading.Lock()
+
+        def read_chunks():
+            reader_stats = {'rows_read': 0, 'chunks_read': 0, 'read_seconds': 0.0,
+                            'read_wait_seconds': 0.0}
+            try:
+                offset = 0
+                last_key = cutoff
+                while not stop.is_set():
+                    start_time = time.monotonic()
+                    rows = self._with_retries(self._read_chunk, source_table, cutoff, order_by,
+                                              offset, last_key)
+                    reader_stats['read_seconds'] += time.monotonic() - start_time
+
+                    number_of_rows = rows.num_rows
+                    if number_of_rows == 0:
+                        break
+
+                    offset += number_of_rows
+                    reader_stats['rows_read'] += number_of_rows
+                    reader_stats['chunks_read'] += 1
+
+                    if self.keyset_pagination:
+                        last_key = rows.column_data(order_by)[-1]
+
+                    start_time = time.monotonic()
+                    self._put_chunk(chunks, rows, stop)
+                    reader_stats['read_wait_seconds'] += time.monotonic() - start_time
+
+                self._put_chunk(chunks, None, stop)
+
+            except Exception as error:
+                self._put_chunk(chunks, error, stop)
+
+            finally:
+                self._merge_stats(stats, reader_stats, stats_lock)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(read_chunks)
+
+            try:
+                return self._write_from_queue(chunks, 1, destination_table_name, stats,
+                                              **kwargs)
+            finally:
+                # Make sure the reader stops, eg. if a write failed
+                stop.set()
+
+    def _copy_rows_parallel(self, source_table, destination_table_name, cutoff, order_by, stats,
+                            **kwargs):
+        """
+        Copy the rows from the source to the destination, reading disjoint ranges of the
+        ``order_by`` column concurrently.
+        """
+
+        if not order_by:
+            raise ValueError('Reading with multiple workers requires an order_by column.')
+
+        key_ranges = self._split_key_range(source_table, order_by, cutoff)
+        chunks = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        stats_lock = threading.Lock()
+
+        def read_range(lower, upper):
+            reader_stats = {'rows_read': 0, 'chunks_read': 0, 'read_seconds': 0.0,
+                            'read_wait_seconds': 0.0}
+            try:
+                last_key = lower
+                while not stop.is_set():
+                    start_time = time.monotonic()
+                    rows = self._with_retries(source_table.get_new_rows,
+                                              primary_key=order_by,
+                                              cutoff_value=last_key,
+                                              chunk_size=self.read_chunk_size,
+                                              max_value=upper)
+                    reader_stats['read_seconds'] += time.monotonic() - start_time
+
+                    number_of_rows = rows.num_rows
+                    if number_of_rows == 0:
+                        break
+
+                    reader_stats['rows_read'] += number_of_rows
+                    reader_stats['chunks_read'] += 1
+                    last_key = rows.column_data(order_by)[-1]
+
+                    start_time = time.monotonic()
+                    self._put_chunk(chunks, rows, stop)
+                    reader_stats['read_wait_seconds'] += time.monotonic() - start_time
+
+                self._put_chunk(chunks, None, stop)
+
+            except Exception as error:
+                self._put_chunk(chunks, error, stop)
+
+            finally:
+                self._merge_stats(stats, reader_stats, stats_lock)
+
+        with ThreadPoolExecutor(max_workers=len(key_ranges)) as executor:
+            for lower, upper in key_ranges:
+                executor.submit(read_range, lower, upper)
+
+            try:
+                return self._write_from_queue(chunks, len(key_ranges), destination_table_name,
+                                              stats, **kwargs)
+            finally:
+                # Make sure any readers still running stop, eg. if a write failed
+                stop.set()
+
+    def _write_from_queue(self, chunks, readers, destination_table_name, stats, **kwargs):
+        """
+        Buffer the chunks handed over by the readers and write them out to the destination,
+        until every reader has finished. Chunks come through a bounded queue, so that the
+        readers can't get too far ahead of the writer.
+        """
+
+        buffer = Table()
+        rows_buffered = 0
+        total_rows_written = 0
+        finished_readers = 0
+
+        while finished_readers < readers:
+            start_time = time.monotonic()
+            rows = chunks.get()
+            stats['write_wait_seconds'] += time.monotonic() - start_time
+
+            # Each reader signals that it has finished with None
+            if rows is None:
+                finished_readers += 1
+                continue
+
+            if isinstance(rows, Exception):
+                raise rows
+
+            buffer.concat(rows)
+            rows_buffered += rows.num_rows
+
+            # If our buffer reaches our write threshold, write it out
+            if rows_buffered >= self.write_chunk_size:
+                self._with_retries(self._write_chunk, buffer, destination_table_name, stats,
+                                   **kwargs)
+                total_rows_written += rows_buffered
+                stats['rows_written'] += rows_buffered
+
+                # Reset the buffer
+                rows_buffered = 0
+                buffer = Table()
+
+        # If we have any rows that are unwritten, flush them to the destination database
+        if rows_buffered > 0:
+            self._with_retries(self._write_chunk, buffer, destination_table_name, stats,
+                               **kwargs)
+            total_rows_written += rows_buffered
+            stats['rows_written'] += rows_buffered
+
+        return total_rows_written
+
+    @staticmethod
+    def _merge_stats(stats, reader_stats, stats_lock):
+        """
+        Add a reader thread's statistics to the totals.
+        """
+
+        with stats_lock:
+            for key, value in reader_stats.items():
+                stats[key] += value
+
+    def _split_key_range(self, source_table, key, cutoff):
+        """
+        Split the range of key values after the cutoff into ``read_workers`` disjoint ranges.
+        Each range is returned as an (exclusive lower bound, inclusive upper bound) tuple,
+        where ``None`` means the range is unbounded.
+        """
+
+        min_key = cutoff if cutoff is not None else source_table.min_primary_key(key)
+        max_key = source_table.max_primary_key(key)
+
+        # The source table is empty, so there is nothing to split
+        if min_key is None or max_key is None:
+            return [(cutoff, None)]
+
+        if isinstance(min_key, bool) or not isinstance(min_key, numbers.Number):
+            raise ValueError(f'Reading with multiple workers requires a numeric order_by column; '
+                             f'{key} values are {type(min_key).__name__}.')
+
+        if isinstance(min_key, int) and isinstance(max_key, int):
+            boundaries = [min_key + (max_key - min_key) * i // self.read_workers
+                          for i in range(1, self.read_workers)]
+        else:
+            boundaries = [min_key + (max_key - min_key) * i / self.read_workers
+                          for i in range(1, self.read_workers)]
+
+        # Small key ranges can produce duplicate boundaries
+        boundaries = sorted(set(b for b in boundaries if b >= min_key))
+
+        # Leave the last range open ended, so rows added since we found the max aren't missed
+        return list(zip([cutoff] + boundaries, boundaries + [None]))
+
+    @staticmethod
+    def _put_chunk(chunks, item, stop):
+        """
+        Put an item on the queue, waiting while the queue is full unless we are told to stop.
+        """
+
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def _with_retries(self, func, *args, **kwargs):
+        """
+        Call a function, retrying up to ``retries`` times if it raises an error.
+        """
+
+        attempts_left = self.retries + 1
+
+        while True:
+            try:
+                return func(*args, **kwargs)
+
+            except Exception:
+                attempts_left -= 1
+
+                if attempts_left == 0:
+                    logger.debug('No retries remaining')
+                    raise
+
+                logger.exception('Unhandled error copying data; retrying')
+
     @staticmethod
     def _check_column_match(source_table_obj, destination_table_obj):
         """
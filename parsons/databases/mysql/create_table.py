@@ -29,49 +29,32 @@ class MySQLCreateTable(DatabaseCreateStatement):
     def is_valid_integer(self, val):
         return self.is_valid_sql_num(val)
 
-    def evaluate_column(self, column_rows):
-        # Generate MySQL data types and widths for a column.
-
-        col_width = 0
-        col_type = None
-
-        # Iterate through each row in the column
-        for row in column_rows:
-
-            # Get the MySQL data type
-            col_type = self.data_type(row, col_type)
-
-            # Calculate width if a varchar
-            if col_type == 'varchar':
-                row_width = len(str(row.encode('utf-8')))
-
-                # Evaluate width vs. current max width
-                if row_width > col_width:
-                    col_width = row_width
-
-        return col_type, col_width
-
-    def evaluate_table(self, tbl):
+    def evaluate_table(self, tbl, sample_size=None):
         # Generate a dict of MySQL column types and widths for all columns
-        # in a table.
+        # in a table, in a single pass over the table.
+
+        mapping = self.infer_data_types(tbl, sample_size=sample_size)
 
         table_map = []
 
-        for col in tbl.columns:
-            col_type, col_width = self.evaluate_column(tbl.column_data(col))
-            col_map = {'name': col, 'type': col_type, 'width': col_width}
+        for col, col_type, col_width in zip(
+                mapping['headers'], mapping['type_list'], mapping['longest']):
+            # Columns of only nulls default to varchar, as wide as 'None'
+            col_type = col_type or self.VARCHAR
+            col_map = {'name': col, 'type': col_type,
+                       'width': col_width if col_type == self.VARCHAR else 0}
             table_map.append(col_map)
 
         return table_map
 
-    def create_statement(self, tbl, table_name, strict_length=True):
+    def create_statement(self, tbl, table_name, strict_length=True, sample_size=None):
         # Generate create statement SQL for a given Parsons table.
 
         # Validate and rename column names if needed
         tbl.table = petl.setheader(tbl.table, self.columns_convert(tbl.columns))
 
         # Generate the table map
-        table_map = self.evaluate_table(tbl)
+        table_map = self.evaluate_table(tbl, sample_size=sample_size)
 
         # Generate the column syntax
         column_syntax = []
@@ -1,12 +1,12 @@
 from parsons import Table
 from parsons.utilities import check_env
-import petl
 import mysql.connector as mysql
 from contextlib import contextmanager
 from parsons.utilities import files
-import pickle
+from parsons.utilities.spill import SpillView, SpillWriter
 import logging
 import os
+import time
 from parsons.databases.table import BaseTable
 from parsons.databases.mysql.create_table import MySQLCreateTable
 from parsons.databases.alchemy import Alchemy
@@ -16,9 +16,31 @@ from parsons.databases.alchemy import Alchemy
 # 100k rows per batch at ~1k bytes each = ~100MB per batch.
 QUERY_BATCH_SIZE = 100000
 
+# When sizing insert batches automatically, aim for statements no bigger than this fraction of
+# the server's max_allowed_packet.
+MAX_PACKET_DIVISOR = 4
+
 logger = logging.getLogger(__name__)
 
 
+def _load_data_value(value):
+    # Format a value for MySQL's default `LOAD DATA` format, where fields are separated by
+    # tabs, rows by newlines, special characters are escaped with a backslash and NULL is \N.
+
+    if value is None:
+        return '\\N'
+
+    if isinstance(value, bool):
+        return '1' if value else '0'
+
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r')
+            .replace('\0', '\\0'))
+
+
 class MySQL(MySQLCreateTable, Alchemy):
     """
     Connect to a MySQL database.
@@ -46,7 +68,7 @@ class MySQL(MySQLCreateTable, Alchemy):
         self.port = port or os.environ.get('MYSQL_PORT')
 
     @contextmanager
-    def connection(self):
+    def connection(self, allow_local_infile=False):
         """
         Generate a MySQL connection. The connection is set up as a python "context manager", so
         it will be closed automatically (and all queries committed) when the connection goes out
@@ -56,6 +78,9 @@ class MySQL(MySQLCreateTable, Alchemy):
         any context manager):
         ``with mysql.connection() as conn:``
 
+        `Args:`
+            allow_local_infile: bool
+                Allow the connection to send local files with `LOAD DATA LOCAL INFILE`.
         `Returns:`
             MySQL `connection` object
         """
@@ -65,7 +90,8 @@ class MySQL(MySQLCreateTable, Alchemy):
                                    user=self.username,
                                    passwd=self.password,
                                    database=self.db,
-                                   port=self.port)
+                                   port=self.port,
+                                   allow_local_infile=allow_local_infile)
 
         try:
             yield connection
@@ -166,38 +192,36 @@ class MySQL(MySQLCreateTable, Alchemy):
                 return None
 
             else:
-                # Fetch the data in batches, and "pickle" the rows to a temp file.
+                # Fetch the data in batches, and write the rows to a spill file.
                 # (We pickle rather than writing to, say, a CSV, so that we maintain
                 # all the type information for each field.)
                 temp_file = files.create_temp_file()
 
-                with open(temp_file, 'wb') as f:
-                    # Grab the header
-                    pickle.dump(cursor.column_names, f)
-
+                with SpillWriter(temp_file, cursor.column_names) as writer:
                     while True:
                         batch = cursor.fetchmany(QUERY_BATCH_SIZE)
                         if len(batch) == 0:
                             break
 
                         logger.debug(f'Fetched {len(batch)} rows.')
-                        for row in batch:
-                            pickle.dump(row, f)
+                        writer.write_rows(batch)
 
                 # Load a Table from the file
-                final_tbl = Table(petl.frompickle(temp_file))
+                final_tbl = Table(SpillView(temp_file))
 
                 logger.debug(f'Query returned {final_tbl.num_rows} rows.')
                 return final_tbl
 
-    def copy(self, tbl, table_name, if_exists='fail', chunk_size=1000, strict_length=True):
+    def copy(self, tbl, table_name, if_exists='fail', chunk_size=None, strict_length=True,
+             load_data=False):
         """
         Copy a :ref:`parsons-table` to the database.
 
         .. note::
-            This method utilizes extended inserts rather `LOAD DATA INFILE` since
-            many MySQL Database configurations do not allow data files to be
-            loaded. It results in a minor performance hit compared to `LOAD DATA`.
+            By default, this method utilizes batched, parameterized inserts rather than
+            `LOAD DATA INFILE` since many MySQL Database configurations do not allow data files
+            to be loaded. If your server and user allow it, set ``load_data`` to ``True`` for
+            faster loads.
 
         `Args:`
             tbl: parsons.Table
@@ -208,19 +232,23 @@ class MySQL(MySQLCreateTable, Alchemy):
                 If the table already exists, either ``fail``, ``append``, ``drop``
                 or ``truncate`` the table.
             chunk_size: int
-                The number of rows to insert per query.
+                The number of rows to insert per query. If not specified, each query is sized
+                to fit well within the server's ``max_allowed_packet``.
             strict_length: bool
                 If the database table needs to be created, strict_length determines whether
                 the created table's column sizes will be sized to exactly fit the current data,
                 or if their size will be rounded up to account for future values being larger
                 then the current dataset. defaults to ``True``
+            load_data: bool
+                Load the rows with `LOAD DATA LOCAL INFILE` instead of inserts. Requires the
+                ``local_infile`` setting to be enabled on the server. Defaults to ``False``.
         """
 
-        if tbl.num_rows == 0:
+        if not tbl:
             logger.info('Parsons table is empty. Table will not be created.')
             return None
 
-        with self.connection() as connection:
+        with self.connection(allow_local_infile=load_data) as connection:
 
             # Create table if not exists
             if self._create_table_precheck(connection, table_name, if_exists):
@@ -228,31 +256,109 @@ class MySQL(MySQLCreateTable, Alchemy):
                 self.query_with_connection(sql, connection, commit=False)
                 logger.info(f'Table {table_name} created.')
 
-            # Chunk tables in batches of 1K rows, though this can be tuned and
-            # optimized further.
-            for t in tbl.chunk(chunk_size):
-                sql = self._insert_statement(t, table_name)
-                self.query_with_connection(sql, connection, commit=False)
+            start_time = time.monotonic()
 
-    def _insert_statement(self, tbl, table_name):
-        """
-        Convert the table data into a string for bulk importing.
-        """
+            if load_data:
+                num_rows = self._load_data(tbl, table_name, connection)
+            else:
+                num_rows = self._insert_rows(tbl, table_name, connection, chunk_size)
 
-        # Single column tables
-        if len(tbl.columns) == 1:
-            values = [f"({row[0]})" for row in tbl.data]
+            elapsed = time.monotonic() - start_time
+            rows_per_second = num_rows / elapsed if elapsed else num_rows
+            logger.info(f'{num_rows} rows copied to {table_name} '
+                        f'({rows_per_second:,.0f} rows/sec).')
 
-        # Multi-column tables
-        else:
-            values = [str(row) for row in tbl.data]
+    def _insert_rows(self, tbl, table_name, connection, chunk_size=None):
+        """
+        Insert the table's rows in batches with parameterized inserts. The connector escapes
+        the values and rewrites each batch into a single multi-row insert.
+        """
 
-        # Create full insert statement
+        placeholders = ','.join(['%s'] * len(tbl.columns))
         sql = f"""INSERT INTO {table_name}
                   ({','.join(tbl.columns)})
-                  VALUES {",".join(values)};"""
+                  VALUES ({placeholders})"""
+
+        # Leave plenty of room in the packet, since escaped and multi-byte values can be
+        # longer than our estimate of their size.
+        max_bytes = None
+        if not chunk_size:
+            max_bytes = self._max_allowed_packet(connection) // MAX_PACKET_DIVISOR
+
+        num_rows = 0
+
+        with self.cursor(connection) as cursor:
+            for batch in self._insert_batches(tbl, chunk_size, max_bytes):
+                cursor.executemany(sql, batch)
+                num_rows += len(batch)
+                logger.debug(f'Inserted {len(batch)} rows.')
+
+        return num_rows
+
+    @staticmethod
+    def _insert_batches(tbl, chunk_size=None, max_bytes=None):
+        """
+        Group the table's rows into batches of ``chunk_size`` rows or, if no chunk size is
+        given, into batches whose estimated size is at most ``max_bytes``.
+        """
+
+        batch = []
+        batch_bytes = 0
+
+        for row in tbl.data:
+            row_bytes = 0
+            if not chunk_size:
+                # Each value is quoted and separated by a comma
+                row_bytes = sum(len(str(value)) + 3 for value in row)
+
+            if batch and (len(batch) == chunk_size
+                          or (max_bytes and batch_bytes + row_bytes > max_bytes)):
+                yield batch
+                batch = []
+                batch_bytes = 0
+
+            batch.append(tuple(row))
+            batch_bytes += row_bytes
+
+        if batch:
+            yield batch
+
+    def _max_allowed_packet(self, connection):
+        """
+        Get the largest statement, in bytes, that the server will accept.
+        """
+
+        return int(self.query_with_connection("SELECT @@max_allowed_packet", connection,
+                                              commit=False).first)
+
+    def _load_data(self, tbl, table_name, connection):
+        """
+        Load the table's rows with `LOAD DATA LOCAL INFILE`. The connector can only send
+        a file from disk, so the rows are first written to a temp file in MySQL's default
+        tab-separated format, which lets us mark nulls unambiguously.
+        """
+
+        local_path = files.create_temp_file(suffix='.tsv')
+        num_rows = 0
+
+        with open(local_path, 'w', encoding='utf-8', newline='') as f:
+            for row in tbl.data:
+                f.write('\t'.join(_load_data_value(value) for value in row))
+                f.write('\n')
+                num_rows += 1
+
+        sql = f"""LOAD DATA LOCAL INFILE '{local_path}'
+                  INTO TABLE {table_name}
+                  CHARACTER SET utf8mb4
+                  ({','.join(tbl.columns)})"""
+
+        try:
+            with self.cursor(connection) as cursor:
+                cursor.execute(sql)
+        finally:
+            files.close_temp_file(local_path)
 
-        return sql
+        return num_rows
 
     def _create_table_precheck(self, connection, table_name, if_exists):
         """
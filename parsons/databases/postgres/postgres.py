@@ -1,8 +1,10 @@
 from parsons.databases.postgres.postgres_core import PostgresCore
 from parsons.databases.table import BaseTable
 from parsons.databases.alchemy import Alchemy
+from parsons.utilities.csv_stream import CSVStream
 import logging
 import os
+import time
 
 
 logger = logging.getLogger(__name__)
@@ -48,7 +50,7 @@ class Postgres(PostgresCore, Alchemy):
         self.timeout = timeout
         self.dialect = 'postgres'
 
-    def copy(self, tbl, table_name, if_exists='fail', strict_length=False):
+    def copy(self, tbl, table_name, if_exists='fail', strict_length=False, stream=True):
         """
         Copy a :ref:`parsons-table` to Postgres.
 
@@ -65,6 +67,10 @@ class Postgres(PostgresCore, Alchemy):
                 the created table's column sizes will be sized to exactly fit the current data,
                 or if their size will be rounded up to account for future values being larger
                 then the current dataset
+            stream: bool
+                Encode the table as CSV as it is sent to Postgres, rather than first writing it
+                out to a temp CSV file. Memory use stays bounded either way, but streaming avoids
+                writing the table to disk. Defaults to ``True``.
         """
 
         with self.connection() as connection:
@@ -82,8 +88,21 @@ class Postgres(PostgresCore, Alchemy):
             sql = f"COPY {table_name} FROM STDIN CSV HEADER;"
 
             with self.cursor(connection) as cursor:
-                cursor.copy_expert(sql, open(tbl.to_csv(), "r"))
-                logger.info(f'{tbl.num_rows} rows copied to {table_name}.')
+                start_time = time.monotonic()
+
+                if stream:
+                    csv_stream = CSVStream(tbl.table)
+                    cursor.copy_expert(sql, csv_stream)
+                    num_rows = csv_stream.num_rows
+                else:
+                    with open(tbl.to_csv(), "r") as csv_file:
+                        cursor.copy_expert(sql, csv_file)
+                    num_rows = tbl.num_rows
+
+                elapsed = time.monotonic() - start_time
+                rows_per_second = num_rows / elapsed if elapsed else num_rows
+                logger.info(f'{num_rows} rows copied to {table_name} '
+                            f'({rows_per_second:,.0f} rows/sec).')
 
     def table(self, table_name):
         # Return a Postgres table object
@@ -3,8 +3,7 @@ import psycopg2
 import psycopg2.extras
 from parsons.etl.table import Table
 from parsons.utilities import files
-import pickle
-import petl
+from parsons.utilities.spill import SpillView, SpillWriter
 import logging
 from parsons.databases.postgres.postgres_create_statement import PostgresCreateStatement
 
@@ -135,28 +134,24 @@ class PostgresCore(PostgresCreateStatement):
 
             else:
 
-                # Fetch the data in batches, and "pickle" the rows to a temp file.
+                # Fetch the data in batches, and write the rows to a spill file.
                 # (We pickle rather than writing to, say, a CSV, so that we maintain
                 # all the type information for each field.)
 
                 temp_file = files.create_temp_file()
+                header = [i[0] for i in cursor.description]
 
-                with open(temp_file, 'wb') as f:
-                    # Grab the header
-                    header = [i[0] for i in cursor.description]
-                    pickle.dump(header, f)
-
+                with SpillWriter(temp_file, header) as writer:
                     while True:
                         batch = cursor.fetchmany(QUERY_BATCH_SIZE)
                         if not batch:
                             break
 
                         logger.debug(f'Fetched {len(batch)} rows.')
-                        for row in batch:
-                            pickle.dump(list(row), f)
+                        writer.write_rows(batch)
 
                 # Load a Table from the file
-                final_tbl = Table(petl.frompickle(temp_file))
+                final_tbl = Table(SpillView(temp_file))
 
                 logger.debug(f'Query returned {final_tbl.num_rows} rows.')
                 return final_tbl
@@ -45,7 +45,7 @@ class PostgresCreateStatement(DatabaseCreateStatement):
 
     def create_statement(self, tbl, table_name, padding=None, distkey=None, sortkey=None,
                          varchar_max=None, varchar_truncate=True, columntypes=None,
-                         strict_length=True):
+                         strict_length=True, sample_size=None):
         # Generate a table create statement. Distkeys and sortkeys are only used by
         # Redshift and should not be passed when generating a create statement for
         # Postgres.
@@ -56,7 +56,7 @@ class PostgresCreateStatement(DatabaseCreateStatement):
         # Validate and rename column names if needed
         tbl.table = petl.setheader(tbl.table, self.column_name_validate(tbl.columns))
 
-        mapping = self.generate_data_types(tbl)
+        mapping = self.generate_data_types(tbl, sample_size=sample_size)
 
         if padding:
             mapping['longest'] = self.vc_padding(mapping, padding)
@@ -91,41 +91,16 @@ class PostgresCreateStatement(DatabaseCreateStatement):
     def is_valid_integer(self, val):
         return self.is_valid_sql_num(val)
 
-    def generate_data_types(self, table):
+    def generate_data_types(self, table, sample_size=None):
         # Generate column data types
 
-        longest, type_list = [], []
-
-        cont = petl.records(table.table)
-
-        # Populate empty values for the columns
-        for col in table.columns:
-            longest.append(0)
-            type_list.append('')
-
-        for row in cont:
-            for i in range(len(row)):
-                # NA is the csv null value
-                if type_list[i] == 'varchar' or row[i] in ['NA', '']:
-                    pass
-                else:
-                    var_type = self.data_type(row[i], type_list[i])
-                    type_list[i] = var_type
-
-                # Calculate width
-                width = len(str(row[i]).encode('utf-8'))
-                if width > longest[i]:
-                    longest[i] = width
-
-        # In L140 'NA' and '' will be skipped
-        # If the entire column is either one of those (or a mix of the two)
-        # the type will be empty.
-        # Fill with a default varchar
-        type_list = [typ or 'varchar' for typ in type_list]
-
-        return {'longest': longest,
-                'headers': table.columns,
-                'type_list': type_list}
+        # 'NA' (the csv null value) and empty strings are ignored when detecting types
+        mapping = self.infer_data_types(table, null_values=('NA', ''), sample_size=sample_size)
+
+        # If the entire column is nulls, the type will be empty. Fill with a default varchar
+        mapping['type_list'] = [typ or 'varchar' for typ in mapping['type_list']]
+
+        return mapping
 
     def vc_padding(self, mapping, padding):
         # Pad the width of a varchar column
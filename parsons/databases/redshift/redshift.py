@@ -1,21 +1,23 @@
 from parsons.etl.table import Table
-from parsons.databases.redshift.rs_copy_table import RedshiftCopyTable
+from parsons.aws.s3 import S3
+from parsons.databases.redshift.rs_copy_table import RedshiftCopyTable, S3_TEMP_KEY_PREFIX
 from parsons.databases.redshift.rs_create_table import RedshiftCreateTable
 from parsons.databases.redshift.rs_table_utilities import RedshiftTableUtilities
 from parsons.databases.redshift.rs_schema import RedshiftSchema
 from parsons.databases.table import BaseTable
 from parsons.databases.alchemy import Alchemy
 from parsons.utilities import files, sql_helpers
+from parsons.utilities.spill import SpillView, SpillWriter
 import psycopg2
 import psycopg2.extras
 import os
 import logging
 import json
-import pickle
 import petl
 from contextlib import contextmanager
 import datetime
 import random
+import time
 
 # Max number of rows that we query at a time, so we can avoid loading huge
 # data sets into memory.
@@ -119,7 +121,7 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
         finally:
             cur.close()
 
-    def query(self, sql, parameters=None):
+    def query(self, sql, parameters=None, via_unload=False):
         """
         Execute a query against the Redshift database. Will return ``None``
         if the query returns zero rows.
@@ -151,6 +153,10 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
                 A valid SQL statement
             parameters: list
                 A list of python variables to be converted into SQL values in your query
+            via_unload: boolean
+                Export the results to the temp bucket with ``UNLOAD``, rather than fetching them
+                through the leader node. Much faster for large ``SELECT`` queries. See
+                :meth:`query_via_unload`.
 
         `Returns:`
             Parsons Table
@@ -158,6 +164,9 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
 
         """  # noqa: E501
 
+        if via_unload:
+            return self.query_via_unload(sql, parameters=parameters)
+
         with self.connection() as connection:
             return self.query_with_connection(sql, connection, parameters=parameters)
 
@@ -203,32 +212,114 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
 
             else:
 
-                # Fetch the data in batches, and "pickle" the rows to a temp file.
+                # Fetch the data in batches, and write the rows to a spill file.
                 # (We pickle rather than writing to, say, a CSV, so that we maintain
                 # all the type information for each field.)
 
                 temp_file = files.create_temp_file()
+                header = [i[0] for i in cursor.description]
 
-                with open(temp_file, 'wb') as f:
-                    # Grab the header
-                    header = [i[0] for i in cursor.description]
-                    pickle.dump(header, f)
-
+                with SpillWriter(temp_file, header) as writer:
                     while True:
                         batch = cursor.fetchmany(QUERY_BATCH_SIZE)
                         if not batch:
                             break
 
                         logger.debug(f'Fetched {len(batch)} rows.')
-                        for row in batch:
-                            pickle.dump(list(row), f)
+                        writer.write_rows(batch)
 
                 # Load a Table from the file
-                final_tbl = Table(petl.frompickle(temp_file))
+                final_tbl = Table(SpillView(temp_file))
 
                 logger.debug(f'Query returned {final_tbl.num_rows} rows.')
                 return final_tbl
 
+    def query_via_unload(self, sql, parameters=None, aws_access_key_id=None,
+                         aws_secret_access_key=None):
+        """
+        Execute a ``SELECT`` query by unloading its results to the temp bucket, rather than
+        fetching them through the leader node. Every slice of the cluster writes its share of
+        the results in parallel, and the files are then downloaded concurrently and removed
+        from the bucket. The returned table reads the downloaded files lazily.
+
+        The columns are in the order of the query, but the rows are not in any particular
+        order (``ORDER BY`` is not preserved). As the results are read back from CSV files,
+        every value is a string, and nulls are empty strings. Will return ``None`` if the
+        query returns zero rows.
+
+        `Args:`
+            sql: str
+                A valid ``SELECT`` statement
+            parameters: list
+                A list of python variables to be converted into SQL values in your query
+            aws_access_key_id:
+                An AWS access key granted to the temp bucket.
+            aws_secret_access_key:
+                An AWS secret access key granted to the temp bucket.
+        `Returns:`
+            Parsons Table
+                See :ref:`parsons-table` for output options.
+        """
+
+        if not self.s3_temp_bucket:
+            raise KeyError(("Missing S3_TEMP_BUCKET, needed for transferring data from Redshift. "
+                            "Must be specified as env vars or kwargs"
+                            ))
+
+        # Coalesce S3 Key arguments
+        aws_access_key_id = aws_access_key_id or self.aws_access_key_id
+        aws_secret_access_key = aws_secret_access_key or self.aws_secret_access_key
+
+        self.s3 = S3(aws_access_key_id=aws_access_key_id,
+                     aws_secret_access_key=aws_secret_access_key)
+
+        # UNLOAD takes the query as a string literal, so parameters have to be filled in first
+        if parameters:
+            with self.connection() as connection:
+                with self.cursor(connection) as cursor:
+                    sql = cursor.mogrify(sql, parameters).decode()
+
+        key_prefix = f"{S3_TEMP_KEY_PREFIX}/{hash(time.time())}/"
+
+        keys = [f"{key_prefix}manifest"]
+        try:
+            self.unload(sql, self.s3_temp_bucket, key_prefix, manifest=True, header=True,
+                        delimiter='|', compression='gzip', add_quotes=True, escape=True,
+                        allow_overwrite=True, parallel=True,
+                        aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key)
+
+            with open(self.s3.get_file(self.s3_temp_bucket, keys[0])) as f:
+                manifest = json.load(f)
+
+            objects = [tuple(entry['url'].split('/', 3)[2:]) for entry in manifest['entries']]
+            keys.extend(key for _, key in objects)
+            paths = self.s3.get_files(objects)
+
+        except Exception:
+            # Without the manifest the parts aren't known (and a failed UNLOAD may have written
+            # some of them), so remove everything under the prefix
+            keys = list(self.s3.list_keys(self.s3_temp_bucket, prefix=key_prefix))
+            raise
+
+        finally:
+            self.temp_s3_delete(keys)
+
+        # Slices with no rows write parts with only a header, or nothing at all, so skip any
+        # part without a first data row
+        tbls = [petl.fromcsv(path, delimiter='|', escapechar='\\', doublequote=False)
+                for path in paths]
+        tbls = [tbl for tbl in tbls if next(iter(petl.data(tbl)), None) is not None]
+
+        if not tbls:
+            logger.debug('Query returned 0 rows')
+            return None
+
+        final_tbl = Table(petl.cat(*tbls))
+
+        logger.info(f'Unloaded query results in {len(tbls)} files.')
+        return final_tbl
+
     def copy_s3(self, table_name, bucket, key, manifest=False, data_type='csv',
                 csv_delimiter=',', compression=None, if_exists='fail', max_errors=0,
                 distkey=None, sortkey=None, padding=None, varchar_max=None,
@@ -390,7 +481,7 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
              columntypes=None, specifycols=None, alter_table=False, alter_table_cascade=False,
              aws_access_key_id=None, aws_secret_access_key=None, iam_role=None,
              cleanup_s3_file=True, template_table=None, temp_bucket_region=None,
-             strict_length=True):
+             strict_length=True, slices=None):
         """
         Copy a :ref:`parsons-table` to Redshift.
 
@@ -500,6 +591,12 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
             strict_length: bool
                 Whether or not to tightly fit the length of the table columns to the length
                 of the data in ``tbl``; if ``padding`` is specified, this argument is ignored
+            slices: int or str
+                If specified, stage the table in S3 as this many gzipped CSV files, compressed
+                and uploaded in parallel, and load them with a single manifest ``COPY`` so that
+                every slice of the cluster takes part in the load. Ideally a multiple of the
+                cluster's slice count; ``auto`` uses the slice count. Recommended for tables of
+                millions of rows. Defaults to staging a single file.
 
         `Returns`
             Parsons Table or ``None``
@@ -536,8 +633,12 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
                     tbl, table_name, drop_dependencies=alter_table_cascade)
 
             # Upload the table to S3
-            key = self.temp_s3_copy(tbl, aws_access_key_id=aws_access_key_id,
-                                    aws_secret_access_key=aws_secret_access_key)
+            if slices:
+                key = self.temp_s3_copy_sliced(tbl, slices, aws_access_key_id=aws_access_key_id,
+                                               aws_secret_access_key=aws_secret_access_key)
+            else:
+                key = self.temp_s3_copy(tbl, aws_access_key_id=aws_access_key_id,
+                                        aws_secret_access_key=aws_secret_access_key)
 
             try:
                 # Copy to Redshift database.
@@ -559,8 +660,13 @@ class Redshift(RedshiftCreateTable, RedshiftCopyTable, RedshiftTableUtilities, R
                              'compression': 'gzip',
                              'bucket_region': temp_bucket_region}
 
-                # Copy from S3 to Redshift
-                sql = self.copy_statement(table_name, self.s3_temp_bucket, key, **copy_args)
+                # Copy from S3 to Redshift. Sliced copies are loaded from their manifest,
+                # which is the first key staged.
+                if slices:
+                    sql = self.copy_statement(table_name, self.s3_temp_bucket, key[0],
+                                              manifest=True, **copy_args)
+                else:
+                    sql = self.copy_statement(table_name, self.s3_temp_bucket, key, **copy_args)
                 sql_censored = sql_helpers.redact_credentials(sql)
 
                 logger.debug(f'Copy SQL command: {sql_censored}')
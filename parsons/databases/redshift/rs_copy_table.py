@@ -1,5 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import csv
+import gzip
+import json
+import multiprocessing
 import os
+import queue
 from parsons.aws.s3 import S3
+from parsons.utilities import files
 import time
 import logging
 
@@ -7,6 +14,43 @@ logger = logging.getLogger(__name__)
 
 S3_TEMP_KEY_PREFIX = "Parsons_RedshiftCopyTable"
 
+# Number of rows to hand to a worker process at a time when staging a table in slices.
+SLICE_BLOCK_ROWS = 10000
+
+# Maximum number of files to upload to S3 at once when staging a table in slices.
+SLICE_UPLOAD_WORKERS = 8
+
+
+def _write_csv_parts(paths, header, blocks):
+    # Runs in a worker process. Writes the blocks of rows it is sent to its gzipped CSV parts,
+    # until it is sent None. Returns the number of rows written to each part.
+
+    handles = []
+    writers = {}
+    row_counts = {path: 0 for path in paths}
+
+    try:
+        for path in paths:
+            handle = gzip.open(path, 'wt', encoding='utf-8', newline='')
+            handles.append(handle)
+            writers[path] = csv.writer(handle)
+            writers[path].writerow(header)
+
+        while True:
+            block = blocks.get()
+            if block is None:
+                break
+
+            path, rows = block
+            writers[path].writerows(rows)
+            row_counts[path] += len(rows)
+
+    finally:
+        for handle in handles:
+            handle.close()
+
+    return row_counts
+
 
 class RedshiftCopyTable(object):
 
@@ -147,7 +191,153 @@ class RedshiftCopyTable(object):
 
         return key
 
+    def temp_s3_copy_sliced(self, tbl, slices, aws_access_key_id=None,
+                            aws_secret_access_key=None, max_workers=None):
+        """
+        Stage a table in the temp bucket as a number of gzipped CSV parts, plus a manifest
+        listing them, so that Redshift can load the parts in parallel.
+
+        Blocks of rows are dealt out to the parts in turn, and the parts are compressed by
+        worker processes while the table is being read. The parts are then uploaded
+        concurrently.
+
+        `Args:`
+            tbl: obj
+                A Parsons Table.
+            slices: int or str
+                The number of parts to split the table into. Ideally a multiple of the
+                number of slices in the cluster. If ``auto``, uses the cluster's slice count.
+            aws_access_key_id:
+                An AWS access key granted to the temp bucket.
+            aws_secret_access_key:
+                An AWS secret access key granted to the temp bucket.
+            max_workers: int
+                The number of worker processes to compress the parts with. Defaults to
+                the number of CPUs, or the number of parts if that is smaller.
+        `Returns:`
+            list
+                The keys of the manifest, followed by the keys of the parts.
+        """
+
+        if not self.s3_temp_bucket:
+            raise KeyError(("Missing S3_TEMP_BUCKET, needed for transferring data to Redshift. "
+                            "Must be specified as env vars or kwargs"
+                            ))
+
+        if slices == 'auto':
+            slices = self.slice_count()
+
+        # Coalesce S3 Key arguments
+        aws_access_key_id = aws_access_key_id or self.aws_access_key_id
+        aws_secret_access_key = aws_secret_access_key or self.aws_secret_access_key
+
+        self.s3 = S3(aws_access_key_id=aws_access_key_id,
+                     aws_secret_access_key=aws_secret_access_key)
+
+        temp_dir = files.create_temp_directory()
+        uploaded_keys = []
+
+        try:
+            paths = [os.path.join(temp_dir, f'part_{i:04d}.csv.gz') for i in range(slices)]
+
+            # Each worker owns every nth part, so each part is a single gzip stream
+            workers = min(max_workers or os.cpu_count() or 1, slices)
+            worker_paths = [paths[i::workers] for i in range(workers)]
+            path_worker = {path: i for i, part_paths in enumerate(worker_paths)
+                           for path in part_paths}
+
+            with multiprocessing.Manager() as manager, \
+                    ProcessPoolExecutor(max_workers=workers) as executor:
+
+                worker_queues = [manager.Queue(maxsize=2) for _ in range(workers)]
+                futures = [executor.submit(_write_csv_parts, part_paths, tbl.columns, blocks)
+                           for part_paths, blocks in zip(worker_paths, worker_queues)]
+
+                def send(worker, block):
+                    # Don't wait forever on a full queue if the worker has failed
+                    while True:
+                        try:
+                            worker_queues[worker].put(block, timeout=1)
+                            return
+                        except queue.Full:
+                            if futures[worker].done():
+                                futures[worker].result()
+                                raise RuntimeError('Worker process stopped unexpectedly.')
+
+                block = []
+                block_index = 0
+                for row in tbl.data:
+                    block.append(tuple(row))
+                    if len(block) >= SLICE_BLOCK_ROWS:
+                        path = paths[block_index % slices]
+                        send(path_worker[path], (path, block))
+                        block = []
+                        block_index += 1
+
+                if block:
+                    path = paths[block_index % slices]
+                    send(path_worker[path], (path, block))
+
+                for worker in range(workers):
+                    send(worker, None)
+
+                row_counts = {}
+                for future in futures:
+                    row_counts.update(future.result())
+
+            # Skip any parts that didn't get any rows, unless the whole table is empty
+            part_paths = [path for path in paths if row_counts[path]] or paths[:1]
+
+            hashed_name = hash(time.time())
+            key_prefix = f"{S3_TEMP_KEY_PREFIX}/{hashed_name}"
+            part_keys = [f"{key_prefix}/{os.path.basename(path)}" for path in part_paths]
+
+            def put_part(key, path):
+                self.s3.put_file(self.s3_temp_bucket, key, path)
+                uploaded_keys.append(key)
+
+            with ThreadPoolExecutor(max_workers=SLICE_UPLOAD_WORKERS) as executor:
+                uploads = [executor.submit(put_part, key, path)
+                           for key, path in zip(part_keys, part_paths)]
+                for upload in uploads:
+                    upload.result()
+
+            manifest = {'entries': [{'url': f's3://{self.s3_temp_bucket}/{key}', 'mandatory': True}
+                                    for key in part_keys]}
+            manifest_key = f"{key_prefix}/manifest"
+            manifest_path = files.string_to_temp_file(json.dumps(manifest), suffix='.json')
+            self.s3.put_file(self.s3_temp_bucket, manifest_key, manifest_path)
+            uploaded_keys.append(manifest_key)
+
+        except Exception:
+            # Don't leave a partial upload behind in the temp bucket
+            if uploaded_keys:
+                self.s3.remove_files(self.s3_temp_bucket, uploaded_keys)
+            raise
+
+        finally:
+            files.cleanup_temp_directory(temp_dir)
+
+        logger.info(f'Staged {sum(row_counts.values())} rows in {len(part_keys)} parts.')
+
+        return [manifest_key] + part_keys
+
+    def slice_count(self):
+        """
+        Get the number of slices in the cluster.
+
+        `Returns:`
+            int
+        """
+
+        return self.query("SELECT COUNT(*) FROM stv_slices").first
+
     def temp_s3_delete(self, key):
 
-        if key:
-            self.s3.remove_file(self.s3_temp_bucket, key)
+        # Sliced copies stage a manifest and several parts
+        keys = [k for k in (key if isinstance(key, list) else [key]) if k]
+
+        if len(keys) == 1:
+            self.s3.remove_file(self.s3_temp_bucket, keys[0])
+        elif keys:
+            self.s3.remove_files(self.s3_temp_bucket, keys)
@@ -43,7 +43,7 @@ class RedshiftCreateTable(DatabaseCreateStatement):
 
     def create_statement(self, tbl, table_name, padding=None, distkey=None, sortkey=None,
                          varchar_max=None, varchar_truncate=True, columntypes=None,
-                         strict_length=True):
+                         strict_length=True, sample_size=None):
 
         # Warn the user if they don't provide a DIST key or a SORT key
         self._log_key_warning(distkey=distkey, sortkey=sortkey, method='copy')
@@ -56,7 +56,7 @@ class RedshiftCreateTable(DatabaseCreateStatement):
         if tbl.num_rows == 0:
             raise ValueError('Table is empty. Must have 1 or more rows.')
 
-        mapping = self.generate_data_types(tbl)
+        mapping = self.generate_data_types(tbl, sample_size=sample_size)
 
         if padding:
             mapping['longest'] = self.vc_padding(mapping, padding)
@@ -91,40 +91,16 @@ class RedshiftCreateTable(DatabaseCreateStatement):
     def is_valid_integer(self, val):
         return self.is_valid_sql_num(val)
 
-    def generate_data_types(self, table):
+    def generate_data_types(self, table, sample_size=None):
         # Generate column data types
 
-        longest, type_list = [], []
-
-        cont = petl.records(table.table)
-
-        # Populate empty values for the columns
-        for col in table.columns:
-            longest.append(0)
-            type_list.append('')
-
-        for row in cont:
-            for i in range(len(row)):
-                # NA is the csv null value
-                if type_list[i] == 'varchar' or row[i] in ['NA', '']:
-                    pass
-                else:
-                    var_type = self.data_type(row[i], type_list[i])
-                    type_list[i] = var_type
-
-                # Calculate width
-                if len(str(row[i]).encode('utf-8')) > longest[i]:
-                    longest[i] = len(str(row[i]).encode('utf-8'))
-
-        # In L138 'NA' and '' will be skipped
-        # If the entire column is either one of those (or a mix of the two)
-        # the type will be empty.
-        # Fill with a default varchar
-        type_list = [typ or 'varchar' for typ in type_list]
-
-        return {'longest': longest,
-                'headers': table.columns,
-                'type_list': type_list}
+        # 'NA' (the csv null value) and empty strings are ignored when detecting types
+        mapping = self.infer_data_types(table, null_values=('NA', ''), sample_size=sample_size)
+
+        # If the entire column is nulls, the type will be empty. Fill with a default varchar
+        mapping['type_list'] = [typ or 'varchar' for typ in mapping['type_list']]
+
+        return mapping
 
     def vc_padding(self, mapping, padding):
         # Pad the width of a varchar column
@@ -39,6 +39,18 @@ class BaseTable:
             LIMIT 1
         """).first
 
+    def min_primary_key(self, primary_key):
+        """
+        Get the minimum primary key in the table.
+        """
+
+        return self.db.query(f"""
+            SELECT {primary_key}
+            FROM {self.table}
+            ORDER BY {primary_key} ASC
+            LIMIT 1
+        """).first
+
     def distinct_primary_key(self, primary_key):
         """
         Check if the passed primary key column is distinct.
@@ -113,20 +125,28 @@ class BaseTable:
 
         return self.db.query(sql, params).first
 
-    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None):
+    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None,
+                     max_value=None):
         """
         Get rows that have a greater primary key value than the one
         provided.
 
-        It will select every value greater than the provided value.
+        It will select every value greater than the provided value. If a ``max_value``
+        is provided, it will also only select values less than or equal to it.
         """
 
+        conditions = []
+        parameters = []
+
         if cutoff_value is not None:
-            where_clause = f"WHERE {primary_key} > %s"
-            parameters = [cutoff_value]
-        else:
-            where_clause = ''
-            parameters = []
+            conditions.append(f"{primary_key} > %s")
+            parameters.append(cutoff_value)
+
+        if max_value is not None:
+            conditions.append(f"{primary_key} <= %s")
+            parameters.append(max_value)
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ''
 
         sql = f"""
                SELECT
@@ -0,0 +1,299 @@
+from array import array
+import itertools
+
+import petl
+
+from parsons.utilities.value_width import value_width
+
+__all__ = [
+    'ColumnarView',
+]
+
+# Number of rows to read at a time while building a columnar table
+COLUMNAR_BLOCK_SIZE = 10000
+
+# String columns are stored as codes into a dictionary of their distinct values, unless more
+# than this share of the values are distinct, in which case the dictionary wouldn't save
+# any memory and they are stored as a plain list.
+DICTIONARY_MAX_RATIO = 0.5
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+# Each column type's extend method adds a block of values, or returns False without adding any
+# if it can't store them.
+
+
+class _ObjectColumn:
+    # Any python values, in a list
+
+    def __init__(self, values=()):
+        self.values = list(values)
+
+    def extend(self, values):
+        self.values.extend(values)
+        return True
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def max_width(self):
+        return max(map(value_width, self.values), default=0)
+
+
+class _NumberColumn:
+    # Ints or floats in a typed array, with a bitmap of the positions of the nulls
+
+    def __init__(self, typecode):
+        self.data = array(typecode)
+        self.nulls = bytearray()
+        self.null_count = 0
+
+    def accepts(self, value_type, values):
+
+        if self.data.typecode == 'd':
+            return value_type is float
+
+        return value_type is int and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX
+
+    def extend(self, values):
+
+        value_types = set(map(type, values))
+        value_types.discard(type(None))
+
+        if len(value_types) > 1:
+            return False
+
+        non_null = [v for v in values if v is not None]
+        if value_types and not self.accepts(value_types.pop(), non_null):
+            return False
+
+        start = len(self.data)
+        null_count = len(values) - len(non_null)
+
+        # Grow the bitmap to cover the new values, then mark the nulls among them
+        self.nulls.extend(bytes((start + len(values) + 7) // 8 - len(self.nulls)))
+        if null_count:
+            for i, value in enumerate(values, start):
+                if value is None:
+                    self.nulls[i >> 3] |= 1 << (i & 7)
+
+        self.data.extend(0 if value is None else value for value in values)
+        self.null_count += null_count
+
+        return True
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+
+        if not self.null_count:
+            return iter(self.data)
+
+        nulls = self.nulls
+        return (None if nulls[i >> 3] >> (i & 7) & 1 else value
+                for i, value in enumerate(self.data))
+
+    def max_width(self):
+
+        if not self.data:
+            return 0
+
+        if self.null_count == len(self.data):
+            return value_width(None)
+
+        non_null = [v for v in self if v is not None]
+        if self.data.typecode == 'd':
+            width = max(map(value_width, non_null))
+        else:
+            # The widest int is either the largest or the most negative
+            width = max(value_width(max(non_null)), value_width(min(non_null)))
+
+        return max(width, value_width(None)) if self.null_count else width
+
+
+class _DictionaryColumn:
+    # Strings as codes into a list of the distinct values. Nulls have the code -1.
+
+    def __init__(self):
+        self.codes = array('l')
+        self.values = []
+        self.lookup = {}
+
+    def extend(self, values):
+
+        value_types = set(map(type, values))
+        value_types.discard(type(None))
+
+        if value_types - {str}:
+            return False
+
+        lookup = self.lookup
+        strings = self.values
+        codes = []
+
+        for value in values:
+            if value is None:
+                codes.append(-1)
+                continue
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(strings)
+                strings.append(value)
+            codes.append(code)
+
+        self.codes.extend(codes)
+
+        return True
+
+    def too_distinct(self):
+        return len(self.values) > max(COLUMNAR_BLOCK_SIZE, len(self.codes) * DICTIONARY_MAX_RATIO)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+
+        values = self.values + [None]
+        return (values[code] for code in self.codes)
+
+    def max_width(self):
+
+        if not self.codes:
+            return 0
+
+        width = max(map(value_width, self.values), default=0)
+        if -1 in self.codes:
+            width = max(width, value_width(None))
+
+        return width
+
+
+def _new_column(values):
+    # Choose how to store a column from its first non-null values
+
+    value_types = set(map(type, values))
+    value_types.discard(type(None))
+
+    if value_types == {int}:
+        return _NumberColumn('q')
+    if value_types == {float}:
+        return _NumberColumn('d')
+    if value_types == {str}:
+        return _DictionaryColumn()
+
+    return _ObjectColumn()
+
+
+class ColumnarView(petl.Table):
+    """
+    An in-memory petl table that stores its values column by column, which takes far less
+    memory than a tuple per row. Int and float columns are held in typed arrays with a bitmap
+    of their nulls, and string columns with few distinct values are dictionary encoded. Other
+    columns, and columns with a mix of types, are held in plain lists. Values (and their types)
+    are the same as in the source table.
+
+    `Args:`
+        source: petl table
+            The table to load
+    """
+
+    def __init__(self, source):
+
+        rows = iter(source)
+        self.header = tuple(next(rows))
+        self.num_rows = 0
+
+        width = len(self.header)
+        self._columns = [None] * width
+        self._leading_nulls = [0] * width
+
+        while True:
+            block = list(itertools.islice(rows, COLUMNAR_BLOCK_SIZE))
+            if not block:
+                break
+
+            # Short rows are padded with None, as petl does when reading them by column
+            values = itertools.islice(
+                itertools.chain(itertools.zip_longest(*block),
+                                itertools.repeat((None,) * len(block))),
+                width)
+            for index, column_values in enumerate(values):
+                self._extend(index, column_values)
+
+            self.num_rows += len(block)
+
+        # Columns with no values at all
+        for index, column in enumerate(self._columns):
+            if column is None:
+                self._columns[index] = _ObjectColumn([None] * self.num_rows)
+
+    def _extend(self, index, values):
+
+        column = self._columns[index]
+
+        if column is None:
+            if all(value is None for value in values):
+                # Wait until the first non-null value to choose how to store the column
+                self._leading_nulls[index] += len(values)
+                return
+
+            column = _new_column(values)
+            column.extend((None,) * self._leading_nulls[index])
+            self._columns[index] = column
+
+        # If the values don't fit the column's storage, or too many strings are distinct for
+        # a dictionary to help, fall back to a list
+        if not column.extend(values):
+            self._columns[index] = _ObjectColumn(itertools.chain(column, values))
+        elif isinstance(column, _DictionaryColumn) and column.too_distinct():
+            self._columns[index] = _ObjectColumn(column)
+
+    def _column(self, name):
+
+        if name not in self.header:
+            raise petl.errors.FieldSelectionError(name)
+
+        return self._columns[self.header.index(name)]
+
+    def column_values(self, name):
+        """
+        Return the values of a column as a list.
+
+        `Args:`
+            name: str
+                The column name
+        `Returns:`
+            list
+        """
+
+        return list(self._column(name))
+
+    def column_max_width(self, name):
+        """
+        Return the maximum width of the values of a column, as bytes of their utf-8 string
+        representation. Dictionary encoded columns only need to look at each distinct value.
+
+        `Args:`
+            name: str
+                The column name
+        `Returns:`
+            int
+        """
+
+        return self._column(name).max_width()
+
+    def __iter__(self):
+
+        yield self.header
+
+        if not self._columns:
+            yield from itertools.repeat((), self.num_rows)
+            return
+
+        yield from zip(*self._columns)
@@ -0,0 +1,298 @@
+import itertools
+import logging
+import math
+
+import petl
+
+from parsons.etl.joins import key_getter, pad_rows, partition_rows
+from parsons.utilities.files import close_temp_file
+from parsons.utilities.spill import SpillView
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'BloomFilter',
+    'DeduplicateView',
+]
+
+# The number of distinct keys (or, when keeping the last row, rows) to hold in memory. Past
+# it, the remaining rows are split into DEDUPE_PARTITIONS spill files by the hash of their
+# keys and each partition is deduplicated on its own.
+DEDUPE_MEMORY_ROWS = 1000000
+DEDUPE_PARTITIONS = 16
+
+# The default false positive rate of the bloom filter used by approximate mode
+DEDUPE_ERROR_RATE = 0.01
+
+_MASK_64 = 2 ** 64 - 1
+
+
+class BloomFilter:
+    """
+    A bloom filter, which records whether keys have been seen in a fixed amount of memory.
+    It may report a key as seen when it hasn't (with probability ``error_rate`` once
+    ``capacity`` keys have been added), but never the reverse.
+
+    `Args:`
+        capacity: int
+            The number of keys expected to be added
+        error_rate: float
+            The false positive rate once ``capacity`` keys have been added
+    """
+
+    def __init__(self, capacity, error_rate=DEDUPE_ERROR_RATE):
+
+        capacity = max(1, capacity)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def add(self, key):
+        """
+        Add a key to the filter.
+
+        `Args:`
+            key:
+                A hashable key
+        `Returns:`
+            bool
+                Whether the key may have been added before
+        """
+
+        # Derive every bit position from the two halves of one 64 bit hash ("double hashing")
+        value = hash((key,)) & _MASK_64
+        first, second = value & 0xFFFFFFFF, (value >> 32) | 1
+
+        seen = True
+        for i in range(self.num_hashes):
+            bit = (first + i * second) % self.num_bits
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bits[byte] & mask:
+                seen = False
+                self.bits[byte] |= mask
+
+        return seen
+
+
+def _read_partition(path):
+
+    for block in SpillView(path).blocks():
+        yield from block
+
+
+class DeduplicateView(petl.Table):
+    """
+    A petl table that removes rows with duplicate keys, without sorting.
+
+    Rows are streamed past an in-memory set of the keys seen so far (or, when keeping the last
+    row of each key, a dict of the latest rows). If there are more than ``memory_rows``
+    distinct keys, the remaining rows are partitioned into spill files on disk by the hash of
+    their keys, along with the keys (or rows) already in memory, and each partition is
+    deduplicated in turn. Rows come out in their original order, except that rows after the
+    spill are grouped by partition, and when keeping the last row, rows are ordered by the
+    last occurrence of their key.
+
+    In approximate mode, a first pass adds every key to a bloom filter, collecting the keys
+    it reports as possibly seen before. Only those candidate keys (the real duplicates plus a
+    small rate of false positives) are then tracked exactly in a second pass, so memory scales
+    with the number of duplicates rather than the number of rows, and rows keep their original
+    order. The result is still exact. The source is read twice (three times when keeping the
+    last row).
+
+    After the table has been read, ``stats`` holds a dict with the number of ``input_rows``,
+    ``output_rows`` and ``duplicates`` dropped, and whether it ``spilled`` to disk.
+
+    `Args:`
+        source: petl table
+            The table to deduplicate
+        key: list
+            The fields that identify a duplicate. If ``None``, uses every field.
+        keep: str
+            Keep the ``first`` or ``last`` row of each key
+        memory_rows: int
+            The number of distinct keys to hold in memory before spilling to disk
+        approximate: bool
+            Use a bloom filter to track keys, rather than a set
+        expected_rows: int
+            The number of rows in the table, used to size the bloom filter. If ``None``, the
+            rows are counted (in an extra pass) the first time the table is read.
+        error_rate: float
+            The bloom filter's false positive rate
+        partitions: int
+            The number of partitions to split the rows into when spilling
+    """
+
+    def __init__(self, source, key=None, keep='first', memory_rows=DEDUPE_MEMORY_ROWS,
+                 approximate=False, expected_rows=None, error_rate=DEDUPE_ERROR_RATE,
+                 partitions=DEDUPE_PARTITIONS):
+
+        if keep not in ('first', 'last'):
+            raise ValueError('keep must be first or last')
+
+        self.source = source
+        self.key = [key] if isinstance(key, str) else key
+        self.keep = keep
+        self.memory_rows = memory_rows
+        self.approximate = approximate
+        self.expected_rows = expected_rows
+        self.error_rate = error_rate
+        self.partitions = partitions
+
+        self.stats = None
+
+    def _rows(self):
+
+        rows = iter(self.source)
+        header = tuple(next(rows))
+        rows = pad_rows(rows, len(header))
+
+        if self.key is None:
+            return header, (lambda row: row), rows
+
+        for field in self.key:
+            if field not in header:
+                raise petl.errors.FieldSelectionError(field)
+
+        return header, key_getter([header.index(field) for field in self.key]), rows
+
+    def __iter__(self):
+
+        header, key, rows = self._rows()
+        yield header
+
+        stats = {'input_rows': 0, 'output_rows': 0, 'duplicates': 0, 'spilled': False}
+
+        if self.approximate:
+            unique = self._dedupe_bloom(key, stats)
+        elif self.keep == 'first':
+            unique = self._dedupe_first(header, key, rows, stats)
+        else:
+            unique = self._dedupe_last(header, key, rows, stats)
+
+        for row in unique:
+            stats['output_rows'] += 1
+            yield row
+
+        stats['duplicates'] = stats['input_rows'] - stats['output_rows']
+        self.stats = stats
+        logger.info(f"Removed {stats['duplicates']} duplicate rows of {stats['input_rows']}.")
+
+    def _count(self, rows, stats):
+
+        for row in rows:
+            stats['input_rows'] += 1
+            yield row
+
+    def _dedupe_first(self, header, key, rows, stats):
+
+        rows = self._count(rows, stats)
+        seen = set()
+
+        for row in rows:
+            row_key = key(row)
+            if row_key in seen:
+                continue
+
+            if len(seen) >= self.memory_rows:
+                stats['spilled'] = True
+                yield from self._spill_first(seen, itertools.chain([row], rows), header, key)
+                return
+
+            seen.add(row_key)
+            yield row
+
+    def _spill_first(self, seen, rows, header, key):
+
+        key_paths = partition_rows(((k,) for k in seen), ['key'], lambda row: row[0],
+                                   self.partitions)
+        seen.clear()
+        row_paths = partition_rows(rows, header, key, self.partitions)
+
+        for key_path, row_path in zip(key_paths, row_paths):
+            seen = set(row[0] for row in _read_partition(key_path))
+            for row in _read_partition(row_path):
+                row_key = key(row)
+                if row_key not in seen:
+                    seen.add(row_key)
+                    yield row
+
+            close_temp_file(key_path)
+            close_temp_file(row_path)
+
+    def _dedupe_last(self, header, key, rows, stats):
+
+        rows = self._count(rows, stats)
+        latest = {}
+
+        for row in rows:
+            row_key = key(row)
+
+            # Move keys that are seen again to the end, so rows are ordered by last occurrence
+            if row_key in latest:
+                del latest[row_key]
+
+            elif len(latest) >= self.memory_rows:
+                stats['spilled'] = True
+                yield from self._spill_last(latest, itertools.chain([row], rows), header, key)
+                return
+
+            latest[row_key] = row
+
+        yield from latest.values()
+
+    def _spill_last(self, latest, rows, header, key):
+
+        # The rows in memory come before the remaining rows in each partition, so later rows
+        # still replace them
+        paths = partition_rows(itertools.chain(latest.values(), rows), header, key,
+                               self.partitions)
+        latest.clear()
+
+        for path in paths:
+            for row in _read_partition(path):
+                row_key = key(row)
+                latest.pop(row_key, None)
+                latest[row_key] = row
+
+            yield from latest.values()
+            latest.clear()
+            close_temp_file(path)
+
+    def _dedupe_bloom(self, key, stats):
+
+        if self.expected_rows is None:
+            self.expected_rows = sum(1 for _ in self._rows()[2])
+
+        bloom = BloomFilter(self.expected_rows, self.error_rate)
+        candidates = set()
+
+        for row in self._rows()[2]:
+            row_key = key(row)
+            if bloom.add(row_key):
+                candidates.add(row_key)
+
+        del bloom
+        rows = self._count(self._rows()[2], stats)
+
+        if self.keep == 'first':
+            seen = set()
+            for row in rows:
+                row_key = key(row)
+                if row_key in candidates:
+                    if row_key in seen:
+                        continue
+                    seen.add(row_key)
+                yield row
+
+            return
+
+        last = {}
+        for index, row in enumerate(self._rows()[2]):
+            row_key = key(row)
+            if row_key in candidates:
+                last[row_key] = index
+
+        for index, row in enumerate(rows):
+            row_key = key(row)
+            if row_key not in candidates or last[row_key] == index:
+                yield row
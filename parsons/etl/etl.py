@@ -1,5 +1,13 @@
+import itertools
 import petl
 import logging
+from parsons.etl.columnar import ColumnarView
+from parsons.etl.dedupe import DeduplicateView, DEDUPE_MEMORY_ROWS
+from parsons.etl.flatten import FLATTEN_SAMPLE_SIZE, FlatTable, JsonFlattener
+from parsons.etl.joins import HashJoinView, JOIN_MEMORY_ROWS
+from parsons.etl.parallel import parallel_add_field, parallel_convert
+from parsons.etl.profiler import profile_table
+from parsons.etl.sort import ExternalSortView, SORT_MEMORY_ROWS
 
 logger = logging.getLogger(__name__)
 
@@ -10,7 +18,7 @@ class ETL(object):
 
         pass
 
-    def add_column(self, column, value=None, index=None):
+    def add_column(self, column, value=None, index=None, workers=None):
         """
         Add a column to your table
 
@@ -21,6 +29,11 @@ class ETL(object):
                 A fixed or calculated value
             index: int
                 The position of the new column in the table
+            workers: int
+                If ``value`` is a function, the number of worker processes to calculate it
+                in. The function must be picklable (eg. defined at the top level of a module,
+                not a lambda). Useful for CPU heavy functions on large tables. If ``None``,
+                the value is calculated in this process.
         `Returns:`
             `Parsons Table` and also updates self
         """
@@ -28,7 +41,11 @@ class ETL(object):
         if column in self.columns:
             raise ValueError(f"Column {column} already exists")
 
-        self.table = self.table.addfield(column, value, index)
+        if workers and callable(value):
+            self.table = parallel_add_field(self.table, column, value, index=index,
+                                            workers=workers)
+        else:
+            self.table = self.table.addfield(column, value, index)
 
         return self
 
@@ -127,7 +144,7 @@ class ETL(object):
 
         return self
 
-    def convert_column(self, *column, **kwargs):
+    def convert_column(self, *column, workers=None, **kwargs):
         """
         Transform values under one or more fields via arbitrary functions, method
         invocations or dictionary translations. This leverages the petl ``convert()``
@@ -136,13 +153,24 @@ class ETL(object):
         `Args:`
             *column: str
                 A single column or multiple columns passed as a list
+            workers: int
+                The number of worker processes to run the conversion in. Only supported when
+                converting with a single picklable function (eg. defined at the top level of a
+                module, not a lambda) and no other keyword arguments. Useful for CPU heavy
+                functions on large tables. If ``None``, the conversion runs in this process.
             **kwargs: str, method or variable
                 The update function, method, or variable to process the update
         `Returns:`
             `Parsons Table` and also updates self
         """  # noqa: E501,E261
 
-        self.table = petl.convert(self.table, *column, **kwargs)
+        if workers:
+            if len(column) != 2 or not callable(column[1]) or kwargs:
+                raise ValueError('workers is only supported when converting with a function')
+
+            self.table = parallel_convert(self.table, column[0], column[1], workers)
+        else:
+            self.table = petl.convert(self.table, *column, **kwargs)
 
         return self
 
@@ -157,14 +185,11 @@ class ETL(object):
             int
         """
 
-        max_width = 0
-
-        for v in petl.values(self.table, column):
-
-            if len(str(v).encode('utf-8')) > max_width:
-                max_width = len(str(v).encode('utf-8'))
+        # Columnar tables can find the width from the column alone (or its distinct values)
+        if isinstance(self.table, ColumnarView):
+            return self.table.column_max_width(column)
 
-        return max_width
+        return self._column_profile(column)['max_width']
 
     def convert_columns_to_str(self):
         """
@@ -336,7 +361,7 @@ class ETL(object):
                 A list of Python types
         """
 
-        return list(petl.typeset(self.table, column))
+        return list(self._column_profile(column)['type'])
 
     def get_columns_type_stats(self):
         """
@@ -350,10 +375,60 @@ class ETL(object):
                 A list of dicts, each containing a column 'name' and a 'type' list
         """
 
-        return [{'name': col, 'type': self.get_column_types(col)}
-                for col in self.table.columns()]
+        return [{'name': col['name'], 'type': list(col['type'])}
+                for col in self._profile(full=False)[1]]
 
-    def convert_table(self, *args):
+    def profile(self):
+        """
+        Return stats for every column, calculated in a single pass over the table no matter
+        how many columns it has.
+
+        The profile is cached until the table is changed (by a transformation or by
+        materializing it). Methods that need only types, widths or null counts, such as
+        :meth:`get_column_types`, :meth:`get_columns_type_stats`, :meth:`get_column_max_width`
+        and ``empty_column``, share a lighter profile that skips the min, max and distinct
+        counts, so between them they read the table once, and they reuse a full profile if
+        one has already been calculated.
+
+        `Returns:`
+            list
+                A list of dicts, one per column, containing:
+
+                * ``name``: The column name
+                * ``type``: A list of the names of the python types in the column
+                * ``null_count``: The number of ``None`` values
+                * ``max_width``: The width of the widest value, as a string, in utf-8 bytes
+                * ``min`` and ``max``: The smallest and largest non-null values, or ``None`` if
+                  the values can't be compared (eg. a mix of strings and ints)
+                * ``distinct_count``: The number of distinct non-null values. Exact up to
+                  100,000 values, and an estimate beyond that.
+        """
+
+        return [dict(col, type=list(col['type'])) for col in self._profile()[1]]
+
+    def _profile(self, full=True):
+        # Return the cached (num_rows, column stats) profile, profiling the table if it has
+        # changed since it was last profiled. A full profile also serves requests for a light
+        # one, but not the other way round.
+
+        cached = getattr(self, '_profile_cache', None)
+        if cached is None or cached[0] is not self.table or (full and not cached[1]):
+            num_rows, columns = profile_table(self.table, full=full)
+            cached = self._profile_cache = (self.table, full, num_rows, columns)
+            self._num_rows_cache = (self.table, num_rows)
+
+        return cached[2:]
+
+    def _column_profile(self, column):
+        # The light (types, widths and null counts) profile of a column
+
+        for col in self._profile(full=False)[1]:
+            if col['name'] == column:
+                return col
+
+        raise petl.errors.FieldSelectionError(column)
+
+    def convert_table(self, *args, workers=None):
         """
         Transform all cells in a table via arbitrary functions, method invocations or dictionary
         translations. This method is useful for cleaning fields and data hygiene functions such
@@ -363,11 +438,14 @@ class ETL(object):
         `Args:`
             \*args: str, method or variable
                 The update function, method, or variable to process the update. Can also
+            workers: int
+                The number of worker processes to run the conversion in. See
+                :meth:`convert_column`.
         `Returns:`
             `Parsons Table` and also updates self
         """  # noqa: W605
 
-        self.convert_column(self.columns, *args)
+        self.convert_column(self.columns, *args, workers=workers)
 
         return self
 
@@ -458,10 +536,7 @@ class ETL(object):
         )
 
         # Find the max number of values in list for all rows
-        col_count = 0
-        for row in self.cut(column):
-            if len(row[column]) > col_count:
-                col_count = len(row[column])
+        col_count = max(map(len, petl.values(self.table, column)), default=0)
 
         # If max columns provided, set max columns
         if col_count > 0 and max_columns:
@@ -485,7 +560,7 @@ class ETL(object):
         """
         Unpack list or dict values from one column into separate rows.
         Not recommended for JSON columns (i.e. lists of dicts), but can handle columns
-        with any mix of types. Makes use of PETL's `melt()` method.
+        with any mix of types. Reads the table once; for JSON columns, see :meth:`flatten`.
 
         `Args:`
             column: str
@@ -502,65 +577,71 @@ class ETL(object):
             Otherwise, standalone table with key column and unpacked values only
         """
 
+        from parsons.etl.table import Table
+
+        header = self.columns
+        index = header.index(column)
+
+        # Read the table once, splitting the rows into those with a dict and the rest
+        dict_rows = []
+        non_dict_rows = []
+        dict_keys = {}
+        max_len = 0
+
+        for row in self.data:
+            value = row[index]
+            if isinstance(value, dict):
+                dict_rows.append(row)
+                dict_keys.update(dict.fromkeys(value))
+                max_len = max(max_len, len(value))
+            else:
+                non_dict_rows.append(row)
+                if isinstance(value, list):
+                    max_len = max(max_len, len(value))
+
         if isinstance(expand_original, int) and expand_original is not True:
-            lengths = {len(row[column]) for row in self if isinstance(row[column], (dict, list))}
-            max_len = sorted(lengths, reverse=True)[0]
             if max_len > expand_original:
                 expand_original = False
 
-        if expand_original:
-            # Include all columns and filter out other non-dict types in table_list
-            table = self
-            table_list = table.select_rows(lambda row: isinstance(row[column], list))
-        else:
-            # Otherwise, include only key and column, but keep all non-dict types in table_list
-            table = self.cut(key, column)
-            table_list = table.select_rows(lambda row: not isinstance(row[column], dict))
-
-        # All the columns other than column to ignore while melting
-        ignore_cols = table.columns
-        ignore_cols.remove(column)
-
-        # Unpack lists as separate columns
-        table_list.unpack_list(column, replace=True)
-
-        # Rename the columns to retain only the number
-        for col in table_list.columns:
-            if f'{column}_' in col:
-                table_list.rename_column(col, col.replace(f'{column}_', ""))
-
-        # Filter dicts and unpack as separate columns
-        table_dict = table.select_rows(lambda row: isinstance(row[column], dict))
-        table_dict.unpack_dict(column, prepend=False)
+        dict_keys = sorted(dict_keys)
 
-        from parsons.etl.table import Table
-
-        # Use melt to pivot both sets of columns into their own Tables and clean out None values
-        melted_list = Table(petl.melt(table_list.table, ignore_cols))
-        melted_dict = Table(petl.melt(table_dict.table, ignore_cols))
+        def melt(rows, variables):
+            # A row for each non-null packed value, holding its list index or dict key
+            for row in rows:
+                packed = row[index]
+                for variable, value in variables(packed):
+                    if value is not None:
+                        yield row, variable, value
 
-        melted_list.remove_null_rows('value')
-        melted_dict.remove_null_rows('value')
+        def list_variables(packed):
+            if not isinstance(packed, list):
+                packed = [packed]
+            return ((str(i), value) for i, value in enumerate(packed))
 
-        melted_list.rename_column('variable', column)
-        melted_dict.rename_column('variable', column)
-
-        # Combine the list and dict Tables
-        melted_list.concat(melted_dict)
+        def dict_variables(packed):
+            return ((k, packed.get(k)) for k in dict_keys)
 
         import hashlib
 
+        def uid(row):
+            return hashlib.md5(str.encode(''.join([str(x) for x in row]))).hexdigest()
+
         if expand_original:
-            # Add unpacked rows to the original table (minus packed rows)
-            orig = self.select_rows(lambda row: not isinstance(row[column], (dict, list)))
-            orig.concat(melted_list)
+            # The original rows without packed values, followed by the unpacked rows, with
+            # the list index or dict key in the original column
+            rows = [list(row) + [None] for row in non_dict_rows
+                    if not isinstance(row[index], list)]
+            list_rows = (row for row in non_dict_rows if isinstance(row[index], list))
+            for row, variable, value in itertools.chain(
+                    melt(list_rows, list_variables), melt(dict_rows, dict_variables)):
+                row = list(row)
+                row[index] = variable
+                rows.append(row + [value])
+
+            orig = Table([header + ['value']] + rows)
             # Add unique id column by hashing all the other fields
-            if 'uid' not in self.columns:
-                orig.add_column('uid', lambda row: hashlib.md5(
-                    str.encode(
-                        ''.join([str(x) for x in row])
-                        )
-                    ).hexdigest())
+            if 'uid' not in header:
+                orig.add_column('uid', uid)
                 orig.move_column('uid', 0)
 
             # Rename value column in case this is done again to this Table
@@ -570,17 +651,18 @@ class ETL(object):
             orig.move_column(column, -1)
             output = orig
         else:
-            orig = self.remove_column(column)
+            # Include only key and column, unpacking all non-dict values as lists
+            key_index = header.index(key)
+            rows = [[row[key_index], variable, value]
+                    for row, variable, value in itertools.chain(
+                        melt(non_dict_rows, list_variables), melt(dict_rows, dict_variables))]
+
+            output = Table([[key, column, 'value']] + rows)
+            self.remove_column(column)
             # Add unique id column by hashing all the other fields
-            melted_list.add_column('uid', lambda row: hashlib.md5(
-                str.encode(
-                    ''.join([str(x) for x in row])
-                    )
-                ).hexdigest())
-            melted_list.move_column('uid', 0)
-            output = melted_list
-
-        self = orig
+            output.add_column('uid', uid)
+            output.move_column('uid', 0)
+
         return output
 
     def long_table(self, key, column, key_rename=None, retain_original=False,
@@ -636,26 +718,107 @@ class ETL(object):
         if type(key) == str:
             key = [key]
 
-        lt = self.cut(*key, column)  # Create a table of key and column
-        lt.unpack_list(column, replace=True)  # Unpack the list
-        lt.table = petl.melt(lt.table, key)  # Melt into a long table
-        lt = lt.cut(*key, 'value')  # Get rid of column names created in unpack
-        lt.rename_column('value', column)  # Rename 'value' to old column name
-        lt.remove_null_rows(column)  # Remove null values
+        from parsons.etl.table import Table
+
+        header = self.columns
+        key_indexes = [header.index(k) for k in key]
+        index = header.index(column)
+
+        # Read the table once, collecting the key values and each non-null item of the column
+        items = []
+        for row in self.data:
+            values = row[index]
+            if not isinstance(values, list):
+                values = [values]
+            key_values = [row[i] for i in key_indexes]
+            items.extend((key_values, value) for value in values if value is not None)
 
         # If a new key name is specified, rename
         if key_rename:
-            for k, v in key_rename.items():
-                lt.rename_column(k, v)
+            key = [key_rename.get(k, k) for k in key]
+
+        # If there is a nested dict in the column, unpack it. Its keys are found from a sample
+        # of the items, and sorted, with any keys seen after the sample added at the end.
+        if items and isinstance(items[0][1], dict):
+            prefix = prepend_value or column
+
+            def name(k):
+                return f'{prefix}_{k}' if prepend else k
+
+            sample_keys = set()
+            for _, value in items[:FLATTEN_SAMPLE_SIZE]:
+                if isinstance(value, dict):
+                    sample_keys.update(value)
 
-        # If there is a nested dict in the column, unpack it
-        if lt.num_rows > 0 and isinstance(lt.table[column][0], dict):
-            lt.unpack_dict(column, prepend=prepend, prepend_value=prepend_value)
+            lt = FlatTable(key + [name(k) for k in sorted(sample_keys)])
+            for key_values, value in items:
+                values = dict(zip(key, key_values))
+                if isinstance(value, dict):
+                    values.update((name(k), v) for k, v in value.items())
+                lt.append(values)
+
+        else:
+            lt = FlatTable(key + [column])
+            lt.rows = [key_values + [value] for key_values, value in items]
 
         if not retain_original:
             self.remove_column(column)
 
-        return lt
+        return Table(lt)
+
+    def flatten(self, key, separator='_', sample_size=FLATTEN_SAMPLE_SIZE):
+        """
+        Flatten nested JSON values (dicts and lists, such as those in API responses) in a
+        single pass. Dicts are flattened into columns of this table, and each list becomes a
+        child table that can be joined back to this one on ``key``.
+
+        .. code-block:: python
+
+           tbl = Table([{'id': 1,
+                         'address': {'city': 'Austin', 'state': 'TX'},
+                         'emails': [{'type': 'home', 'email': 'jane@gmail.com'},
+                                    {'type': 'work', 'email': 'jane@mywork.com'}]}])
+
+           children = tbl.flatten('id')
+           print (tbl)
+           >>> {'id': 1, 'address_city': 'Austin', 'address_state': 'TX'}
+
+           print (children['emails'])
+           >>> {'id': 1, 'emails_index': 0, 'type': 'home', 'email': 'jane@gmail.com'}
+           >>> {'id': 1, 'emails_index': 1, 'type': 'work', 'email': 'jane@mywork.com'}
+
+        Lists of values other than dicts are put in a ``value`` column of their child table,
+        and lists nested within list items become child tables of their own (eg.
+        ``emails_labels``), keyed by ``key`` and the index of each enclosing list item. Item
+        fields with the same name as a key column (eg. an ``id`` on each email) are prefixed
+        with the child table's name (``emails_id``), so they don't replace the parent's key.
+
+        The columns are discovered from the first ``sample_size`` rows, and the remaining rows
+        are flattened as they are read. Keys that first appear after the sample are added as
+        columns at the end of their table. The flattened tables are held in memory. See
+        :class:`parsons.etl.flatten.JsonFlattener`.
+
+        `Args:`
+            key: str or list
+                The column or columns that identify each row, copied into every child table
+            separator: str
+                The separator between the keys of a path in column and table names
+            sample_size: int
+                The number of rows used to discover the columns
+        `Returns:`
+            dict
+                The child Parsons Tables, keyed by the path of their lists. Also updates self
+                to the flattened table.
+        """
+
+        from parsons.etl.table import Table
+
+        flattener = JsonFlattener(key, separator=separator, sample_size=sample_size)
+        parent, children = flattener.flatten(self.table)
+
+        self.table = parent
+
+        return {path: Table(child) for path, child in children.items()}
 
     def cut(self, *columns):
         """
@@ -730,6 +893,52 @@ class ETL(object):
 
         return self
 
+    def deduplicate(self, keys=None, keep='first', memory_rows=DEDUPE_MEMORY_ROWS,
+                    approximate=False, expected_rows=None):
+        """
+        Remove rows with duplicate values in one or more columns, keeping either the first or
+        the last of each. Useful before an upsert, which requires a distinct primary key.
+
+        Unlike ``petl.distinct``, the table isn't sorted. Keys seen so far are kept in memory,
+        and if there are more than ``memory_rows`` distinct keys, the rest of the table is
+        partitioned on disk. With ``approximate``, a bloom filter is used to find the keys
+        that might be duplicated, and only those are tracked, which uses far less memory when
+        there are few duplicates. The result is exact either way. See
+        :class:`parsons.etl.dedupe.DeduplicateView`.
+
+        Once the table has been read, the number of duplicates removed is logged and held in
+        ``tbl.table.stats``.
+
+        `Args:`
+            keys: str or list
+                The column or columns that identify a duplicate. If ``None``, rows are only
+                duplicates if every column matches.
+            keep: str
+                Keep the ``first`` or ``last`` row of each key
+            memory_rows: int
+                The number of distinct keys to hold in memory before spilling to disk
+            approximate: bool
+                Track keys with a bloom filter rather than in memory. The table is read two
+                (or when keeping the last row, three) times.
+            expected_rows: int
+                With ``approximate``, the (rough) number of rows in the table, used to size
+                the bloom filter. If ``None``, the row count is used if it is already known,
+                and otherwise the table is counted when it is first read, which takes another
+                pass.
+        `Returns:`
+            `Parsons Table` and also updates self
+        """
+
+        if approximate and expected_rows is None:
+            # Only use a count that doesn't need a pass over the table. Otherwise the view
+            # counts the rows itself when it's read.
+            expected_rows = self._known_num_rows()
+
+        self.table = DeduplicateView(self.table, key=keys, keep=keep, memory_rows=memory_rows,
+                                     approximate=approximate, expected_rows=expected_rows)
+
+        return self
+
     def _prepend_dict(self, dict_obj, prepend):
         # Internal method to rename dict keys
 
@@ -786,6 +995,145 @@ class ETL(object):
 
         self.table = petl.cat(self.table, *petl_tables, missing=missing)
 
+    def join(self, right, on=None, left_on=None, right_on=None, rprefix='right_',
+             memory_rows=JOIN_MEMORY_ROWS):
+        """
+        Join this table to another, keeping the rows that match in both tables.
+
+        Rather than sorting both tables (as ``petl.join`` does), the smaller table is loaded
+        into a hash table and the other is streamed past it. If neither table fits in
+        ``memory_rows``, both are partitioned into spill files on disk by their keys and
+        joined a partition at a time, so very large tables can be joined in bounded memory.
+        Rows are not sorted.
+
+        Once the joined table has been read, ``joined.table.stats`` holds the number of rows
+        read from each table, matched and output. See
+        :class:`parsons.etl.joins.HashJoinView`.
+
+        .. code-block:: python
+
+            voters = Table.from_csv('voters.csv')
+            van_ids = Table.from_csv('van_ids.csv')
+            matched = voters.join(van_ids, left_on='voter_id', right_on='state_file_id')
+
+        `Args:`
+            right: Parsons Table
+                The table to join to
+            on: str or list
+                The column or columns to join on, when they have the same names in both tables
+            left_on: str or list
+                The column or columns of this table to join on
+            right_on: str or list
+                The column or columns of the right table to join on
+            rprefix: str
+                The prefix added to right table columns that have the same name as a column
+                in this table
+            memory_rows: int
+                The number of rows to hold in memory before spilling to disk
+        `Returns:`
+            A new parsons table with the columns of this table, followed by the non-key
+            columns of the right table
+        """
+
+        return self._hash_join(right, 'inner', on, left_on, right_on, rprefix, memory_rows)
+
+    def left_join(self, right, on=None, left_on=None, right_on=None, rprefix='right_',
+                  memory_rows=JOIN_MEMORY_ROWS):
+        """
+        Join this table to another, keeping every row of this table. The right table's columns
+        are ``None`` for rows that don't match. See :meth:`join`.
+
+        `Args:`
+            right: Parsons Table
+                The table to join to
+            on: str or list
+                The column or columns to join on, when they have the same names in both tables
+            left_on: str or list
+                The column or columns of this table to join on
+            right_on: str or list
+                The column or columns of the right table to join on
+            rprefix: str
+                The prefix added to right table columns that have the same name as a column
+                in this table
+            memory_rows: int
+                The number of rows to hold in memory before spilling to disk
+        `Returns:`
+            A new parsons table
+        """
+
+        return self._hash_join(right, 'left', on, left_on, right_on, rprefix, memory_rows)
+
+    def anti_join(self, right, on=None, left_on=None, right_on=None,
+                  memory_rows=JOIN_MEMORY_ROWS):
+        """
+        Return the rows of this table that don't match any row of another table. See
+        :meth:`join`.
+
+        `Args:`
+            right: Parsons Table
+                The table to match against
+            on: str or list
+                The column or columns to match on, when they have the same names in both
+                tables
+            left_on: str or list
+                The column or columns of this table to match on
+            right_on: str or list
+                The column or columns of the right table to match on
+            memory_rows: int
+                The number of rows to hold in memory before spilling to disk
+        `Returns:`
+            A new parsons table with the columns of this table
+        """
+
+        return self._hash_join(right, 'anti', on, left_on, right_on, None, memory_rows)
+
+    def lookup(self, right, on=None, left_on=None, right_on=None, rprefix='right_',
+               memory_rows=JOIN_MEMORY_ROWS):
+        """
+        Look up values from another table for each row of this table. Like :meth:`left_join`,
+        except that only the first matching row of the right table is used, so the result has
+        exactly one row for each row of this table.
+
+        `Args:`
+            right: Parsons Table
+                The table to look values up in
+            on: str or list
+                The column or columns to match on, when they have the same names in both
+                tables
+            left_on: str or list
+                The column or columns of this table to match on
+            right_on: str or list
+                The column or columns of the right table to match on
+            rprefix: str
+                The prefix added to right table columns that have the same name as a column
+                in this table
+            memory_rows: int
+                The number of rows to hold in memory before spilling to disk
+        `Returns:`
+            A new parsons table
+        """
+
+        return self._hash_join(right, 'lookup', on, left_on, right_on, rprefix, memory_rows)
+
+    def _hash_join(self, right, join_type, on, left_on, right_on, rprefix, memory_rows):
+
+        from parsons.etl.table import Table
+
+        left_on = left_on or on
+        right_on = right_on or on
+
+        if not left_on or not right_on:
+            raise ValueError('Either on, or both left_on and right_on, must be provided')
+
+        if isinstance(left_on, str):
+            left_on = [left_on]
+        if isinstance(right_on, str):
+            right_on = [right_on]
+
+        return Table(HashJoinView(self.table, right.table, left_on, right_on,
+                                  join_type=join_type, rprefix=rprefix,
+                                  memory_rows=memory_rows))
+
     def chunk(self, rows):
         """
         Divides a Parsons table into smaller tables of a specified row count. If the table
@@ -801,6 +1149,35 @@ class ETL(object):
         from parsons.etl import Table
         return [Table(petl.rowslice(self.table, i, i+rows)) for i in range(0, self.num_rows, rows)]
 
+    def iter_chunks(self, rows):
+        """
+        Generator that divides a Parsons table into smaller tables of a specified row count.
+        The table is read once, from start to finish, and each chunk is materialized as it is
+        yielded, so one chunk is held in memory at a time. The chunks from :meth:`chunk` are
+        lazy views instead, which each read the table from the start when they are used, so
+        this is the better choice when every chunk will be read in turn.
+
+        `Args:`
+            rows: int
+                The number of rows of each new Parsons table
+        `Returns:`
+            Generator of Parsons tables
+        """
+
+        from parsons.etl import Table
+
+        table_rows = iter(self.table)
+        header = next(table_rows, None)
+        if header is None:
+            return
+
+        header = list(header)
+        while True:
+            data = list(itertools.islice(table_rows, rows))
+            if not data:
+                return
+            yield Table([header] + data)
+
     @staticmethod
     def get_normalized_column_name(column_name):
         """
@@ -985,31 +1362,49 @@ class ETL(object):
 
         """ # noqa: E501,E261
 
+        table = self.table
+        if not presorted:
+            table = ExternalSortView(table, key=columns)
+
         self.table = petl.rowreduce(
-            self.table,
+            table,
             columns,
             reduce_func,
             header=headers,
-            presorted=presorted,
+            presorted=True,
             **kwargs)
 
         return self
 
-    def sort(self, columns=None, reverse=False):
+    def sort(self, columns=None, reverse=False, memory_rows=SORT_MEMORY_ROWS, temp_dir=None,
+             workers=None):
         """
         Sort the rows a table.
 
+        Tables with more than ``memory_rows`` rows are sorted in runs that are written to disk
+        and then merged, so memory use stays bounded however large the table is. See
+        :class:`parsons.etl.sort.ExternalSortView`.
+
         `Args:`
             sort_columns: list or str
                 Sort by a single column or a list of column. If ``None`` then
                 will sort columns from left to right.
             reverse: boolean
                 Sort rows in reverse order.
+            memory_rows: int
+                The number of rows to sort in memory at once
+            temp_dir: str
+                The directory to write sorted runs to. Defaults to the system temp directory.
+            workers: int
+                The number of worker processes to sort runs in. If ``None``, runs are sorted in
+                this process.
         `Returns:`
             `Parsons Table` and also updates self
         """
 
-        self.table = petl.sort(self.table, key=columns, reverse=reverse)
+        self.table = ExternalSortView(self.table, key=columns, reverse=reverse,
+                                      memory_rows=memory_rows, temp_dir=temp_dir,
+                                      workers=workers)
 
         return self
 
@@ -0,0 +1,248 @@
+import itertools
+
+import petl
+
+__all__ = [
+    'FlatTable',
+    'JsonFlattener',
+]
+
+# The number of rows read to discover the columns of nested values before any output rows are
+# built. Columns first seen after the sample are added to the end of the table.
+FLATTEN_SAMPLE_SIZE = 5000
+
+
+class FlatTable(petl.Table):
+    """
+    An in-memory petl table built up from dicts of values, which adds a column whenever it
+    sees a new key. Rows added before a column existed are padded with ``None``.
+
+    `Args:`
+        columns: list
+            The initial columns of the table
+    """
+
+    def __init__(self, columns=()):
+
+        self.columns = []
+        self.rows = []
+        self._indexes = {}
+
+        for column in columns:
+            self.add_column(column)
+
+    def add_column(self, column):
+        """
+        Add a column to the end of the table.
+
+        `Args:`
+            column: str
+                The column name
+        `Returns:`
+            int
+                The index of the column
+        """
+
+        self._indexes[column] = len(self.columns)
+        self.columns.append(column)
+
+        return self._indexes[column]
+
+    def append(self, values):
+        """
+        Add a row to the table.
+
+        `Args:`
+            values: dict
+                The row's values, keyed by column name
+        """
+
+        row = [None] * len(self.columns)
+
+        for column, value in values.items():
+            index = self._indexes.get(column)
+            if index is None:
+                index = self.add_column(column)
+                row.append(None)
+            row[index] = value
+
+        self.rows.append(row)
+
+    def remove_empty_columns(self, columns):
+        """
+        Remove columns that have no values other than ``None``.
+
+        `Args:`
+            columns: list
+                The columns to check
+        """
+
+        empty = [column for column in columns
+                 if column in self._indexes
+                 and all(len(row) <= self._indexes[column] or row[self._indexes[column]] is None
+                         for row in self.rows)]
+
+        if empty:
+            self.reorder(lambda column: 0, exclude=empty)
+
+    def reorder(self, rank, exclude=()):
+        """
+        Reorder the columns (and the values of every row added so far).
+
+        `Args:`
+            rank: function
+                A function that takes a column name and returns a value to sort it by.
+                Columns with the same rank keep their current order.
+            exclude: list
+                Columns to remove
+        """
+
+        order = sorted((i for i, column in enumerate(self.columns) if column not in exclude),
+                       key=lambda i: rank(self.columns[i]))
+
+        self.columns = [self.columns[i] for i in order]
+        self._indexes = {column: i for i, column in enumerate(self.columns)}
+        self.rows = [[row[i] if i < len(row) else None for i in order] for row in self.rows]
+
+    def __iter__(self):
+
+        yield tuple(self.columns)
+
+        width = len(self.columns)
+        for row in self.rows:
+            if len(row) < width:
+                row = row + [None] * (width - len(row))
+            yield tuple(row)
+
+
+class JsonFlattener:
+    """
+    Flattens nested JSON values (dicts and lists, such as those in API responses) into a parent
+    table and a set of child tables, in a single pass over the rows.
+
+    Dicts are flattened into columns named by the path of their keys (eg. ``address_city``).
+    Each list becomes a child table, named by its path, with a row for each item. Child rows
+    hold the parent's ``key`` columns and the position of the item in the list (eg.
+    ``emails_index``), so they can be joined back to the parent. Dict items are flattened into
+    columns of the child table, and any other items go in a ``value`` column. Item fields with
+    the same name as a key or index column are prefixed with the child table's path (eg.
+    ``emails_id``). Lists within list items become child tables of the child table, keyed by
+    both indexes, and lists directly within lists are named ``value`` (eg. ``matrix_value``).
+
+    The first ``sample_size`` rows are flattened first, to discover the columns and put them
+    in order, with the columns flattened from each parent column in that column's position.
+    The remaining rows are then flattened as they are read. Keys that first appear after the
+    sample still get their own columns, which are added at the end of their table.
+
+    `Args:`
+        key: str or list
+            The column or columns that identify each row, copied into every child table
+        separator: str
+            The separator between the keys of a path in column and table names
+        sample_size: int
+            The number of rows used to discover the columns
+    """
+
+    def __init__(self, key, separator='_', sample_size=FLATTEN_SAMPLE_SIZE):
+
+        self.key = [key] if isinstance(key, str) else list(key)
+        self.separator = separator
+        self.sample_size = sample_size
+
+    def _join(self, path, name):
+
+        return f'{path}{self.separator}{name}' if path else name
+
+    def flatten(self, table):
+        """
+        Flatten a table.
+
+        `Args:`
+            table: petl table
+                The table to flatten
+        `Returns:`
+            tuple
+                The parent ``FlatTable``, and a dict of child ``FlatTable`` objects keyed by
+                their paths
+        """
+
+        rows = iter(table)
+        header = list(next(rows))
+
+        for column in self.key:
+            if column not in header:
+                raise petl.errors.FieldSelectionError(column)
+
+        key_indexes = [header.index(column) for column in self.key]
+        self._dict_columns = set()
+        parent = FlatTable()
+        children = {}
+        ranks = {}
+
+        for count, row in enumerate(rows):
+            values = {}
+            keys = {column: row[i] for column, i in zip(self.key, key_indexes)}
+
+            if count < self.sample_size:
+                # Remember which parent column each flattened column came from, so the columns
+                # can be put in order once the sample has been read
+                for index, (column, value) in enumerate(zip(header, row)):
+                    start = len(values)
+                    self._emit(value, column, values, '', keys, children)
+                    for name in itertools.islice(values, start, None):
+                        ranks.setdefault(name, index)
+
+            else:
+                if count == self.sample_size:
+                    parent.reorder(lambda name: ranks.get(name, len(header)))
+
+                for column, value in zip(header, row):
+                    self._emit(value, column, values, '', keys, children)
+
+            parent.append(values)
+
+        if len(parent.rows) <= self.sample_size:
+            parent.reorder(lambda name: ranks.get(name, len(header)))
+
+        # Columns that held nested values in some rows and None in the rest have been
+        # flattened, so don't need to be kept for the None values
+        parent.remove_empty_columns([column for column in header
+                                     if column in children or column in self._dict_columns])
+
+        return parent, children
+
+    def _emit(self, value, name, values, path, keys, children):
+        # Add a value to a row's values. Dicts are flattened into the row, and each list item
+        # is added as a row of the child table for the list's path.
+
+        if isinstance(value, dict):
+            if not path:
+                self._dict_columns.add(name)
+            for item_key, item in value.items():
+                self._emit(item, self._join(name, item_key), values, path, keys, children)
+
+        elif isinstance(value, list):
+            # Lists directly within lists have no name of their own
+            child_path = self._join(path, name or 'value')
+            child = children.get(child_path)
+            if child is None:
+                child = children[child_path] = FlatTable(keys)
+
+            index_column = self._join(child_path, 'index')
+            for index, item in enumerate(value):
+                child_keys = dict(keys)
+                child_keys[index_column] = index
+                item_values = {}
+                self._emit(item, '', item_values, child_path, child_keys, children)
+
+                # Fields of the item with the same name as a key or index column (eg. an id
+                # on every item) are prefixed with the child path, so they don't replace it
+                child_values = dict(child_keys)
+                for item_name, item_value in item_values.items():
+                    while item_name in child_keys:
+                        item_name = self._join(child_path, item_name)
+                    child_values[item_name] = item_value
+                child.append(child_values)
+
+        else:
+            values[name or 'value'] = value
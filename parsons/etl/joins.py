@@ -0,0 +1,337 @@
+import itertools
+import logging
+
+import petl
+
+from parsons.utilities.files import close_temp_file, create_temp_file
+from parsons.utilities.spill import SpillView, SpillWriter
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'HashJoinView',
+    'partition_rows',
+]
+
+# The number of rows of the build side of a join to hold in memory. When neither side of the
+# join fits, both are split into JOIN_PARTITIONS spill files by the hash of their keys, and
+# the partitions are joined one pair at a time (a "grace" hash join). Partitions whose build
+# side still doesn't fit are split again, up to JOIN_MAX_DEPTH times. (Rows with the same key
+# can't be split, so a single key with more rows than the budget is joined in one piece.)
+JOIN_MEMORY_ROWS = 1000000
+JOIN_PARTITIONS = 16
+JOIN_MAX_DEPTH = 4
+
+JOIN_TYPES = ('inner', 'left', 'anti', 'lookup')
+
+_MASK = 2 ** 64 - 1
+
+
+def key_getter(indexes):
+    """
+    Return a function that gets the key of a row tuple.
+
+    `Args:`
+        indexes: list
+            The indexes of the key's fields
+    `Returns:`
+        function
+            Returns the single value of a one field key, or a tuple of the values otherwise
+    """
+
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda row: row[index]
+
+    return lambda row: tuple(row[i] for i in indexes)
+
+
+def pad_rows(rows, width):
+    """
+    Pad short rows with ``None`` and trim long ones, so that every row is a tuple of ``width``
+    values.
+
+    `Args:`
+        rows: iterable
+            The row tuples
+        width: int
+            The number of values in each row
+    `Returns:`
+        generator
+    """
+
+    for row in rows:
+        if len(row) != width:
+            row = tuple(itertools.islice(itertools.chain(row, itertools.repeat(None)), width))
+        elif type(row) is not tuple:
+            row = tuple(row)
+        yield row
+
+
+def _mix(value, seed):
+    # Scramble a hash with a seed (the splitmix64 finalizer). Python's hashes of small ints
+    # and tuples keep their low bits, which pick the partition, so keys that shared a
+    # partition would share one again with a plain hash((seed, key)).
+
+    value = (value + seed * 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+
+    return value ^ (value >> 31)
+
+
+def partition_rows(rows, columns, key, partitions, seed=0):
+    """
+    Split rows into spill files by the hash of their keys, so that rows with equal keys are
+    always in the same partition.
+
+    `Args:`
+        rows: iterable
+            The row tuples to partition
+        columns: list
+            The column names of the rows
+        key: function
+            A function that gets the key of a row
+        partitions: int
+            The number of partitions
+        seed: int
+            Mixed into the hash, so that the rows of a partition can be split again with a
+            different seed. Rows partitioned with the same seed always match up.
+    `Returns:`
+        list
+            The paths of the spill files, one per partition
+    """
+
+    paths = [create_temp_file(suffix='.spill') for _ in range(partitions)]
+    writers = [SpillWriter(path, columns) for path in paths]
+
+    if seed:
+        def partition(row):
+            return _mix(hash(key(row)), seed) % partitions
+    else:
+        def partition(row):
+            return hash(key(row)) % partitions
+
+    for row in rows:
+        writers[partition(row)].write_rows((row,))
+
+    for writer in writers:
+        writer.close()
+
+    return paths
+
+
+def _read_partition(path):
+
+    for block in SpillView(path).blocks():
+        yield from block
+
+
+def _field_indexes(header, fields):
+
+    for field in fields:
+        if field not in header:
+            raise petl.errors.FieldSelectionError(field)
+
+    return [header.index(field) for field in fields]
+
+
+class HashJoinView(petl.Table):
+    """
+    A petl table that joins two tables with a hash join.
+
+    The right table is loaded into a hash table keyed on its join key, and the left table is
+    streamed past it. For inner joins, if the right table has more than ``memory_rows`` rows
+    but the left table doesn't, the left table is loaded instead. If neither side fits, both
+    are partitioned into spill files on disk by the hash of their keys, and each pair of
+    partitions is joined in turn, so only one partition is held in memory at a time. A pair
+    whose right partition is still larger than ``memory_rows`` is partitioned again with a
+    different hash, so memory stays within the budget however large the tables are (unless a
+    single key has more than ``memory_rows`` right rows).
+
+    Rows are not sorted. When one side fits in memory, rows come out in the order of the
+    streamed side, otherwise they are grouped by partition. As with ``petl.join``, ``None``
+    keys match each other.
+
+    After the table has been read, ``stats`` holds a dict with the number of ``left_rows``,
+    ``right_rows``, ``matched_rows`` (left rows that matched at least one right row) and
+    ``output_rows``, and whether the join ``spilled`` to disk.
+
+    `Args:`
+        left: petl table
+            The left table
+        right: petl table
+            The right table
+        left_key: list
+            The left table's key fields
+        right_key: list
+            The right table's key fields, matched in order with ``left_key``
+        join_type: str
+            One of ``inner``, ``left``, ``anti`` (left rows with no match) or ``lookup`` (a
+            left join that takes only the first matching right row)
+        rprefix: str
+            The prefix added to the right table's fields that have the same name as a left
+            table field
+        memory_rows: int
+            The number of build side rows to hold in memory
+        partitions: int
+            The number of partitions to split each table into when neither fits in memory
+    """
+
+    def __init__(self, left, right, left_key, right_key, join_type='inner', rprefix='right_',
+                 memory_rows=JOIN_MEMORY_ROWS, partitions=JOIN_PARTITIONS):
+
+        if join_type not in JOIN_TYPES:
+            raise ValueError(f'join_type must be one of {", ".join(JOIN_TYPES)}')
+
+        if len(left_key) != len(right_key) or not left_key:
+            raise ValueError('The left and right keys must have the same number of fields')
+
+        self.left = left
+        self.right = right
+        self.left_key = list(left_key)
+        self.right_key = list(right_key)
+        self.join_type = join_type
+        self.rprefix = rprefix
+        self.memory_rows = memory_rows
+        self.partitions = partitions
+
+        self.stats = None
+
+    def __iter__(self):
+
+        left_rows = iter(self.left)
+        left_header = tuple(next(left_rows))
+        right_rows = iter(self.right)
+        right_header = tuple(next(right_rows))
+
+        left_key = key_getter(_field_indexes(left_header, self.left_key))
+        right_indexes = _field_indexes(right_header, self.right_key)
+        right_key = key_getter(right_indexes)
+
+        # The right table's fields that are added to each left row
+        self._values = [i for i in range(len(right_header)) if i not in right_indexes]
+
+        if self.join_type == 'anti':
+            yield left_header
+        else:
+            yield left_header + tuple(
+                self.rprefix + right_header[i] if right_header[i] in left_header
+                else right_header[i]
+                for i in self._values)
+
+        stats = {'left_rows': 0, 'right_rows': 0, 'matched_rows': 0, 'output_rows': 0,
+                 'spilled': False}
+        left_rows = self._count(pad_rows(left_rows, len(left_header)), stats, 'left_rows')
+        right_rows = self._count(pad_rows(right_rows, len(right_header)), stats, 'right_rows')
+
+        # Read one more row than the budget, to find out whether the right side fits
+        right_buffer = list(itertools.islice(right_rows, self.memory_rows + 1))
+
+        if len(right_buffer) <= self.memory_rows:
+            yield from self._join(right_buffer, left_rows, right_key, left_key, stats)
+
+        else:
+            right_rows = itertools.chain(right_buffer, right_rows)
+            right_buffer = None
+
+            left_buffer = []
+            if self.join_type == 'inner':
+                left_buffer = list(itertools.islice(left_rows, self.memory_rows + 1))
+
+            if self.join_type == 'inner' and len(left_buffer) <= self.memory_rows:
+                yield from self._join(left_buffer, right_rows, left_key, right_key, stats,
+                                      swapped=True)
+
+            else:
+                stats['spilled'] = True
+                left_rows = itertools.chain(left_buffer, left_rows)
+                left_buffer = None
+
+                yield from self._join_partitions(left_rows, right_rows, left_header,
+                                                 right_header, left_key, right_key, stats)
+
+        self.stats = stats
+        logger.info(f"Joined {stats['left_rows']} left rows to {stats['right_rows']} right "
+                    f"rows: {stats['matched_rows']} left rows matched, "
+                    f"{stats['output_rows']} rows output.")
+
+    def _join_partitions(self, left_rows, right_rows, left_header, right_header, left_key,
+                         right_key, stats, depth=0):
+        # Partition both sides and join each pair of partitions, partitioning again any pair
+        # whose right partition doesn't fit in memory
+
+        left_paths = partition_rows(left_rows, left_header, left_key, self.partitions,
+                                    seed=depth)
+        right_paths = partition_rows(right_rows, right_header, right_key, self.partitions,
+                                     seed=depth)
+
+        for left_path, right_path in zip(left_paths, right_paths):
+            if (SpillView(right_path).num_rows > self.memory_rows
+                    and depth + 1 < JOIN_MAX_DEPTH):
+                yield from self._join_partitions(
+                    _read_partition(left_path), _read_partition(right_path), left_header,
+                    right_header, left_key, right_key, stats, depth + 1)
+            else:
+                yield from self._join(_read_partition(right_path), _read_partition(left_path),
+                                      right_key, left_key, stats)
+
+            close_temp_file(left_path)
+            close_temp_file(right_path)
+
+    @staticmethod
+    def _count(rows, stats, name):
+
+        for row in rows:
+            stats[name] += 1
+            yield row
+
+    def _join(self, build_rows, probe_rows, build_key, probe_key, stats, swapped=False):
+        # Join the rows of an in-memory hash table (usually built from the right table, but
+        # from the left if swapped) with the rows streamed from the other table.
+
+        values = self._values
+        missing = (None,) * len(values)
+
+        hashed = {}
+        if self.join_type == 'lookup':
+            for row in build_rows:
+                hashed.setdefault(build_key(row), [row])
+        else:
+            for row in build_rows:
+                hashed.setdefault(build_key(row), []).append(row)
+
+        if swapped:
+            # Only inner joins are swapped. The left rows are in the hash table, so count the
+            # ones that matched once every right row has been probed.
+            matched = set()
+            for row in probe_rows:
+                key = probe_key(row)
+                if key in hashed:
+                    matched.add(key)
+                    right_values = tuple(row[i] for i in values)
+                    for left_row in hashed[key]:
+                        stats['output_rows'] += 1
+                        yield left_row + right_values
+
+            stats['matched_rows'] += sum(len(hashed[key]) for key in matched)
+            return
+
+        for row in probe_rows:
+            matches = hashed.get(probe_key(row))
+
+            if matches:
+                stats['matched_rows'] += 1
+                if self.join_type == 'anti':
+                    continue
+                for right_row in matches:
+                    stats['output_rows'] += 1
+                    yield row + tuple(right_row[i] for i in values)
+
+            elif self.join_type == 'anti':
+                stats['output_rows'] += 1
+                yield row
+
+            elif self.join_type != 'inner':
+                stats['output_rows'] += 1
+                yield row + missing
@@ -0,0 +1,170 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import itertools
+
+import petl
+from petl.util.base import Record
+
+__all__ = [
+    'ParallelMapView',
+    'parallel_convert',
+    'parallel_add_field',
+]
+
+# Number of rows sent to a worker process at a time
+PARALLEL_BLOCK_SIZE = 1000
+
+
+def _convert_block(func, indexes, rows):
+    # Apply func to the values at the given indexes of every row
+
+    converted = []
+    for row in rows:
+        row = list(row)
+        for i in indexes:
+            row[i] = func(row[i])
+        converted.append(tuple(row))
+
+    return converted
+
+
+def _add_field_block(func, fields, index, rows):
+    # Insert the result of calling func with each row (as a petl record) at index
+
+    added = []
+    for row in rows:
+        row = list(row)
+        row.insert(index, func(Record(row, fields)))
+        added.append(tuple(row))
+
+    return added
+
+
+class ParallelMapView(petl.Table):
+    """
+    A petl table that transforms the rows of another table in a pool of worker processes.
+
+    Rows are read from the source in blocks of ``block_size``, and each block is passed to
+    ``block_func`` in a worker process. At most two blocks per worker are in flight at once, so
+    memory use is bounded no matter how large the table is, and the transformed rows are
+    yielded in their original order. As with other petl views, the rows are transformed again
+    each time the table is read, so materialize the table if it will be read more than once.
+
+    `Args:`
+        source: petl table
+            The table to transform
+        block_func: function
+            A picklable function that takes a list of row tuples and returns the list of
+            transformed row tuples
+        header_func: function
+            A function that takes the source's header and returns the transformed header
+        workers: int
+            The number of worker processes
+        block_size: int
+            The number of rows to send to a worker at a time
+    """
+
+    def __init__(self, source, block_func, header_func, workers,
+                 block_size=PARALLEL_BLOCK_SIZE):
+
+        self.source = source
+        self.block_func = block_func
+        self.header_func = header_func
+        self.workers = workers
+        self.block_size = block_size
+
+    def __iter__(self):
+
+        rows = iter(self.source)
+        header = tuple(next(rows))
+        yield tuple(self.header_func(header))
+
+        # Pad short rows and trim long ones, so that every row matches the header
+        width = len(header)
+        rows = (tuple(itertools.islice(itertools.chain(row, itertools.repeat(None)), width))
+                for row in rows)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+
+            while True:
+                block = list(itertools.islice(rows, self.block_size))
+                if not block:
+                    break
+
+                pending.append(executor.submit(self.block_func, block))
+                if len(pending) >= self.workers * 2:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+
+def parallel_convert(table, fields, func, workers, block_size=PARALLEL_BLOCK_SIZE):
+    """
+    Convert the values of one or more fields with ``func``, in a pool of worker processes.
+
+    `Args:`
+        table: petl table
+            The table to convert
+        fields: str or list
+            The field or fields to convert
+        func: function
+            A picklable function (eg. defined at the top level of a module, not a lambda) that
+            takes a value and returns the converted value
+        workers: int
+            The number of worker processes
+        block_size: int
+            The number of rows to send to a worker at a time
+    `Returns:`
+        ParallelMapView
+    """
+
+    if isinstance(fields, str):
+        fields = [fields]
+
+    header = list(petl.header(table))
+    missing = [f for f in fields if f not in header]
+    if missing:
+        raise petl.errors.FieldSelectionError(missing[0])
+
+    indexes = [header.index(f) for f in fields]
+    block_func = functools.partial(_convert_block, func, indexes)
+
+    return ParallelMapView(table, block_func, lambda h: h, workers, block_size=block_size)
+
+
+def parallel_add_field(table, field, func, index=None, workers=1,
+                       block_size=PARALLEL_BLOCK_SIZE):
+    """
+    Add a field calculated from each row by ``func``, in a pool of worker processes.
+
+    `Args:`
+        table: petl table
+            The table to add the field to
+        field: str
+            The name of the new field
+        func: function
+            A picklable function that takes a row (a petl record, accessible by field name or
+            index) and returns the value of the new field
+        index: int
+            The position of the new field. If ``None``, the field is added at the end.
+        workers: int
+            The number of worker processes
+        block_size: int
+            The number of rows to send to a worker at a time
+    `Returns:`
+        ParallelMapView
+    """
+
+    fields = tuple(petl.header(table))
+    index = len(fields) if index is None else index
+    block_func = functools.partial(_add_field_block, func, fields, index)
+
+    def header_func(header):
+        header = list(header)
+        header.insert(index, field)
+        return header
+
+    return ParallelMapView(table, block_func, header_func, workers, block_size=block_size)
@@ -0,0 +1,164 @@
+import heapq
+import itertools
+
+import petl
+
+from parsons.utilities.value_width import value_width
+
+__all__ = [
+    'profile_table',
+]
+
+# Number of rows to read at a time while profiling
+PROFILE_BLOCK_SIZE = 10000
+
+# Distinct values are counted exactly up to this many per column. Past it, the count is
+# estimated from a sketch of the DISTINCT_SKETCH_SIZE smallest value hashes (a "k minimum
+# values" estimate), so memory stays bounded no matter how many distinct values there are.
+DISTINCT_EXACT_LIMIT = 100000
+DISTINCT_SKETCH_SIZE = 1024
+
+_HASH_MASK = 2 ** 64 - 1
+
+
+def _hash(value):
+    # A 64 bit hash that is spread evenly, even for small ints (whose hash is themselves)
+
+    try:
+        return hash((value,)) & _HASH_MASK
+    except TypeError:
+        return hash((repr(value),)) & _HASH_MASK
+
+
+class _DistinctCounter:
+    # Counts distinct values exactly until there are too many, then estimates the count
+
+    def __init__(self):
+
+        self.values = set()
+        self.sketch = None
+        self.members = None
+
+    def update(self, values):
+
+        if self.sketch is None:
+            try:
+                self.values.update(values)
+            except TypeError:
+                # Unhashable values (eg. dicts) are counted by their repr
+                self.values.update(v if v.__hash__ else repr(v) for v in values)
+
+            if len(self.values) > DISTINCT_EXACT_LIMIT:
+                self._start_sketch()
+            return
+
+        threshold = -self.sketch[0]
+        for h in [h for h in map(_hash, values) if h < threshold]:
+            if h not in self.members:
+                self.members.discard(-heapq.heapreplace(self.sketch, -h))
+                self.members.add(h)
+                threshold = -self.sketch[0]
+
+    def _start_sketch(self):
+
+        hashes = heapq.nsmallest(DISTINCT_SKETCH_SIZE, set(map(_hash, self.values)))
+        self.sketch = [-h for h in hashes]
+        heapq.heapify(self.sketch)
+        self.members = set(hashes)
+        self.values = None
+
+    @property
+    def count(self):
+
+        if self.sketch is None:
+            return len(self.values)
+
+        return int((DISTINCT_SKETCH_SIZE - 1) * (_HASH_MASK + 1) / -self.sketch[0])
+
+
+class _ColumnProfile:
+
+    def __init__(self, name, full=True):
+
+        self.name = name
+        self.full = full
+        self.types = set()
+        self.null_count = 0
+        self.max_width = 0
+        self.min = None
+        self.max = None
+        self.comparable = True
+        self.distinct = _DistinctCounter() if full else None
+
+    def update(self, values):
+
+        self.types.update(t.__name__ for t in set(map(type, values)))
+        self.max_width = max(self.max_width, max(map(value_width, values)))
+
+        non_null = [v for v in values if v is not None]
+        self.null_count += len(values) - len(non_null)
+
+        if not non_null or not self.full:
+            return
+
+        self.distinct.update(non_null)
+
+        if self.comparable:
+            try:
+                low, high = min(non_null), max(non_null)
+                if self.min is None or low < self.min:
+                    self.min = low
+                if self.max is None or high > self.max:
+                    self.max = high
+            except TypeError:
+                # Values of different types (eg. str and int) can't be ordered
+                self.comparable = False
+                self.min = self.max = None
+
+    def to_dict(self):
+
+        stats = {'name': self.name,
+                 'type': list(self.types),
+                 'null_count': self.null_count,
+                 'max_width': self.max_width}
+
+        if self.full:
+            stats.update(min=self.min, max=self.max, distinct_count=self.distinct.count)
+
+        return stats
+
+
+def profile_table(table, full=True):
+    """
+    Profile every column of a petl table in a single pass over its rows.
+
+    `Args:`
+        table: petl table
+            The table to profile
+        full: boolean
+            Whether to calculate the min, max and distinct count of each column. These
+            are the costly stats (distinct values are kept in memory), so they can be
+            skipped when only the types, widths and null counts are needed.
+    `Returns:`
+        tuple
+            The number of rows, and a list with a dict of stats for each column. See
+            :meth:`parsons.etl.etl.ETL.profile`.
+    """
+
+    columns = [_ColumnProfile(name, full) for name in petl.header(table)]
+    rows = iter(petl.data(table))
+    num_rows = 0
+
+    while True:
+        block = list(itertools.islice(rows, PROFILE_BLOCK_SIZE))
+        if not block:
+            break
+
+        num_rows += len(block)
+
+        # Short rows are padded with None, as petl does when reading them by column
+        values = itertools.islice(itertools.zip_longest(*block), len(columns))
+        for column, column_values in zip(columns, values):
+            column.update(column_values)
+
+    return num_rows, [column.to_dict() for column in columns]
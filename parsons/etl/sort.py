@@ -0,0 +1,181 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import itertools
+import operator
+
+import petl
+from petl.comparison import comparable_itemgetter
+
+from parsons.utilities.files import create_temp_file
+from parsons.utilities.spill import SpillView, SpillWriter
+
+__all__ = [
+    'ExternalSortView',
+]
+
+# The number of rows to sort in memory. Larger tables are sorted in runs of this many rows,
+# which are written to spill files and then merged.
+SORT_MEMORY_ROWS = 1000000
+
+
+def _sort_rows(rows, indexes, reverse):
+    # Sort a list of rows in place by the values at the given indexes. Comparing the values
+    # directly is much faster than wrapping every key in petl's Comparable, so that is tried
+    # first, falling back to petl's ordering (eg. None first) only for values python can't
+    # compare, such as None and int. When every value can be compared the two orders are the
+    # same, so runs sorted either way can still be merged with the Comparable key.
+
+    try:
+        rows.sort(key=operator.itemgetter(*indexes), reverse=reverse)
+    except TypeError:
+        rows.sort(key=comparable_itemgetter(*indexes), reverse=reverse)
+
+    return rows
+
+
+def _write_run(rows, columns, indexes, reverse, path):
+    # Sort a run and write it to a spill file. Runs in a worker process when sorting in
+    # parallel, so the sorted rows don't have to be sent back.
+
+    with SpillWriter(path, columns) as writer:
+        writer.write_rows(_sort_rows(rows, indexes, reverse))
+
+    return path
+
+
+def _read_run(path):
+
+    for block in SpillView(path).blocks():
+        yield from block
+
+
+class ExternalSortView(petl.Table):
+    """
+    A petl table that sorts another table within a fixed memory budget.
+
+    Tables of up to ``memory_rows`` rows are sorted in memory. Larger tables are read in runs
+    of ``memory_rows`` rows, each of which is sorted and written to a block-based spill file,
+    and the runs are then merged with a heap, reading one block of each run at a time. With
+    ``workers``, runs are sorted and written in a pool of worker processes, each holding one run
+    of ``memory_rows / workers`` rows.
+
+    Rows are ordered as ``petl.sort`` orders them (eg. ``None`` sorts first). The sorted rows
+    (or run files) are kept, so reading the table again doesn't sort it again.
+
+    `Args:`
+        source: petl table
+            The table to sort
+        key: str or list
+            The field or fields to sort by. If ``None``, sorts by every field from left to
+            right.
+        reverse: bool
+            Sort in descending order
+        memory_rows: int
+            The number of rows to hold in memory at once
+        temp_dir: str
+            The directory to write run files to. Defaults to the system temp directory.
+        workers: int
+            The number of worker processes to sort runs in. If ``None``, runs are sorted in
+            this process.
+    """
+
+    def __init__(self, source, key=None, reverse=False, memory_rows=SORT_MEMORY_ROWS,
+                 temp_dir=None, workers=None):
+
+        self.source = source
+        self.key = [key] if isinstance(key, str) else key
+        self.reverse = reverse
+        self.memory_rows = memory_rows
+        self.temp_dir = temp_dir
+        self.workers = workers
+
+        self._header = None
+        self._indexes = None
+        self._rows = None
+        self._runs = None
+
+    @property
+    def spilled(self):
+        return self._runs is not None
+
+    def _indexes_for(self, header):
+
+        if self.key is None:
+            return list(range(len(header)))
+
+        for field in self.key:
+            if field not in header:
+                raise petl.errors.FieldSelectionError(field)
+
+        return [header.index(field) for field in self.key]
+
+    def _sort(self):
+
+        rows = iter(self.source)
+        header = tuple(next(rows))
+        indexes = self._indexes_for(header)
+        rows = map(tuple, rows)
+
+        # Read one more row than the budget, to find out whether the table fits in memory
+        first = list(itertools.islice(rows, self.memory_rows + 1))
+
+        if len(first) <= self.memory_rows:
+            self._rows = _sort_rows(first, indexes, self.reverse)
+        else:
+            self._runs = self._write_runs(itertools.chain(first, rows), header, indexes)
+
+        self._header = header
+        self._indexes = indexes
+
+    def _write_runs(self, rows, header, indexes):
+
+        def new_path():
+            return create_temp_file(suffix='.spill', directory=self.temp_dir)
+
+        if not self.workers:
+            runs = []
+            while True:
+                run = list(itertools.islice(rows, self.memory_rows))
+                if not run:
+                    return runs
+                runs.append(_write_run(run, header, indexes, self.reverse, new_path()))
+
+        run_rows = max(1, self.memory_rows // self.workers)
+        runs = []
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+
+            while True:
+                run = list(itertools.islice(rows, run_rows))
+                if not run:
+                    break
+
+                pending.append(executor.submit(
+                    _write_run, run, header, indexes, self.reverse, new_path()))
+
+                # Keep one run per worker in flight, so memory stays within the budget
+                if len(pending) >= self.workers:
+                    runs.append(pending.popleft().result())
+
+            runs.extend(future.result() for future in pending)
+
+        return runs
+
+    def __iter__(self):
+
+        # Reading the header alone (eg. for a table's columns) doesn't need the rows sorted
+        if self._header is None:
+            yield tuple(petl.header(self.source))
+            self._sort()
+        else:
+            yield self._header
+
+        if self._runs is None:
+            yield from self._rows
+            return
+
+        yield from heapq.merge(*[_read_run(path) for path in self._runs],
+                               key=comparable_itemgetter(*self._indexes),
+                               reverse=self.reverse)
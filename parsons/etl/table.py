@@ -1,15 +1,46 @@
+from parsons.etl.columnar import ColumnarView
 from parsons.etl.etl import ETL
+from parsons.etl.parallel import ParallelMapView
 from parsons.etl.tofrom import ToFrom
 from parsons.utilities import files
+from parsons.utilities.paginator import PagedView
+from parsons.utilities.spill import SpillView, SpillWriter
 import petl
-import pickle
+from petl.io.json import DictsView
+from petl.transform.basics import (
+    AddFieldView, AddFieldsView, AddRowNumbersView, CutOutView, CutView, MoveFieldView,
+    StackView)
+from petl.transform.conversions import FieldConvertView
+from petl.transform.headers import ExtendHeaderView, RenameView, SetHeaderView
+from petl.transform.unpacks import UnpackDictView, UnpackView
+from petl.util.base import TableWrapper
 import logging
+import pickle
 
 
 logger = logging.getLogger(__name__)
 
 DIRECT_INDEX_WARNING_COUNT = 10
 
+# petl views that always have the same number of rows as the table they wrap, mapped to the
+# attribute holding that table. A row count known for the wrapped table is still valid for
+# these views, so it doesn't need to be counted again.
+ROW_PRESERVING_VIEWS = {
+    AddFieldView: 'source',
+    AddFieldsView: 'source',
+    CutView: 'source',
+    CutOutView: 'source',
+    ExtendHeaderView: 'source',
+    FieldConvertView: 'source',
+    ParallelMapView: 'source',
+    RenameView: 'source',
+    SetHeaderView: 'source',
+    UnpackView: 'source',
+    AddRowNumbersView: 'table',
+    MoveFieldView: 'table',
+    UnpackDictView: 'table',
+}
+
 
 class Table(ETL, ToFrom):
     """
@@ -58,6 +89,9 @@ class Table(ETL, ToFrom):
         # against inefficient usage.
         self._index_count = 0
 
+        # The last row count we calculated, and the petl table it was counted for
+        self._num_rows_cache = None
+
     def __repr__(self):
 
         return repr(petl.dicts(self.table))
@@ -106,7 +140,47 @@ class Table(ETL, ToFrom):
             int
                 Number of rows in the table
         """
-        return petl.nrows(self.table)
+
+        num_rows = self._known_num_rows()
+
+        if num_rows is None:
+            num_rows = petl.nrows(self.table)
+            self._num_rows_cache = (self.table, num_rows)
+
+        return num_rows
+
+    def _known_num_rows(self):
+        # Return the row count if it can be found without reading through the table, or
+        # None if it can't. Walks down through views that don't change the number of rows
+        # until it reaches a table whose row count is already known.
+
+        table = self.table
+        cached = getattr(self, '_num_rows_cache', None)
+
+        while True:
+            if cached and cached[0] is table:
+                return cached[1]
+
+            # Spill files store their row count, and paged and columnar tables count their rows
+            # as they load them
+            if isinstance(table, (SpillView, PagedView, ColumnarView)):
+                return table.num_rows
+
+            # Tables built from lists (including materialized tables)
+            if isinstance(table, TableWrapper) and isinstance(table.inner, (list, tuple)):
+                return max(len(table.inner) - 1, 0)
+            if isinstance(table, DictsView) and isinstance(table.dicts, (list, tuple)):
+                return len(table.dicts)
+
+            # Stacking a single table just pads its rows to the same length
+            if isinstance(table, StackView) and len(table.sources) == 1:
+                table = table.sources[0]
+                continue
+
+            source = ROW_PRESERVING_VIEWS.get(type(table))
+            if source is None:
+                return None
+            table = getattr(table, source)
 
     @property
     def data(self):
@@ -176,21 +250,35 @@ class Table(ETL, ToFrom):
         """
 
         if column_name in self.columns:
+            if isinstance(self.table, ColumnarView):
+                return self.table.column_values(column_name)
+
             return list(self.table[column_name])
 
         else:
             raise ValueError('Column name not found.')
 
-    def materialize(self):
+    def materialize(self, columnar=False):
         """
         "Materializes" a Table, meaning all data is loaded into memory and all pending
         transformations are applied.
 
         Use this if petl's lazy-loading behavior is causing you problems, eg. if you want to read
         data from a file immediately.
+
+        `Args:`
+            columnar: bool
+                Store the data column by column, with numbers in typed arrays and repeated
+                strings dictionary encoded, rather than as a tuple per row. This takes far
+                less memory for large tables, and makes reading a single column (eg.
+                ``column_data``, ``get_column_max_width`` and ``to_dataframe``) faster. See
+                :class:`parsons.etl.columnar.ColumnarView`.
         """
 
-        self.table = petl.wrap(petl.tupleoftuples(self.table))
+        if columnar:
+            self.table = ColumnarView(self.table)
+        else:
+            self.table = petl.wrap(petl.tupleoftuples(self.table))
 
     def materialize_to_file(self, file_path=None):
         """
@@ -204,24 +292,36 @@ class Table(ETL, ToFrom):
         `Args:`
             file_path: str
                 The path to the file to materialize the table to; if not specified, a temp file
-                will be created.
+                will be created. A file at the given path is written as a sequence of pickled
+                rows (header first), which can be read with ``petl.frompickle``. Temp files
+                use a faster block format, which stores the row count, and should only be
+                read through the table.
         `Returns:`
             str
                 Path to the temp file that now contains the table
         """
 
-        # Load the data in batches, and "pickle" the rows to a temp file.
-        # (We pickle rather than writing to, say, a CSV, so that we maintain
-        # all the type information for each field.)
+        # We pickle rather than writing to, say, a CSV, so that we maintain all the type
+        # information for each field.
+
+        if file_path:
+            # Keep the format a file the caller asked for has always had
+            with open(file_path, 'wb') as handle:
+                for row in self.table:
+                    pickle.dump(list(row), handle)
+
+            self.table = petl.frompickle(file_path)
 
-        file_path = file_path or files.create_temp_file()
+            return file_path
 
-        with open(file_path, 'wb') as handle:
-            for row in self.table:
-                pickle.dump(list(row), handle)
+        # Otherwise write the rows in blocks to a spill file
+        file_path = files.create_temp_file()
+
+        with SpillWriter(file_path, self.columns) as writer:
+            writer.write_rows(self.data)
 
         # Load a Table from the file
-        self.table = petl.frompickle(file_path)
+        self.table = SpillView(file_path)
 
         return file_path
 
@@ -234,6 +334,11 @@ class Table(ETL, ToFrom):
             bool
         """
 
+        # Paged tables are built from API responses when they are first read, so don't force
+        # them to load here
+        if isinstance(self.table, PagedView):
+            return True
+
         if not self.table:
             return False
 
@@ -256,7 +361,5 @@ class Table(ETL, ToFrom):
             bool
         """
 
-        if petl.nrows(petl.selectnotnone(self.table, column)) == 0:
-            return True
-        else:
-            return False
+        num_rows, _ = self._profile(full=False)
+        return self._column_profile(column)['null_count'] == num_rows
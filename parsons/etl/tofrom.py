@@ -2,7 +2,9 @@ import petl
 import json
 import io
 import gzip
-from parsons.utilities import files, zip_archive
+from parsons.etl.columnar import ColumnarView
+from parsons.utilities import files, multipart, zip_archive
+from parsons.utilities.paginator import PagedView, PAGED_SPILL_THRESHOLD
 
 
 class ToFrom(object):
@@ -29,6 +31,16 @@ class ToFrom(object):
                 Pandas DataFrame object
         """
 
+        # Columnar tables can hand pandas each column whole, rather than a row at a time
+        if (isinstance(self.table, ColumnarView) and index is None and exclude is None
+                and columns is None and not coerce_float
+                and len(set(self.table.header)) == len(self.table.header)):
+            import pandas
+
+            return pandas.DataFrame(
+                {name: self.table.column_values(name) for name in self.table.header},
+                columns=list(self.table.header))
+
         return petl.todataframe(self.table, index=index, exclude=exclude,
                                 columns=columns, coerce_float=coerce_float)
 
@@ -373,21 +385,31 @@ class ToFrom(object):
 
         compression = compression or files.compression_type_for_path(key)
 
-        csv_name = files.extract_file_name(key, include_suffix=False) + '.csv'
-
-        # Save the CSV as a temp file
-        local_path = self.to_csv(temp_file_compression=compression,
-                                 encoding=encoding,
-                                 errors=errors,
-                                 write_header=write_header,
-                                 csv_name=csv_name,
-                                 **csvargs)
-
-        # Put the file on S3
         from parsons.aws import S3
         self.s3 = S3(aws_access_key_id=aws_access_key_id,
                      aws_secret_access_key=aws_secret_access_key)
-        self.s3.put_file(bucket, key, local_path, acl=acl)
+
+        if compression == 'zip':
+            csv_name = files.extract_file_name(key, include_suffix=False) + '.csv'
+
+            # Save the zip archive as a temp file, then put it on S3
+            local_path = self.to_csv(temp_file_compression=compression,
+                                     encoding=encoding,
+                                     errors=errors,
+                                     write_header=write_header,
+                                     csv_name=csv_name,
+                                     **csvargs)
+            self.s3.put_file(bucket, key, local_path, acl=acl)
+
+        else:
+            # Stream the CSV straight into a multipart upload, without a local file
+            parts = multipart.csv_parts(self.table,
+                                        compression=compression,
+                                        encoding=encoding,
+                                        errors=errors,
+                                        write_header=write_header,
+                                        **csvargs)
+            self.s3.put_stream(bucket, key, parts, acl=acl)
 
         if public_url:
             return self.s3.get_url(bucket, key, expires_in=public_url_expires)
@@ -434,19 +456,30 @@ class ToFrom(object):
 
         compression = compression or files.compression_type_for_path(blob_name)
 
-        csv_name = files.extract_file_name(blob_name, include_suffix=False) + '.csv'
-
-        # Save the CSV as a temp file
-        local_path = self.to_csv(temp_file_compression=compression,
-                                 encoding=encoding,
-                                 errors=errors,
-                                 write_header=write_header,
-                                 csv_name=csv_name,
-                                 **csvargs)
-
         from parsons.google.google_cloud_storage import GoogleCloudStorage
         gcs = GoogleCloudStorage(app_creds=app_creds, project=project)
-        gcs.put_blob(bucket_name, blob_name, local_path)
+
+        if compression == 'zip':
+            csv_name = files.extract_file_name(blob_name, include_suffix=False) + '.csv'
+
+            # Save the zip archive as a temp file, then put it on GCS
+            local_path = self.to_csv(temp_file_compression=compression,
+                                     encoding=encoding,
+                                     errors=errors,
+                                     write_header=write_header,
+                                     csv_name=csv_name,
+                                     **csvargs)
+            gcs.put_blob(bucket_name, blob_name, local_path)
+
+        else:
+            # Stream the CSV straight into a resumable upload, without a local file
+            parts = multipart.csv_parts(self.table,
+                                        compression=compression,
+                                        encoding=encoding,
+                                        errors=errors,
+                                        write_header=write_header,
+                                        **csvargs)
+            gcs.put_blob_stream(bucket_name, blob_name, parts)
 
         if public_url:
             return gcs.get_url(bucket_name, blob_name, expires_in=public_url_expires)
@@ -625,6 +658,30 @@ class ToFrom(object):
 
         return cls(petl.fromcolumns(cols, header=header))
 
+    @classmethod
+    def from_pages(cls, pages, spill_threshold=PAGED_SPILL_THRESHOLD):
+        """
+        Create a ``parsons table`` from an iterable of pages of dicts, such as the generator
+        returned by :func:`parsons.utilities.paginator.paginate`.
+
+        The table is lazy: no pages are consumed until the table is first used. The rows are
+        then held in memory until there are more than ``spill_threshold`` of them, after which
+        they are written to a temp file on disk, so very large API exports don't need to fit
+        in memory.
+
+        `Args:`
+            pages: iterable
+                An iterable of lists of dicts
+            spill_threshold: int
+                The number of rows to hold in memory before spilling to disk. If ``None``,
+                all rows are kept in memory.
+        `Returns:`
+            Parsons Table
+                See :ref:`parsons-table` for output options.
+        """
+
+        return cls(PagedView(pages, spill_threshold=spill_threshold))
+
     @classmethod
     def from_json(cls, local_path, header=None, line_delimited=False):
         """
@@ -713,7 +770,7 @@ class ToFrom(object):
 
     @classmethod
     def from_s3_csv(cls, bucket, key, from_manifest=False, aws_access_key_id=None,
-                    aws_secret_access_key=None, **csvargs):
+                    aws_secret_access_key=None, stream=False, workers=None, **csvargs):
         """
         Create a ``parsons table`` from a key in an S3 bucket.
 
@@ -729,6 +786,14 @@ class ToFrom(object):
                 Required if not included as environmental variable.
             aws_secret_access_key: str
                 Required if not included as environmental variable.
+            stream: bool
+                If True, reads the files straight from S3 as the table is read, without
+                downloading them to disk, using concurrent ranged requests. Every file must have
+                a header row with the same columns, and zip archives aren't supported. If False,
+                the files are downloaded to temp files, several at once.
+            workers: int
+                The number of files (or, when streaming, byte ranges) to download at once.
+                Defaults to 8.
             \**csvargs: kwargs
                 ``csv_reader`` optional arguments
         `Returns:`
@@ -736,7 +801,10 @@ class ToFrom(object):
         """  # noqa: W605
 
         from parsons.aws import S3
+        from parsons.aws.s3 import S3_WORKERS
         s3 = S3(aws_access_key_id, aws_secret_access_key)
+        workers = workers or S3_WORKERS
+        sizes = None
 
         if from_manifest:
             with open(s3.get_file(bucket, key)) as fd:
@@ -744,14 +812,22 @@ class ToFrom(object):
 
             s3_keys = [x["url"] for x in manifest["entries"]]
 
+            # Verbose manifests (such as those written by Redshift UNLOAD) include file sizes
+            if all('content_length' in x.get('meta', {}) for x in manifest["entries"]):
+                sizes = [x['meta']['content_length'] for x in manifest["entries"]]
+
         else:
             s3_keys = [f"s3://{bucket}/{key}"]
 
+        # TODO handle urls that end with '/', i.e. urls that point to "folders"
+        objects = [tuple(key.split("/", 3)[2:]) for key in s3_keys]
+
+        if stream:
+            from parsons.aws.s3_stream import S3CSVView
+            return cls(S3CSVView(s3, objects, sizes=sizes, prefetch=workers, **csvargs))
+
         tbls = []
-        for key in s3_keys:
-            # TODO handle urls that end with '/', i.e. urls that point to "folders"
-            _, _, bucket_, key_ = key.split("/", 3)
-            file_ = s3.get_file(bucket_, key_)
+        for (_, key_), file_ in zip(objects, s3.get_files(objects, workers=workers)):
             if files.compression_type_for_path(key_) == 'zip':
                 file_ = zip_archive.unzip_archive(file_)
 
@@ -99,7 +99,7 @@ class CensusGeocoder(object):
         """
 
         logger.info(f'Geocoding {table.num_rows} records.')
-        chunked_tables = table.chunk(BATCH_SIZE)
+        chunked_tables = table.iter_chunks(BATCH_SIZE)
         batch_count = 1
         records_processed = 0
 
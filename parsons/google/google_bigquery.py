@@ -1,17 +1,16 @@
-import pickle
 import uuid
 
 from google.cloud import bigquery
 from google.cloud.bigquery import dbapi
 from google.cloud import exceptions
-import petl
 
 from parsons.databases.table import BaseTable
 from parsons.etl import Table
 from parsons.google.utitities import setup_google_application_credentials
 from parsons.google.google_cloud_storage import GoogleCloudStorage
-from parsons.utilities import check_env
+from parsons.utilities import avro, check_env
 from parsons.utilities.files import create_temp_file
+from parsons.utilities.spill import SpillView, SpillWriter
 
 BIGQUERY_TYPE_MAP = {
     'str': 'STRING',
@@ -101,7 +100,8 @@ class GoogleBigQuery:
         self.dialect = 'bigquery'
 
     def copy(self, table_obj, table_name, if_exists='fail',
-             tmp_gcs_bucket=None, gcs_client=None, job_config=None, **load_kwargs):
+             tmp_gcs_bucket=None, gcs_client=None, job_config=None, source_format='csv',
+             **load_kwargs):
         """
         Copy a :ref:`parsons-table` into Google BigQuery via Google Cloud Storage.
 
@@ -121,6 +121,12 @@ class GoogleBigQuery:
             job_config: object
                 A LoadJobConfig object to provide to the underlying call to load_table_from_uri
                 on the BigQuery client. The function will create its own if not provided.
+            source_format: str
+                The format to stage the data in, either ``csv`` or ``avro``. Avro files are
+                typed and compressed, so they are smaller and faster for BigQuery to load, and
+                their schema is inferred while they are written, in a single pass over the
+                table. CSV is used instead if the ``job_config`` has a schema, or the column
+                names aren't valid Avro field names.
             **load_kwargs: kwargs
                 Arguments to pass to the underlying load_table_from_uri call on the BigQuery
                 client.
@@ -131,18 +137,30 @@ class GoogleBigQuery:
             raise ValueError(f'Unexpected value for if_exists: {if_exists}, must be one of '
                              '"append", "drop", "truncate", or "fail"')
 
+        if source_format not in ['csv', 'avro']:
+            raise ValueError(f'Unexpected value for source_format: {source_format}, must be one '
+                             'of "csv" or "avro"')
+
         table_exists = self.table_exists(table_name)
 
         if not job_config:
             job_config = bigquery.LoadJobConfig()
 
-        if not job_config.schema:
-            job_config.schema = self._generate_schema(table_obj)
+        # Avro files describe their own schema
+        use_avro = (source_format == 'avro' and not job_config.schema
+                    and avro.valid_field_names(table_obj.columns))
+
+        if use_avro:
+            job_config.source_format = bigquery.SourceFormat.AVRO
+            job_config.use_avro_logical_types = True
+        else:
+            if not job_config.schema:
+                job_config.schema = self._generate_schema(table_obj)
+            job_config.skip_leading_rows = 1
+            job_config.source_format = bigquery.SourceFormat.CSV
 
         if not job_config.create_disposition:
             job_config.create_disposition = bigquery.CreateDisposition.CREATE_IF_NEEDED
-        job_config.skip_leading_rows = 1
-        job_config.source_format = bigquery.SourceFormat.CSV
         job_config.write_disposition = bigquery.WriteDisposition.WRITE_EMPTY
 
         if table_exists:
@@ -156,10 +174,18 @@ class GoogleBigQuery:
                 job_config.write_disposition = bigquery.WriteDisposition.WRITE_TRUNCATE
 
         gcs_client = gcs_client or GoogleCloudStorage()
-        temp_blob_name = f'{uuid.uuid4()}.csv'
-        temp_blob_uri = gcs_client.upload_table(table_obj, tmp_gcs_bucket, temp_blob_name)
 
-        # load CSV from Cloud Storage into BigQuery
+        if use_avro:
+            temp_blob_name = f'{uuid.uuid4()}.avro'
+            gcs_client.put_blob_stream(tmp_gcs_bucket, temp_blob_name,
+                                       avro.avro_parts(table_obj.table),
+                                       content_type='avro/binary')
+            temp_blob_uri = f'gs://{tmp_gcs_bucket}/{temp_blob_name}'
+        else:
+            temp_blob_name = f'{uuid.uuid4()}.csv'
+            temp_blob_uri = gcs_client.upload_table(table_obj, tmp_gcs_bucket, temp_blob_name)
+
+        # load the staged file from Cloud Storage into BigQuery
         table_ref = get_table_ref(self.client, table_name)
         try:
             load_job = self.client.load_table_from_uri(
@@ -220,37 +246,23 @@ class GoogleBigQuery:
         # Run the query
         cursor.execute(sql, parameters)
 
+        # If we don't get any results we need to return None. We only know the header once
+        # we've seen the first row, so we fetch the first batch before creating the writer.
+        batch = cursor.fetchmany(QUERY_BATCH_SIZE)
+        if len(batch) == 0:
+            return None
+
         # We will use a temp file to cache the results so that they are not all living
-        # in memory. We'll use pickle to serialize the results to file in order to maintain
+        # in memory. We'll write the results to a spill file in order to maintain
         # the proper data types (e.g. integer).
         temp_filename = create_temp_file()
 
-        wrote_header = False
-        with open(temp_filename, 'wb') as temp_file:
-            # Track whether we got data, since if we don't get any results we need to return None
-            got_results = False
-            while True:
+        with SpillWriter(temp_filename, list(batch[0].keys())) as writer:
+            while len(batch) > 0:
+                writer.write_rows(list(row.values()) for row in batch)
                 batch = cursor.fetchmany(QUERY_BATCH_SIZE)
-                if len(batch) == 0:
-                    break
-
-                got_results = True
-
-                for row in batch:
-                    # Make sure we write out the header once and only once
-                    if not wrote_header:
-                        wrote_header = True
-                        header = list(row.keys())
-                        pickle.dump(header, temp_file)
-
-                    row_data = list(row.values())
-                    pickle.dump(row_data, temp_file)
-
-        if not got_results:
-            return None
 
-        ptable = petl.frompickle(temp_filename)
-        final_table = Table(ptable)
+        final_table = Table(SpillView(temp_filename))
 
         return final_table
 
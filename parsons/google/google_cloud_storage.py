@@ -1,7 +1,7 @@
 import google
 from google.cloud import storage
 from parsons.google.utitities import setup_google_application_credentials
-from parsons.utilities import files
+from parsons.utilities import files, multipart
 import datetime
 import logging
 
@@ -212,6 +212,57 @@ class GoogleCloudStorage(object):
 
         logger.info(f'{blob_name} put in {bucket_name} bucket.')
 
+    def put_blob_stream(self, bucket_name, blob_name, parts, content_type=None,
+                        predefined_acl=None):
+        """
+        Puts a blob (aka file) in a bucket from parts of its contents, without writing it to a
+        local file. The parts are sent as a resumable upload, which must be sent in order, so
+        the next parts are produced in the background while each one uploads.
+
+        `Args:`
+            bucket_name: str
+                The name of the bucket to store the blob
+            blob_name: str
+                The name of blob to be stored in the bucket
+            parts: iterable
+                The contents of the blob, as bytes
+            content_type: str
+                The content type of the blob
+            predefined_acl: str
+                The ACL to apply to the blob
+        `Returns:`
+            ``None``
+        """
+
+        bucket = storage.Bucket(self.client, name=bucket_name)
+        blob = storage.Blob(blob_name, bucket)
+
+        upload_kwargs = {}
+        if content_type:
+            upload_kwargs['content_type'] = content_type
+        if predefined_acl:
+            upload_kwargs['predefined_acl'] = predefined_acl
+
+        writer = blob.open('wb', chunk_size=multipart.MULTIPART_PART_SIZE, ignore_flush=True,
+                           **upload_kwargs)
+        try:
+            with writer:
+                for part in multipart.prefetch(parts):
+                    writer.write(part)
+
+        except Exception:
+            # google-cloud-storage releases before 3.0 can't cancel an upload, so leaving the
+            # writer after an error finishes it with whatever was written. Remove the
+            # truncated blob. (Later releases cancel it, leaving any existing blob as it was.)
+            if not hasattr(writer, 'terminate'):
+                try:
+                    blob.delete()
+                except google.cloud.exceptions.NotFound:
+                    pass
+            raise
+
+        logger.info(f'{blob_name} put in {bucket_name} bucket.')
+
     def download_blob(self, bucket_name, blob_name, local_path=None):
         """
         Gets a blob from a bucket
@@ -274,13 +325,17 @@ class GoogleCloudStorage(object):
             data_type: str
                 The file format to use when writing the data. One of: `csv` or `json`
         """
+        if data_type == 'csv':
+            # Stream the CSV straight into the upload, rather than writing a local file first
+            parts = multipart.csv_parts(table.table)
+            self.put_blob_stream(bucket_name, blob_name, parts, content_type='text/csv',
+                                 predefined_acl=default_acl)
+            return f'gs://{bucket_name}/{blob_name}'
+
         bucket = storage.Bucket(self.client, name=bucket_name)
         blob = storage.Blob(blob_name, bucket)
 
-        if data_type == 'csv':
-            local_file = table.to_csv()
-            content_type = 'text/csv'
-        elif data_type == 'json':
+        if data_type == 'json':
             local_file = table.to_json()
             content_type = 'application/json'
         else:
@@ -2,7 +2,9 @@ from parsons.etl import Table
 from requests import request
 from parsons.utilities import check_env, json_format
 import datetime
+import threading
 from parsons.hustle.column_map import LEAD_COLUMN_MAP
+from parsons.utilities.api_connector import APIConnector
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,16 +24,22 @@ class Hustle(object):
         client_secret:
             The client secret provided by Hustle. Not required if ``HUSTLE_CLIENT_SECRET`` env
             variable set.
+        rate_limit: float
+            The maximum number of requests per second to make to Hustle. If ``None``, requests
+            are not rate limited.
     `Returns:`
         Hustle Class
     """
 
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, rate_limit=None):
 
         self.uri = HUSTLE_URI
+        self.client = APIConnector(self.uri, rate_limit=rate_limit)
         self.client_id = check_env.check('HUSTLE_CLIENT_ID', client_id)
         self.client_secret = check_env.check('HUSTLE_CLIENT_SECRET', client_secret)
         self.token_expiration = None
+        # Leads are created on multiple threads, so only one of them refreshes the token
+        self._token_lock = threading.Lock()
         self._get_auth_token(client_id, client_secret)
 
     def _get_auth_token(self, client_id, client_secret):
@@ -45,6 +53,7 @@ class Hustle(object):
         logger.debug(r.json())
 
         self.auth_token = r.json()['access_token']
+        self.client.headers = {'Authorization': f'Bearer {self.auth_token}'}
         self.token_expiration = datetime.datetime.now() + datetime.timedelta(seconds=7200)
         logger.info("Authentication token generated")
 
@@ -55,20 +64,16 @@ class Hustle(object):
         logger.debug("Checking token expiration.")
         if datetime.datetime.now() >= self.token_expiration:
 
-            logger.info("Refreshing authentication token.")
-            self._get_auth_token(self.client_id, self.client_secret)
-
-        else:
-
-            pass
+            with self._token_lock:
+                # Another thread may have refreshed it while this one waited for the lock
+                if datetime.datetime.now() >= self.token_expiration:
+                    logger.info("Refreshing authentication token.")
+                    self._get_auth_token(self.client_id, self.client_secret)
 
     def _request(self, endpoint, req_type='GET', args=None, payload=None, raise_on_error=True):
 
-        url = self.uri + endpoint
         self._token_check()
 
-        headers = {'Authorization': f'Bearer {self.auth_token}'}
-
         parameters = {}
         if req_type == 'GET':
             parameters = {'limit': PAGE_LIMIT}
@@ -76,7 +81,7 @@ class Hustle(object):
         if args:
             parameters.update(args)
 
-        r = request(req_type, url, params=parameters, json=payload, headers=headers)
+        r = self.client.request(endpoint, req_type, params=parameters, json=payload)
 
         self._error_check(r, raise_on_error)
 
@@ -92,7 +97,7 @@ class Hustle(object):
         while r.json()['pagination']['hasNextPage'] == 'true':
 
             parameters['cursor'] = r.json['pagination']['cursor']
-            r = request(req_type, url, params=parameters, headers=headers)
+            r = self.client.request(endpoint, req_type, params=parameters)
             self._error_check(r, raise_on_error)
             result.append(r.json()['items'])
 
@@ -359,7 +364,7 @@ class Hustle(object):
         logger.info(f'Generating lead for {first_name} {last_name}.')
         return self._request(f'groups/{group_id}/leads', req_type="POST", payload=lead)
 
-    def create_leads(self, table, group_id=None):
+    def create_leads(self, table, group_id=None, max_workers=5, raise_on_error=True):
         """
         Create multiple leads. All unrecognized fields will be passed as custom fields. Column
         names must map to the following names.
@@ -382,12 +387,21 @@ class Hustle(object):
             * - follow_up
               - ``follow_up``, ``followup``
 
+        Leads are created concurrently, and requests that are rate limited or fail with a
+        server error are retried. Pass ``rate_limit`` when creating the Hustle connector to cap
+        the number of requests per second.
+
         `Args:`
             table: Parsons table
                 A Parsons table containing leads
             group_id:
                 The group id to assign the leads. If ``None``, must be passed as a column
                 value.
+            max_workers: int
+                The maximum number of leads to create at once
+            raise_on_error: boolean
+                If ``True``, raise an error after all of the rows have been tried if any leads
+                could not be created. If ``False``, failures are logged and skipped.
         `Returns:`
             A table of created ids with associated lead id.
         """
@@ -397,7 +411,7 @@ class Hustle(object):
         arg_list = ['first_name', 'last_name', 'email', 'phone_number', 'follow_up',
                     'tag_ids', 'group_id']
 
-        created_leads = []
+        leads = []
 
         for row in table:
 
@@ -420,9 +434,25 @@ class Hustle(object):
             if group_id:
                 lead['group_id'] = group_id
 
-            created_leads.append(self.create_lead(**lead))
+            leads.append(lead)
+
+        # Refresh the token, if needed, before the leads are shared between threads
+        self._token_check()
+
+        results = self.client.concurrent_requests(lambda lead: self.create_lead(**lead), leads,
+                                                  max_workers=max_workers)
+
+        created_leads = [row['result'] for row in results if row['status'] == 'success']
+        failures = [row for row in results if row['status'] == 'error']
+
+        for row in failures:
+            logger.info(f"Unable to create lead for row {row['index']}: {row['error']}")
+
+        if failures and raise_on_error:
+            raise ValueError(f"Unable to create {len(failures)} of {len(leads)} leads. "
+                             f"First error: {failures[0]['error']}")
 
-        logger.info(f"Created {table.num_rows} leads.")
+        logger.info(f"Created {len(created_leads)} leads.")
         return Table(created_leads)
 
     def update_lead(self, lead_id, first_name=None, last_name=None, email=None,
@@ -1,6 +1,7 @@
 from requests import request as _request
 from parsons.etl.table import Table
 from parsons.utilities.datetime import date_to_timestamp
+from parsons.utilities.paginator import paginate
 import petl
 import re
 import os
@@ -52,17 +53,16 @@ class MobilizeAmerica(object):
         return r
 
     def _request_paginate(self, url, req_type='GET', args=None, auth=False):
+        # Returns a generator of pages. The args are only passed with the first request, as
+        # the next page urls already include them.
 
-        r = self._request(url, req_type=req_type, args=args, auth=auth)
-
-        json = r.json()['data']
-
-        while r.json()['next']:
-
-            r = self._request(r.json()['next'], req_type=req_type, auth=auth)
-            json.extend(r.json()['data'])
-
-        return json
+        return paginate(
+            get_page=lambda page_url: self._request(
+                page_url, req_type=req_type, args=args if page_url == url else None, auth=auth
+            ).json(),
+            get_items=lambda response: response['data'],
+            get_next=lambda response, page_url: response['next'],
+            start=url)
 
     def _time_parse(self, time_arg):
         # Parse the date filters
@@ -98,10 +98,9 @@ class MobilizeAmerica(object):
                 See :ref:`parsons-table` for output options.
         """
 
-        return Table(self._request_paginate(self.uri + 'organizations',
-                                            args={
-                                                'updated_since': date_to_timestamp(updated_since)
-                                            }))
+        return Table.from_pages(self._request_paginate(
+            self.uri + 'organizations',
+            args={'updated_since': date_to_timestamp(updated_since)}))
 
     def get_events(self, organization_id=None, updated_since=None, timeslot_start=None,
                    timeslot_end=None, timeslots_table=False, max_timeslots=None):
@@ -148,7 +147,7 @@ class MobilizeAmerica(object):
                 'timeslot_start': self._time_parse(timeslot_start),
                 'timeslot_end': self._time_parse(timeslot_end)}
 
-        tbl = Table(self._request_paginate(self.uri + 'events', args=args))
+        tbl = Table.from_pages(self._request_paginate(self.uri + 'events', args=args))
 
         if tbl.num_rows > 0:
 
@@ -242,7 +241,7 @@ class MobilizeAmerica(object):
                 'timeslot_end': self._time_parse(timeslot_end),
                 }
 
-        tbl = Table(self._request_paginate(self.uri + 'events', args=args, auth=True))
+        tbl = Table.from_pages(self._request_paginate(self.uri + 'events', args=args, auth=True))
 
         if tbl.num_rows > 0:
 
@@ -285,7 +284,7 @@ class MobilizeAmerica(object):
         args = {'organization_id': organization_id,
                 'updated_since': date_to_timestamp(updated_since)}
 
-        return Table(self._request_paginate(self.uri + 'events/deleted', args=args))
+        return Table.from_pages(self._request_paginate(self.uri + 'events/deleted', args=args))
 
     def get_people(self, organization_id=None, updated_since=None):
         """
@@ -306,7 +305,7 @@ class MobilizeAmerica(object):
 
         url = self.uri + 'organizations/' + str(organization_id) + '/people'
         args = {'updated_since': date_to_timestamp(updated_since)}
-        return Table(self._request_paginate(url, args=args, auth=True))
+        return Table.from_pages(self._request_paginate(url, args=args, auth=True))
 
     def get_attendances(self, organization_id=None, updated_since=None):
         """
@@ -328,4 +327,4 @@ class MobilizeAmerica(object):
 
         url = self.uri + 'organizations/' + str(organization_id) + '/attendances'
         args = {'updated_since': date_to_timestamp(updated_since)}
-        return Table(self._request_paginate(url, args=args, auth=True))
+        return Table.from_pages(self._request_paginate(url, args=args, auth=True))
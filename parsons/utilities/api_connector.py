@@ -1,11 +1,36 @@
-from requests import request as _request
-from requests.exceptions import HTTPError
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import logging
+import threading
+import time
 import urllib.parse
 from simplejson.errors import JSONDecodeError
+from parsons.etl import Table
+from parsons.utilities.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Status codes that indicate a request may succeed if it is tried again later
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# The number of connections to keep open to each host
+POOL_SIZE = 10
+
+# The backoff factor between retries of requests that fail to connect or return one of the
+# RETRY_STATUS_CODES, for connectors that opt in with ``max_retries``. Only read requests are
+# retried, so writes are never repeated.
+SESSION_BACKOFF_FACTOR = 0.5
+SESSION_RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Defaults for running requests concurrently with ``APIConnector.concurrent_requests``
+CONCURRENT_MAX_WORKERS = 5
+CONCURRENT_MAX_RETRIES = 3
+CONCURRENT_BACKOFF_FACTOR = 1
+
 
 class APIConnector(object):
     """
@@ -28,11 +53,29 @@ class APIConnector(object):
         data_key: str
             The name of the key in the response json where the data is contained. Required
             if the data is nested in the response json
+        rate_limit: float
+            The maximum number of requests per second to make with this connector, shared
+            by every thread using it. If ``None``, requests are not rate limited.
+        burst: int
+            The number of requests that can be made at once before the rate limit kicks in.
+            Defaults to ``rate_limit``.
+        pool_size: int
+            The maximum number of connections to keep alive to each host. Requests made with
+            the connector reuse these connections rather than opening a new one each time.
+        max_retries: int
+            The number of times to retry read requests (``GET``, ``HEAD`` and ``OPTIONS``)
+            that fail to connect, or that return a ``429`` or ``5xx`` status code. If ``None``,
+            requests are not retried.
+        max_concurrent_requests: int
+            The maximum number of requests that can be in flight to the API at once, across
+            every thread using the connector. If ``None``, there is no limit.
     `Returns`:
         APIConnector class
     """
 
-    def __init__(self, uri, headers=None, auth=None, pagination_key=None, data_key=None):
+    def __init__(self, uri, headers=None, auth=None, pagination_key=None, data_key=None,
+                 rate_limit=None, burst=None, pool_size=POOL_SIZE,
+                 max_retries=None, max_concurrent_requests=None):
 
         # Add a trailing slash if its missing
         if not uri.endswith('/'):
@@ -43,10 +86,55 @@ class APIConnector(object):
         self.auth = auth
         self.pagination_key = pagination_key
         self.data_key = data_key
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        if max_concurrent_requests:
+            self.request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        else:
+            self.request_slots = contextlib.nullcontext()
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.session = self.mount_adapter(Session())
+
+    def mount_adapter(self, session):
+        """
+        Mount a connection pooling adapter, with the connector's pool size and retry policy,
+        on a requests session.
+
+        `Args:`
+            session: requests.Session
+                The session to configure
+        `Returns:`
+            requests.Session
+                The session
+        """
+
+        if self.max_retries:
+            retry = Retry(total=self.max_retries, backoff_factor=SESSION_BACKOFF_FACTOR,
+                          status_forcelist=RETRY_STATUS_CODES,
+                          allowed_methods=SESSION_RETRY_METHODS, raise_on_status=False)
+        else:
+            # requests' default, which doesn't retry
+            retry = 0
+
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                              max_retries=retry)
+
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    def close(self):
+        """
+        Close the connector's pooled connections.
+        """
+
+        self.session.close()
 
     def request(self, url, req_type, json=None, data=None, params=None):
         """
-        Base request using requests libary.
+        Base request using requests libary. Requests are made with the connector's pooled
+        session, so connections are kept alive and reused between calls.
 
         `Args:`
             url: str
@@ -71,9 +159,76 @@ class APIConnector(object):
             requests response
         """
         full_url = urllib.parse.urljoin(self.uri, url)
+        self.throttle()
+
+        with self.request_slots:
+            return self.session.request(req_type, full_url, headers=self.headers,
+                                        auth=self.auth, json=json, data=data, params=params)
+
+    def throttle(self):
+        """
+        Wait until the connector's rate limit allows another request. Called before every
+        request; does nothing if the connector has no ``rate_limit``.
+        """
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+    def concurrent_requests(self, func, items, max_workers=CONCURRENT_MAX_WORKERS,
+                            max_retries=CONCURRENT_MAX_RETRIES,
+                            backoff_factor=CONCURRENT_BACKOFF_FACTOR):
+        """
+        Call ``func`` once for every item, using a pool of threads to make the calls
+        concurrently. This is meant for endpoints that only accept one record at a time,
+        where looping over a table and waiting on each response in turn is slow.
+
+        Requests made through the connector respect its ``rate_limit``, no matter how many
+        workers are used. Calls that fail with a ``429`` or ``5xx`` response, or a connection
+        error, are retried with exponential backoff (honoring any ``Retry-After`` header).
+        Any other error is recorded for that item and does not stop the rest of the items.
+
+        `Args:`
+            func: function
+                A function that takes a single item and makes a request with this connector
+            items: iterable
+                The items (e.g. the rows of a Parsons Table) to call ``func`` with
+            max_workers: int
+                The maximum number of calls to make at once
+            max_retries: int
+                The maximum number of times to retry a call that failed with a retryable error
+            backoff_factor: float
+                The number of seconds to wait before the first retry. The wait doubles with
+                each retry.
+        `Returns:`
+            Parsons Table
+                A row per item, in the same order as ``items``, with the columns ``index``,
+                ``status`` (``success`` or ``error``), ``error`` and ``result`` (the value
+                returned by ``func``).
+        """
+
+        def call(index, item):
+            for attempt in range(max_retries + 1):
+                try:
+                    result = func(item)
+                    return {'index': index, 'status': 'success', 'error': None, 'result': result}
+                except Exception as e:
+                    if attempt < max_retries and _is_retryable(e):
+                        wait = _retry_after(e) or backoff_factor * 2 ** attempt
+                        logger.debug(f'Retrying item {index} in {wait} seconds: {e}')
+                        time.sleep(wait)
+                        continue
 
-        return _request(req_type, full_url, headers=self.headers, auth=self.auth, json=json,
-                        data=data, params=params)
+                    logger.debug(f'Request for item {index} failed: {e}')
+                    return {'index': index, 'status': 'error', 'error': str(e), 'result': None}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(call, index, item) for index, item in enumerate(items)]
+            results = [future.result() for future in futures]
+
+        errors = sum(1 for r in results if r['status'] == 'error')
+        logger.info(f'Made {len(results)} requests, {errors} failed.')
+
+        return Table(results) if results else Table([['index', 'status', 'error', 'result']])
 
     def get_request(self, url, params=None):
         """
@@ -231,9 +386,9 @@ class APIConnector(object):
 
             # Some errors return JSONs with useful info about the error. Return it if exists.
             if self.json_check(resp):
-                raise HTTPError(f'{message}, json: {resp.json()}')
+                raise HTTPError(f'{message}, json: {resp.json()}', response=resp)
             else:
-                raise HTTPError(message)
+                raise HTTPError(message, response=resp)
 
     def data_parse(self, resp):
         """
@@ -293,3 +448,26 @@ class APIConnector(object):
             return True
         except JSONDecodeError:
             return False
+
+
+def _is_retryable(error):
+    # Whether a request that raised an error may succeed if tried again
+
+    if isinstance(error, (ConnectionError, Timeout)):
+        return True
+
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in RETRY_STATUS_CODES
+
+
+def _retry_after(error):
+    # The number of seconds the server asked us to wait before retrying, if it said
+
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,229 @@
+import datetime
+import itertools
+import json
+import os
+import re
+import struct
+import zlib
+
+from parsons.utilities import files
+from parsons.utilities.multipart import MULTIPART_PART_SIZE
+from parsons.utilities.spill import SpillView, SpillWriter
+
+__all__ = [
+    'avro_parts',
+    'valid_field_names',
+]
+
+# Number of rows to encode (and compress) together into a single Avro block
+AVRO_BLOCK_ROWS = 10000
+
+_MAGIC = b'Obj\x01'
+_FIELD_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_DATE = datetime.date(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# The Avro type of each kind of value. Dates and times use Avro's logical types, and naive
+# datetimes are strings with BigQuery's "datetime" logical type.
+_AVRO_TYPES = {
+    'boolean': 'boolean',
+    'long': 'long',
+    'double': 'double',
+    'string': 'string',
+    'date': {'type': 'int', 'logicalType': 'date'},
+    'time': {'type': 'long', 'logicalType': 'time-micros'},
+    'timestamp': {'type': 'long', 'logicalType': 'timestamp-micros'},
+    'datetime': {'type': 'string', 'logicalType': 'datetime'},
+}
+
+
+def _kind(value):
+    # The kind of Avro value a python value is stored as
+
+    value_type = type(value)
+
+    if value is None:
+        return None
+    if value_type is bool:
+        return 'boolean'
+    if value_type is int:
+        return 'long' if _INT64_MIN <= value <= _INT64_MAX else 'string'
+    if value_type is float:
+        return 'double'
+    if isinstance(value, datetime.datetime):
+        return 'timestamp' if value.tzinfo else 'datetime'
+    if isinstance(value, datetime.date):
+        return 'date'
+    if isinstance(value, datetime.time):
+        return 'time'
+
+    return 'string'
+
+
+def _column_kind(kinds):
+    # The kind of Avro value that can hold every value in a column
+
+    kinds = kinds - {None}
+
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds == {'long', 'double'}:
+        return 'double'
+
+    return 'string'
+
+
+def _long(value):
+    # A zig-zag encoded variable length int
+
+    value = (value << 1) ^ (value >> 63)
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+
+    return bytes(encoded)
+
+
+def _bytes(value):
+    return _long(len(value)) + value
+
+
+def _string(value):
+
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, default=str)
+    elif not isinstance(value, str):
+        value = str(value)
+
+    return _bytes(value.encode('utf-8'))
+
+
+_ENCODERS = {
+    'boolean': lambda value: b'\x01' if value else b'\x00',
+    'long': _long,
+    'double': lambda value: struct.pack('<d', value),
+    'string': _string,
+    'date': lambda value: _long((value - _EPOCH_DATE).days),
+    'time': lambda value: _long(
+        ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond),
+    'timestamp': lambda value: _long((value - _EPOCH) // _MICROSECOND),
+    'datetime': lambda value: _string(value.isoformat(sep=' ')),
+}
+
+# Every field is a union of null and its type, so values are prefixed with the union branch
+_NULL = _long(0)
+_NOT_NULL = _long(1)
+
+
+def valid_field_names(columns):
+    """
+    Check whether column names can be used as the field names of an Avro record. Names must
+    be unique, start with a letter or underscore, and contain only letters, digits and
+    underscores.
+
+    `Args:`
+        columns: list
+            The column names
+    `Returns:`
+        bool
+    """
+
+    return (bool(columns) and len(set(columns)) == len(columns)
+            and all(isinstance(column, str) and _FIELD_NAME.match(column)
+                    for column in columns))
+
+
+def avro_parts(table, part_size=MULTIPART_PART_SIZE, name='parsons_table'):
+    """
+    Encode a table as an Avro object container file (with deflate compression), in parts of
+    at least ``part_size`` bytes (except the last), for a streaming upload.
+
+    Avro files are typed, so the schema has to be known before the rows are written. Rather
+    than reading the table once to infer the schema and again to write it, the table is read
+    once, inferring the type of each column while the rows are spilled to a local file. The
+    rows are then encoded from the spill file. Columns with one type of value get the
+    matching Avro type (ints and floats together are doubles), and columns with a mix of
+    types are strings. Every field is nullable.
+
+    `Args:`
+        table: petl table
+            The table to encode. Its column names must be valid Avro field names (see
+            :func:`valid_field_names`).
+        part_size: int
+            The minimum size of each part, in bytes
+        name: str
+            The name of the Avro record
+    `Returns:`
+        generator
+            The parts, as bytes
+    """
+
+    rows = iter(table)
+    header = list(next(rows, []))
+
+    if not valid_field_names(header):
+        raise ValueError(f'Columns are not valid Avro field names: {header}')
+
+    width = len(header)
+    kinds = [set() for _ in header]
+    path = files.create_temp_file()
+
+    try:
+        with SpillWriter(path, header, block_size=AVRO_BLOCK_ROWS) as writer:
+            while True:
+                block = list(itertools.islice(rows, AVRO_BLOCK_ROWS))
+                if not block:
+                    break
+
+                # Pad or trim rows to the width of the header
+                block = [row if len(row) == width else (tuple(row) + (None,) * width)[:width]
+                         for row in block]
+                for column_kinds, values in zip(kinds, zip(*block)):
+                    column_kinds.update(map(_kind, values))
+
+                writer.write_rows(block)
+
+        column_kinds = [_column_kind(k) for k in kinds]
+        schema = {
+            'type': 'record',
+            'name': name,
+            'fields': [{'name': column, 'type': ['null', _AVRO_TYPES[kind]], 'default': None}
+                       for column, kind in zip(header, column_kinds)],
+        }
+
+        sync = os.urandom(16)
+        encoders = [_ENCODERS[kind] for kind in column_kinds]
+
+        metadata = {'avro.schema': json.dumps(schema).encode('utf-8'), 'avro.codec': b'deflate'}
+        buffer = bytearray(_MAGIC)
+        buffer += _long(len(metadata))
+        for key, value in metadata.items():
+            buffer += _string(key) + _bytes(value)
+        buffer += _long(0) + sync
+
+        for block in SpillView(path).blocks():
+            data = b''.join(
+                _NULL if value is None else _NOT_NULL + encode(value)
+                for row in block for encode, value in zip(encoders, row))
+
+            # Avro's deflate codec is raw deflate, without a zlib header
+            compressor = zlib.compressobj(wbits=-15)
+            data = compressor.compress(data) + compressor.flush()
+            buffer += _long(len(block)) + _bytes(data) + sync
+
+            if len(buffer) >= part_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+
+    finally:
+        files.close_temp_file(path)
@@ -0,0 +1,94 @@
+import csv
+import io
+import itertools
+
+__all__ = [
+    'CSVStream',
+]
+
+# Number of rows to encode at a time when the stream needs more data.
+CSV_STREAM_CHUNK_ROWS = 1000
+
+
+class CSVStream(io.RawIOBase):
+    """
+    A read-only, file-like object that lazily encodes the rows of a table as CSV.
+
+    Rows are pulled from the table and encoded a chunk at a time as the stream is read, so only
+    a chunk's worth of encoded data is held in memory no matter how large the table is. This
+    can be passed anywhere a binary file opened for reading is expected (eg. psycopg2's
+    ``copy_expert``), without first writing the table out to a file on disk.
+
+    `Args:`
+        table: petl table
+            The table to encode. The first row must be the header.
+        write_header: bool
+            Whether to include the header in the output
+        encoding: str
+            The encoding of the output. Defaults to ``utf-8``.
+        errors: str
+            How to handle values that can't be encoded, as for ``str.encode``
+        chunk_rows: int
+            The number of rows to encode at a time
+        \**csvargs: kwargs
+            ``csv.writer`` optional arguments
+    """  # noqa: W605
+
+    def __init__(self, table, write_header=True, encoding='utf-8', errors='strict',
+                 chunk_rows=CSV_STREAM_CHUNK_ROWS, **csvargs):
+
+        super().__init__()
+
+        self.encoding = encoding
+        self.errors = errors
+        self.chunk_rows = chunk_rows
+
+        # Number of data rows (not counting the header) and bytes handed out so far
+        self.num_rows = 0
+        self.num_bytes = 0
+
+        self._rows = iter(table)
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text, **csvargs)
+        self._buffer = bytearray()
+        self._exhausted = False
+
+        header = next(self._rows, None)
+        if header is None:
+            self._exhausted = True
+        elif write_header:
+            self._writer.writerow(header)
+            self._encode_text()
+
+    def readable(self):
+        return True
+
+    def _encode_text(self):
+
+        self._buffer += self._text.getvalue().encode(self.encoding, self.errors)
+        self._text.seek(0)
+        self._text.truncate()
+
+    def _fill(self):
+
+        rows = list(itertools.islice(self._rows, self.chunk_rows))
+
+        if not rows:
+            self._exhausted = True
+            return
+
+        self._writer.writerows(rows)
+        self._encode_text()
+        self.num_rows += len(rows)
+
+    def readinto(self, b):
+
+        while len(self._buffer) < len(b) and not self._exhausted:
+            self._fill()
+
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        self.num_bytes += size
+
+        return size
@@ -32,18 +32,20 @@ _temp_files = []
 _temp_directories = []
 
 
-def create_temp_file(suffix=None):
+def create_temp_file(suffix=None, directory=None):
     """
     Create a temp file that will exist as long as the current script is running.
 
     `Args:`
         suffix: str
             A suffix/extension to add to the end of the temp file name
+        directory: str
+            The directory to create the temp file in. Defaults to the system temp directory.
     `Returns:`
         str
             The path of the temp file
     """
-    temp_file = TempFile(suffix=suffix)
+    temp_file = TempFile(suffix=suffix, directory=directory)
     _temp_files.append(temp_file)
     return temp_file.name
 
@@ -281,13 +283,15 @@ def has_data(file_path):
         return True
 
 
-def generate_tempfile(suffix=None, create=False):
+def generate_tempfile(suffix=None, create=False, directory=None):
     """
     Create a new temp file with a unique filename.
 
     `Args:`
         suffix: str
             The suffix to give the file path in order to advertise the file/mime type of the file.
+        directory: str
+            The directory to create the temp file in. Defaults to the system temp directory.
     `Returns`
         str
             The path of the newly created temp file.
@@ -296,7 +300,7 @@ def generate_tempfile(suffix=None, create=False):
     # It's not ideal to use a "protected" function from another module, but this function does some
     # heavy lifting for us.
     names = tempfile._get_candidate_names()
-    temp_dir = tempfile.gettempdir()
+    temp_dir = directory or tempfile.gettempdir()
 
     # Try multiple times to create a temp file, just in case (however unlikely) we have some
     # collisions with already existing files.
@@ -394,11 +398,13 @@ class TempFile:
     `Args:`
         suffix: str
             The suffix to give the file path in order to advertise the file/mime type of the file.
+        directory: str
+            The directory to create the file in. Defaults to the system temp directory.
     """
 
-    def __init__(self, name=None, suffix=None):
+    def __init__(self, name=None, suffix=None, directory=None):
         self.remove_called = False
-        self.name = name or generate_tempfile(suffix)
+        self.name = name or generate_tempfile(suffix, directory=directory)
 
     def __del__(self):
         # When we are being cleaned up, call remove to make sure the file is removed from disk.
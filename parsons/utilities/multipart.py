@@ -0,0 +1,182 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import queue
+import threading
+import zlib
+
+from parsons.utilities.csv_stream import CSVStream
+
+__all__ = [
+    'csv_parts',
+    'prefetch',
+    'upload_parts',
+]
+
+# The size of each part of a streaming upload. S3 requires every part but the last to be at
+# least 5 MB, and GCS requires resumable upload chunks to be a multiple of 256 KB. S3 allows
+# up to 10,000 parts, so uploads can be up to about 80 GB.
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# The number of parts to upload at once
+MULTIPART_WORKERS = 4
+
+# The number of bytes of CSV to read from the encoder at a time
+_READ_SIZE = 1024 * 1024
+
+
+def csv_parts(table, part_size=MULTIPART_PART_SIZE, compression=None, encoding=None,
+              errors='strict', write_header=True, **csvargs):
+    """
+    Encode a table as CSV in parts of at least ``part_size`` bytes (except the last), for a
+    streaming upload. Rows are encoded (and compressed) as the parts are read, so only about
+    one part is held in memory at a time. Yields at least one part, even if it is empty.
+
+    `Args:`
+        table: petl table
+            The table to encode
+        part_size: int
+            The minimum size of each part, in bytes
+        compression: str
+            ``None`` or ``gzip``. The parts join together into a single gzip file.
+        encoding: str
+            The CSV encoding. Defaults to ``utf-8``.
+        errors: str
+            How to handle values that can't be encoded, as for ``str.encode``
+        write_header: boolean
+            Include header in output
+        \**csvargs: kwargs
+            ``csv_writer`` optional arguments
+    `Returns:`
+        generator
+            The parts, as bytes
+    """  # noqa: W605
+
+    if compression not in (None, 'gzip'):
+        raise ValueError(f'Unsupported compression for a streaming upload: {compression}')
+
+    stream = CSVStream(table, write_header=write_header, encoding=encoding or 'utf-8',
+                       errors=errors, **csvargs)
+    # wbits=31 writes a gzip header and trailer
+    compressor = zlib.compressobj(wbits=31) if compression == 'gzip' else None
+
+    buffer = bytearray()
+    num_parts = 0
+
+    while True:
+        data = stream.read(min(part_size, _READ_SIZE))
+        if not data:
+            break
+
+        buffer += compressor.compress(data) if compressor else data
+
+        if len(buffer) >= part_size:
+            yield bytes(buffer)
+            buffer.clear()
+            num_parts += 1
+
+    if compressor:
+        buffer += compressor.flush()
+
+    if buffer or not num_parts:
+        yield bytes(buffer)
+
+
+def upload_parts(parts, upload_part, workers=MULTIPART_WORKERS):
+    """
+    Upload parts concurrently, while later parts are still being produced. At most
+    ``workers`` parts are uploading, and ``workers`` more waiting, at any time, so memory
+    use is bounded however many parts there are. If an upload fails, parts that haven't
+    started are cancelled and the error is raised.
+
+    `Args:`
+        parts: iterable
+            The parts to upload
+        upload_part: function
+            Uploads a part. Called (from a worker thread) with the part number, counting from
+            1, and the part.
+        workers: int
+            The number of parts to upload at once
+    `Returns:`
+        list
+            The return values of ``upload_part``, in part order
+    """
+
+    results = {}
+    pending = {}
+
+    def collect(futures):
+        for future in futures:
+            results[pending.pop(future)] = future.result()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for number, part in enumerate(parts, 1):
+                if len(pending) >= workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                pending[executor.submit(upload_part, number, part)] = number
+
+            collect(wait(pending)[0])
+
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return [results[number] for number in sorted(results)]
+
+
+def prefetch(parts, size=2):
+    """
+    Produce parts in a background thread, up to ``size`` ahead of the consumer, so they
+    are encoded while earlier parts are uploading. Used for uploads that must send their
+    parts in order (eg. GCS resumable uploads).
+
+    `Args:`
+        parts: iterable
+            The parts
+        size: int
+            The maximum number of parts to produce ahead
+    `Returns:`
+        generator
+            The parts
+    """
+
+    done = object()
+    buffer = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item):
+        # Wait for space, unless the consumer has stopped
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for part in parts:
+                if not put((part, None)):
+                    return
+            put((done, None))
+        except BaseException as error:
+            put((done, error))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            part, error = buffer.get()
+            if part is done:
+                if error:
+                    raise error
+                return
+            yield part
+    finally:
+        # If the consumer stops early, let the producer finish
+        stop.set()
+        thread.join()
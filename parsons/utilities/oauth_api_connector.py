@@ -1,6 +1,6 @@
 from oauthlib.oauth2 import BackendApplicationClient
 from requests_oauthlib import OAuth2Session
-from parsons.utilities.api_connector import APIConnector
+from parsons.utilities.api_connector import APIConnector, POOL_SIZE
 import urllib.parse
 
 
@@ -31,26 +31,49 @@ class OAuth2APIConnector(APIConnector):
             The URL for acquiring new tokens from the OAuth2 Application
         auto_refresh_url: str
             If provided, the URL for refreshing tokens from the OAuth2 Application
+        rate_limit: float
+            The maximum number of requests per second to make with this connector. If
+            ``None``, requests are not rate limited.
+        burst: int
+            The number of requests that can be made at once before the rate limit kicks in.
+            Defaults to ``rate_limit``.
+        pool_size: int
+            The maximum number of connections to keep alive to each host
+        max_retries: int
+            The number of times to retry read requests (``GET``, ``HEAD`` and ``OPTIONS``)
+            that fail to connect, or that return a ``429`` or ``5xx`` status code. If ``None``,
+            requests are not retried.
+        max_concurrent_requests: int
+            The maximum number of requests that can be in flight to the API at once. If
+            ``None``, there is no limit.
     `Returns`:
         OAuthAPIConnector class
     """
 
     def __init__(
         self, uri, headers=None, auth=None, pagination_key=None, data_key=None,
-        client_id=None, client_secret=None, token_url=None, auto_refresh_url=None
+        client_id=None, client_secret=None, token_url=None, auto_refresh_url=None,
+        rate_limit=None, burst=None, pool_size=POOL_SIZE, max_retries=None,
+        max_concurrent_requests=None
     ):
         super().__init__(
-            uri, headers=headers, auth=auth, pagination_key=pagination_key, data_key=data_key
+            uri, headers=headers, auth=auth, pagination_key=pagination_key, data_key=data_key,
+            rate_limit=rate_limit, burst=burst, pool_size=pool_size, max_retries=max_retries,
+            max_concurrent_requests=max_concurrent_requests
         )
 
         client = BackendApplicationClient(client_id=client_id)
         oauth = OAuth2Session(client=client)
         self.token = oauth.fetch_token(token_url=token_url,
                                        client_id=client_id, client_secret=client_secret)
-        self.client = OAuth2Session(
+        self.client = self.mount_adapter(OAuth2Session(
             client_id, token=self.token, auto_refresh_url=auto_refresh_url,
             token_updater=self.token_saver
-        )
+        ))
+
+        # Requests are made with the OAuth2 client, so it replaces the default session
+        self.session.close()
+        self.session = self.client
 
     def request(self, url, req_type, json=None, data=None, params=None):
         """
@@ -75,10 +98,12 @@ class OAuth2APIConnector(APIConnector):
             requests response
         """
         full_url = urllib.parse.urljoin(self.uri, url)
-        return self.client.request(
-            req_type, full_url, headers=self.headers, auth=self.auth,
-            json=json, data=data, params=params
-        )
+        self.throttle()
+        with self.request_slots:
+            return self.client.request(
+                req_type, full_url, headers=self.headers, auth=self.auth,
+                json=json, data=data, params=params
+            )
 
     def token_saver(self, token):
         self.token = token
@@ -0,0 +1,243 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+
+import petl
+
+from parsons.utilities.files import create_temp_file
+from parsons.utilities.spill import SpillView, SpillWriter
+
+__all__ = [
+    'paginate',
+    'prefetch_pages',
+    'PagedView',
+]
+
+# Number of rows a PagedView holds in memory before it moves them to a spill file on disk.
+PAGED_SPILL_THRESHOLD = 100000
+
+# Number of pages prefetch_pages keeps requested ahead of the page being read.
+PREFETCH_PAGES = 4
+
+
+def paginate(get_page, get_items, get_next, start=None, limit=None):
+    """
+    Generator that requests the pages of a paginated API one at a time and yields the items
+    on each page as it arrives. Only one page is held in memory at a time, and stops at the
+    first empty page, when there is no next page, or once ``limit`` items have been yielded.
+
+    .. code-block:: python
+
+        pages = paginate(
+            get_page=lambda page: api.get_request('people', params={'page': page}),
+            get_items=lambda response: response['items'],
+            get_next=lambda response, page: page + 1,
+            start=1)
+
+    `Args:`
+        get_page: function
+            A function that takes a cursor (e.g. a page number or next page url) and returns
+            the response for that page
+        get_items: function
+            A function that takes a response and returns the list of items on that page
+        get_next: function
+            A function that takes a response and the cursor used to request it, and returns
+            the cursor of the next page, or ``None`` if there are no more pages
+        start:
+            The cursor of the first page
+        limit: int
+            The maximum number of items to yield. If ``None``, yields every item.
+    `Returns:`
+        generator
+            A generator of lists of items, one list per page
+    """
+
+    cursor = start
+    count = 0
+
+    while True:
+        response = get_page(cursor)
+        items = get_items(response)
+
+        if not items:
+            return
+
+        if limit:
+            items = items[:limit - count]
+
+        yield items
+        count += len(items)
+
+        if limit and count >= limit:
+            return
+
+        cursor = get_next(response, cursor)
+        if cursor is None:
+            return
+
+
+def prefetch_pages(get_page, get_items, start=1, step=1, prefetch=PREFETCH_PAGES, limit=None):
+    """
+    Generator for page number or offset paginated APIs, where the cursor of every page is
+    known in advance. Rather than waiting for each page before requesting the next, keeps
+    ``prefetch`` requests in flight on a pool of threads. Pages are still yielded in order, and
+    it stops at the first empty page (discarding any later pages that were already requested)
+    or once ``limit`` items have been yielded.
+
+    Requesting ahead means up to ``prefetch - 1`` requests past the last page are wasted, and
+    the API sees ``prefetch`` concurrent requests. Use the connector's ``rate_limit`` and
+    ``max_concurrent_requests`` to stay within the API's limits.
+
+    `Args:`
+        get_page: function
+            A function that takes a cursor (e.g. a page number or offset) and returns the
+            response for that page. It is called from multiple threads.
+        get_items: function
+            A function that takes a response and returns the list of items on that page
+        start: int
+            The cursor of the first page
+        step: int
+            The amount to increase the cursor by for each page. Use ``1`` for page numbers,
+            or the page size for offsets.
+        prefetch: int
+            The number of page requests to keep in flight
+        limit: int
+            The maximum number of items to yield. If ``None``, yields every item.
+    `Returns:`
+        generator
+            A generator of lists of items, one list per page
+    """
+
+    cursors = itertools.count(start, step)
+    count = 0
+
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        pending = deque(executor.submit(get_page, next(cursors)) for _ in range(prefetch))
+
+        try:
+            while pending:
+                items = get_items(pending.popleft().result())
+
+                if not items:
+                    return
+
+                if limit:
+                    items = items[:limit - count]
+
+                yield items
+                count += len(items)
+
+                if limit and count >= limit:
+                    return
+
+                pending.append(executor.submit(get_page, next(cursors)))
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class PagedView(petl.Table):
+    """
+    A petl table over the pages of rows (dicts) produced by a generator such as
+    :func:`paginate`. No pages are requested until the table is first read. The pages are
+    then consumed once, with the rows kept in memory until there are more than
+    ``spill_threshold`` of them, after which they are moved to a spill file on disk. Later
+    reads use the stored rows rather than requesting the pages again. If requesting a page
+    fails, the error is raised by that read and by every later one, since the pages can't be
+    consumed again.
+
+    As with ``petl.fromdicts``, the header is the union of the keys of every row, in the order
+    they were first seen.
+
+    `Args:`
+        pages: iterable
+            An iterable of lists of dicts
+        spill_threshold: int
+            The number of rows to hold in memory before spilling them to disk. If ``None``,
+            every row is kept in memory.
+    """
+
+    def __init__(self, pages, spill_threshold=PAGED_SPILL_THRESHOLD):
+
+        self.pages = pages
+        self.spill_threshold = spill_threshold
+
+        self._header = None
+        self._rows = []
+        self._num_rows = 0
+        self._spill_path = None
+        self._error = None
+
+    @property
+    def spilled(self):
+        return self._spill_path is not None
+
+    @property
+    def num_rows(self):
+
+        self._load()
+        return self._num_rows
+
+    def _load(self):
+
+        if self._error is not None:
+            # The pages were partly consumed, so they can't be read again
+            raise self._error
+
+        if self._header is not None:
+            return
+
+        columns = {}
+        rows = []
+        num_rows = 0
+        spill_path = None
+        writer = None
+
+        try:
+            for page in self.pages:
+                for row in page:
+                    columns.update(dict.fromkeys(row))
+                    rows.append(row)
+                num_rows += len(page)
+
+                if self.spill_threshold and len(rows) >= self.spill_threshold:
+                    if writer is None:
+                        spill_path = create_temp_file(suffix='.spill')
+                        writer = SpillWriter(spill_path, ['row'])
+                    writer.write_rows((row,) for row in rows)
+                    rows = []
+
+            if writer is not None:
+                writer.write_rows((row,) for row in rows)
+                writer.close()
+                rows = []
+
+        except Exception as error:
+            if writer is not None:
+                writer.close()
+            self._error = error
+            raise
+
+        self._rows = rows
+        self._num_rows = num_rows
+        self._spill_path = spill_path
+        self._header = tuple(columns)
+
+    def _iter_dicts(self):
+
+        if self.spilled:
+            for block in SpillView(self._spill_path).blocks():
+                for row, in block:
+                    yield row
+        else:
+            yield from self._rows
+
+    def __iter__(self):
+
+        self._load()
+
+        yield self._header
+
+        for row in self._iter_dicts():
+            yield tuple(row.get(column) for column in self._header)
@@ -0,0 +1,61 @@
+import threading
+import time
+
+__all__ = [
+    'TokenBucket',
+]
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket rate limiter. The bucket refills at ``rate`` tokens per second
+    up to ``capacity`` tokens, and each call to :meth:`acquire` blocks until a token is
+    available. This allows short bursts of up to ``capacity`` calls while holding the long
+    running average to ``rate`` calls per second.
+
+    `Args:`
+        rate: float
+            The number of tokens added to the bucket per second
+        capacity: int
+            The maximum number of tokens the bucket can hold. Defaults to ``rate`` (and at
+            least one token).
+    """
+
+    def __init__(self, rate, capacity=None):
+
+        if rate <= 0:
+            raise ValueError('rate must be greater than zero')
+
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens from the bucket, waiting until they are available.
+
+        `Args:`
+            tokens: int
+                The number of tokens to take
+        `Returns:`
+            float
+                The number of seconds spent waiting
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Reserve the tokens now, even if that takes the bucket negative, so that callers
+            # waiting at the same time queue up behind each other rather than all waking at once.
+            self._tokens -= tokens
+            wait = max(0, -self._tokens / self.rate)
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
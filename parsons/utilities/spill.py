@@ -0,0 +1,219 @@
+import os
+import pickle
+import struct
+
+import petl
+
+__all__ = [
+    'SpillWriter',
+    'SpillView',
+    'fromspill',
+    'read_spill_metadata',
+]
+
+# Spill files hold large result sets (eg. database query results) on local disk, so that we
+# don't have to keep them in memory. Rather than pickling one row at a time, rows are grouped
+# into blocks that are pickled as a single list, which makes both writing and re-reading the
+# file much faster. The file is laid out as:
+#
+#   <magic bytes> <block> <block> ... <metadata> <metadata offset>
+#
+# The metadata holds the column names, the total row count, the location and size of every
+# block, and the python type of the first non-null value seen in each column. The last 8 bytes
+# of the file hold the offset of the metadata, so it can be read without scanning the blocks.
+
+# Number of rows to pickle together into a single block.
+SPILL_BLOCK_SIZE = 10000
+
+SPILL_FORMAT_VERSION = 1
+
+_MAGIC = b'PRSNSPL1'
+_OFFSET = struct.Struct('<Q')
+
+
+class SpillWriter:
+    """
+    Write rows to a block-based spill file. Can be used as a context manager, in which case
+    the file is closed (and its metadata written) when the context exits.
+
+    `Args:`
+        path: str
+            The path of the file to write to
+        columns: list
+            The column names of the rows that will be written
+        block_size: int
+            The number of rows to group into a single block
+    """
+
+    def __init__(self, path, columns, block_size=SPILL_BLOCK_SIZE):
+
+        self.path = path
+        self.columns = tuple(columns)
+        self.block_size = block_size
+        self.num_rows = 0
+
+        self._blocks = []
+        self._buffer = []
+        self._column_types = [None] * len(self.columns)
+        self._handle = open(path, 'wb')
+        self._handle.write(_MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_rows(self, rows):
+        """
+        Add rows to the spill file.
+
+        `Args:`
+            rows: iterable
+                An iterable of rows (lists or tuples) in the same order as ``columns``
+        """
+
+        for row in rows:
+            self._buffer.append(tuple(row))
+            if len(self._buffer) >= self.block_size:
+                self._flush()
+
+    def _flush(self):
+
+        if not self._buffer:
+            return
+
+        # Only look at the columns whose type we haven't seen yet, so this is usually a
+        # quick scan of the first few rows of the first block.
+        for index, column_type in enumerate(self._column_types):
+            if column_type is None:
+                for row in self._buffer:
+                    if row[index] is not None:
+                        self._column_types[index] = type(row[index]).__name__
+                        break
+
+        self._blocks.append((self._handle.tell(), len(self._buffer)))
+        pickle.dump(self._buffer, self._handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self.num_rows += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """
+        Flush any buffered rows and write the file's metadata.
+
+        `Returns:`
+            str
+                The path of the spill file
+        """
+
+        if self._handle.closed:
+            return self.path
+
+        self._flush()
+
+        metadata = {
+            'version': SPILL_FORMAT_VERSION,
+            'columns': self.columns,
+            'column_types': dict(zip(self.columns, self._column_types)),
+            'num_rows': self.num_rows,
+            'blocks': self._blocks,
+        }
+
+        metadata_offset = self._handle.tell()
+        pickle.dump(metadata, self._handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self._handle.write(_OFFSET.pack(metadata_offset))
+        self._handle.close()
+
+        return self.path
+
+
+def read_spill_metadata(path):
+    """
+    Read the metadata of a spill file without reading any of its rows.
+
+    `Args:`
+        path: str
+            The path of the spill file
+    `Returns:`
+        dict
+            The ``columns``, ``column_types``, ``num_rows`` and ``blocks`` of the file
+    """
+
+    with open(path, 'rb') as handle:
+        if handle.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f'{path} is not a Parsons spill file')
+
+        handle.seek(-_OFFSET.size, os.SEEK_END)
+        metadata_offset, = _OFFSET.unpack(handle.read(_OFFSET.size))
+        handle.seek(metadata_offset)
+
+        return pickle.load(handle)
+
+
+class SpillView(petl.Table):
+    """
+    A petl table backed by a spill file. The header and row count are read from the file's
+    metadata, and rows are decoded a whole block at a time as the table is iterated.
+
+    `Args:`
+        path: str
+            The path of the spill file
+    """
+
+    def __init__(self, path):
+
+        self.path = path
+        self._metadata = None
+
+    @property
+    def metadata(self):
+
+        if self._metadata is None:
+            self._metadata = read_spill_metadata(self.path)
+
+        return self._metadata
+
+    @property
+    def num_rows(self):
+        return self.metadata['num_rows']
+
+    @property
+    def column_types(self):
+        return self.metadata['column_types']
+
+    def blocks(self):
+        """
+        Iterate over the blocks of the spill file.
+
+        `Returns:`
+            iterator
+                An iterator of lists of row tuples
+        """
+
+        metadata = self.metadata
+
+        with open(self.path, 'rb') as handle:
+            handle.seek(len(_MAGIC))
+            for _ in metadata['blocks']:
+                yield pickle.load(handle)
+
+    def __iter__(self):
+
+        yield self.metadata['columns']
+
+        for block in self.blocks():
+            yield from block
+
+
+def fromspill(path):
+    """
+    Load a petl table from a spill file.
+
+    `Args:`
+        path: str
+            The path of the spill file
+    `Returns:`
+        SpillView
+    """
+
+    return SpillView(path)
@@ -0,0 +1,19 @@
+__all__ = ['value_width']
+
+
+def value_width(value):
+    """
+    Return the width of a value as it is written to a file or database: the number of bytes
+    in the utf-8 encoding of its string representation. ``None`` is ``'None'``, 4 bytes wide.
+
+    `Args:`
+        value:
+            The value
+    `Returns:`
+        int
+    """
+
+    if type(value) is str:
+        return len(value) if value.isascii() else len(value.encode('utf-8'))
+
+    return len(str(value).encode('utf-8'))
@@ -82,6 +82,12 @@ class FakeTable:
 
         return max(self.data[primary_key])
 
+    def min_primary_key(self, primary_key):
+        if primary_key not in self.data.columns:
+            return None
+
+        return min(self.data[primary_key])
+
     @property
     def num_rows(self):
         return self.data.num_rows
@@ -102,8 +108,16 @@ class FakeTable:
         data = self.data.select_rows(lambda row: row[primary_key_col] > start_value)
         return data.num_rows
 
-    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None):
-        data = self.data.select_rows(lambda row: row[primary_key] > cutoff_value)
+    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None,
+                     max_value=None):
+        data = self.data.cut(*self.data.columns)
+
+        if cutoff_value is not None:
+            data = data.select_rows(lambda row: row[primary_key] > cutoff_value)
+
+        if max_value is not None:
+            data = data.select_rows(lambda row: row[primary_key] <= max_value)
+
         data.sort(primary_key)
 
         return Table(data[offset:chunk_size + offset])
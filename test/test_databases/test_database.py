@@ -155,3 +155,49 @@ def test_default_format_column(dcs, col, renamed):
      ))
 def test_default_format_columns(dcs, cols, cols_formatted):
     assert dcs.format_columns(cols) == cols_formatted
+
+
+@pytest.mark.parametrize(
+    "values",
+    (["1", "2", "-300000"],
+     [1, 2, 3000000000],
+     [1, "2", 3.5],
+     ["1.5", "1e5", "+2.", ".5", "0.5"],
+     ["-0", "+0", "007", "0x1F", "1_000"],
+     ["a string", "None", None, "True", "inf"],
+     [None, None],
+     [1.5, float("nan")],
+     [True, 1],
+     ["None ", 12, "9" * 30],
+     [{}, 1],
+     ))
+@pytest.mark.parametrize("cmp_type", (None, "", SMALLINT, BIGINT, FLOAT, VARCHAR))
+def test_detect_column_type(dcs, values, cmp_type):
+    # Matches detecting the type of every value in turn
+    expected = cmp_type
+    for value in values:
+        expected = dcs.detect_data_type(value, expected)
+
+    assert dcs.detect_column_type(values, cmp_type) == expected
+
+
+def test_infer_data_types(dcs):
+    from parsons import Table
+
+    tbl = Table([['id', 'name', 'score', 'empty'],
+                 [1, 'Jim', '1.5', None],
+                 [2, 'Zoë', 'NA', None],
+                 [300000, None, '2', None]])
+
+    mapping = dcs.infer_data_types(tbl, null_values=('NA',))
+    assert mapping['headers'] == ['id', 'name', 'score', 'empty']
+    assert mapping['type_list'] == [MEDIUMINT, VARCHAR, FLOAT, None]
+    # Nulls are as wide as 'None'
+    assert mapping['longest'] == [6, 4, 3, 4]
+    assert mapping['nullable'] == [False, True, True, True]
+
+    # Types come from the sample, widths from every row
+    dcs.INFER_BLOCK_SIZE = 2
+    mapping = dcs.infer_data_types(tbl, sample_size=1)
+    assert mapping['type_list'] == [SMALLINT, VARCHAR, FLOAT, None]
+    assert mapping['longest'] == [6, 4, 3, 4]
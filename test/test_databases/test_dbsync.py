@@ -310,3 +310,127 @@ class TestFakeDBSync(unittest.TestCase):
         # write chunks of 3, 5 rows to write.. should be 2 copy calls
         self.assertEqual(len(self.fake_destination.copy_call_args), 2,
                          self.fake_destination.copy_call_args)
+
+    def test_table_sync_full_keyset_pagination(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2,
+                        keyset_pagination=True)
+        source_data = Table([
+            {'id': 1, 'value': 11},
+            {'id': 2, 'value': 121142},
+            {'id': 3, 'value': 111},
+            {'id': 4, 'value': 12211},
+            {'id': 5, 'value': 1231},
+        ])
+        self.fake_source.setup_table('source', source_data)
+
+        dbsync.table_sync_full('source', 'destination', order_by='id')
+
+        destination = self.fake_destination.table('destination')
+
+        # Make sure the data came through
+        assert_matching_tables(source_data, destination.data)
+
+        # Keyset pagination requires a column to order by
+        self.assertRaises(ValueError, dbsync.copy_rows, 'source', 'destination', None, None)
+
+    def test_table_sync_incremental_keyset_pagination(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2,
+                        keyset_pagination=True)
+        source_data = Table([
+            {'id': 1, 'value': 11},
+            {'id': 2, 'value': 121142},
+            {'id': 3, 'value': 111},
+            {'id': 4, 'value': 12211},
+            {'id': 5, 'value': 1231},
+        ])
+        self.fake_source.setup_table('source', source_data)
+        self.fake_destination.setup_table('destination', Table([{'id': 1, 'value': 11}]))
+
+        dbsync.table_sync_incremental('source', 'destination', 'id')
+
+        destination = self.fake_destination.table('destination')
+
+        # Make sure the rest of the data came through
+        assert_matching_tables(source_data, destination.data)
+
+    def test_table_sync_full_read_workers(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2,
+                        read_workers=3, queue_size=1)
+        source_data = Table([{'id': i, 'value': i * 10} for i in range(1, 21)])
+        self.fake_source.setup_table('source', source_data)
+
+        dbsync.table_sync_full('source', 'destination', order_by='id')
+
+        destination = self.fake_destination.table('destination')
+
+        # Ranges are read concurrently, so the rows may arrive in any order
+        self.assertEqual(destination.data.num_rows, 20)
+        self.assertEqual(sorted(destination.data['id']), list(range(1, 21)))
+
+    def test_split_key_range(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_workers=3)
+        source_data = Table([{'id': i} for i in range(1, 11)])
+        source_table = self.fake_source.setup_table('source', source_data)
+
+        self.assertEqual(dbsync._split_key_range(source_table, 'id', None),
+                         [(None, 4), (4, 7), (7, None)])
+        self.assertEqual(dbsync._split_key_range(source_table, 'id', 4),
+                         [(4, 6), (6, 8), (8, None)])
+
+        # Only numeric keys can be split
+        self.fake_source.setup_table('letters', Table([{'id': 'a'}, {'id': 'b'}]))
+        self.assertRaises(ValueError, dbsync._split_key_range,
+                          self.fake_source.table('letters'), 'id', None)
+
+    def test_table_sync_full_pipeline(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2,
+                        pipeline=True, queue_size=1)
+        source_data = Table([{'id': i, 'value': i * 10} for i in range(1, 8)])
+        self.fake_source.setup_table('source', source_data)
+
+        stats = dbsync.table_sync_full('source', 'destination', order_by='id')
+
+        destination = self.fake_destination.table('destination')
+
+        # Chunks are read in order by a single reader, so the order is preserved
+        assert_matching_tables(source_data, destination.data)
+
+        self.assertEqual(stats['rows_read'], 7)
+        self.assertEqual(stats['rows_written'], 7)
+        self.assertEqual(stats['chunks_read'], 4)
+        self.assertEqual(stats['chunks_written'], 4)
+        for key in ['read_seconds', 'write_seconds', 'read_wait_seconds',
+                    'write_wait_seconds', 'total_seconds']:
+            self.assertGreaterEqual(stats[key], 0)
+
+    def test_table_sync_full_pipeline_with_retry(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, pipeline=True, retries=2)
+        source_data = Table([
+            {'id': 1, 'value': 11},
+            {'id': 2, 'value': 121142},
+        ])
+        self.fake_source.setup_table('source', source_data)
+
+        # Have the copy fail twice
+        self.fake_destination.setup_table('destination', Table(), failures=2)
+
+        dbsync.table_sync_full('source', 'destination')
+
+        destination = self.fake_destination.table('destination')
+
+        # Make sure all of the data still came through
+        assert_matching_tables(source_data, destination.data)
+
+    def test_table_sync_full_pipeline_without_retry(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, pipeline=True)
+        source_data = Table([
+            {'id': 1, 'value': 11},
+            {'id': 2, 'value': 121142},
+        ])
+        self.fake_source.setup_table('source', source_data)
+
+        # Have the copy fail once
+        self.fake_destination.setup_table('destination', Table(), failures=1)
+
+        # Make sure the sync results in an exception
+        self.assertRaises(ValueError, lambda: dbsync.table_sync_full('source', 'destination'))
@@ -1,7 +1,9 @@
 from parsons import MySQL, Table
 from parsons.databases.mysql.create_table import MySQLCreateTable
+from parsons.databases.mysql.mysql import _load_data_value
 from test.utils import assert_matching_tables
 import unittest
+from unittest import mock
 import os
 
 
@@ -173,11 +175,58 @@ class TestMySQL(unittest.TestCase):  # noqa
     def test_evaluate_table(self):
 
         table_map = [{'name': 'ID', 'type': 'smallint', 'width': 0},
-                     {'name': 'Name', 'type': 'varchar', 'width': 8},
+                     {'name': 'Name', 'type': 'varchar', 'width': 5},
                      {'name': 'Score', 'type': 'float', 'width': 0}]
         self.assertEqual(self.mysql.evaluate_table(self.tbl), table_map)
 
+        # Columns of only nulls are varchars as wide as 'None'
+        tbl = Table([['id', 'empty'], [1, None], [2, None]])
+        self.assertEqual(self.mysql.evaluate_table(tbl)[1],
+                         {'name': 'empty', 'type': 'varchar', 'width': 4})
+
     def test_create_statement(self):
 
-        stmt = "CREATE TABLE test_table ( \n id smallint \n,name varchar(10) \n,score float \n);"
+        stmt = "CREATE TABLE test_table ( \n id smallint \n,name varchar(6) \n,score float \n);"
         self.assertEqual(self.mysql.create_statement(self.tbl, 'test_table'), stmt)
+
+
+# These tests do not interact with the MySQL Database directly, and don't need real credentials
+class TestMySQLCopy(unittest.TestCase):
+
+    def setUp(self):
+
+        self.mysql = MySQL(username='test', password='test', host='test', db='test')
+        self.tbl = Table([['id', 'name'],
+                          [1, "O'Brady"],
+                          [2, 'tab\there'],
+                          [3, None]])
+
+    def test_insert_batches(self):
+
+        # Fixed number of rows per batch
+        batches = list(self.mysql._insert_batches(self.tbl, chunk_size=2))
+        self.assertEqual(batches, [[(1, "O'Brady"), (2, 'tab\there')], [(3, None)]])
+
+        # Batches sized by bytes
+        batches = list(self.mysql._insert_batches(self.tbl, max_bytes=26))
+        self.assertEqual([len(batch) for batch in batches], [1, 2])
+
+    def test_insert_rows(self):
+
+        connection = mock.MagicMock()
+        cursor = connection.cursor.return_value
+        self.mysql._max_allowed_packet = mock.MagicMock(return_value=64 * 1024 * 1024)
+
+        num_rows = self.mysql._insert_rows(self.tbl, 'test', connection)
+
+        self.assertEqual(num_rows, 3)
+        sql, rows = cursor.executemany.call_args[0]
+        self.assertIn('VALUES (%s,%s)', sql)
+        self.assertEqual(rows, [(1, "O'Brady"), (2, 'tab\there'), (3, None)])
+
+    def test_load_data_value(self):
+
+        self.assertEqual(_load_data_value(None), '\\N')
+        self.assertEqual(_load_data_value(True), '1')
+        self.assertEqual(_load_data_value(1.5), '1.5')
+        self.assertEqual(_load_data_value('a\tb\\c\nd'), 'a\\tb\\\\c\\nd')
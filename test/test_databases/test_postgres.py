@@ -222,6 +222,11 @@ class TestPostgresDB(unittest.TestCase):
         tbl = self.pg.query(f"select count(*) from {self.temp_schema}.test_copy")
         self.assertEqual(tbl.first, 6)
 
+        # Copy table through a temp CSV file rather than streaming it.
+        self.pg.copy(self.tbl, f'{self.temp_schema}.test_copy', if_exists='append', stream=False)
+        tbl = self.pg.query(f"select count(*) from {self.temp_schema}.test_copy")
+        self.assertEqual(tbl.first, 9)
+
         # Try to copy the table and ensure that default fail works.
         self.assertRaises(ValueError, self.pg.copy, self.tbl, f'{self.temp_schema}.test_copy')
 
@@ -1,13 +1,23 @@
+import itertools
 import unittest
+from unittest import mock
 import petl
 import os
 import shutil
 
 from parsons import Table
+from parsons.etl.joins import HashJoinView
+from parsons.etl.parallel import parallel_convert
+from parsons.etl.profiler import profile_table
 from test.utils import assert_matching_tables
 from parsons.utilities import zip_archive
 
 
+def _sum_ab(row):
+    # Module level, so it can be pickled and sent to worker processes
+    return row['a'] + row.b
+
+
 # Notes :
 # - The `Table.to_postgres()` test is housed in the Postgres tests
 # - The `Table.from_postgres()` test is housed in the Postgres test
@@ -81,6 +91,25 @@ class TestParsonsTable(unittest.TestCase):
 
         assert_matching_tables(self.tbl, tbl_materialized)
 
+    def test_materialize_columnar(self):
+        # Test that values and their types survive columnar storage
+        rows = [['int', 'float', 'str', 'mixed', 'null'],
+                [1, 1.5, 'a', 1, None],
+                [None, None, None, 'b', None],
+                [2 ** 70, 2.5, 'a', [1], None],
+                [-3, 0.0, 'b']]
+        tbl = Table(rows)
+        tbl.materialize(columnar=True)
+
+        expected = Table(rows)
+        expected.materialize()
+        self.assertEqual(list(tbl.data), list(expected.data)[:3] + [(-3, 0.0, 'b', None, None)])
+        self.assertEqual(tbl.num_rows, 4)
+        self.assertEqual(tbl.column_data('str'), ['a', None, 'a', 'b'])
+        for column in ['int', 'float', 'str', 'null']:
+            self.assertEqual(tbl.get_column_max_width(column),
+                             expected.get_column_max_width(column))
+
     def test_materialize_to_file(self):
         # Simple test that materializing doesn't change the table
         tbl_materialized = Table(self.lst_dicts)
@@ -88,6 +117,13 @@ class TestParsonsTable(unittest.TestCase):
 
         assert_matching_tables(self.tbl, tbl_materialized)
 
+        # A file at a given path can still be read with petl
+        path = 'tmp/materialized.pickle'
+        tbl_materialized = Table(self.lst_dicts)
+        self.assertEqual(tbl_materialized.materialize_to_file(path), path)
+        assert_matching_tables(self.tbl, tbl_materialized)
+        assert_matching_tables(self.tbl, Table(petl.frompickle(path)))
+
     def test_empty_column(self):
         # Test that returns True on an empty column and False on a populated one.
 
@@ -105,6 +141,45 @@ class TestParsonsTable(unittest.TestCase):
 
         self.assertEqual(tbl[0], {'col1': 1, 'col2': 'a'})
 
+    def test_from_pages(self):
+
+        requested = []
+
+        def pages():
+            for page in [[{'a': 1}, {'a': 2, 'b': 'x'}], [{'b': 'y'}]]:
+                requested.append(page)
+                yield page
+
+        # Nothing is requested until the table is read
+        tbl = Table.from_pages(pages(), spill_threshold=2)
+        self.assertEqual(requested, [])
+
+        expected = Table([{'a': 1, 'b': None}, {'a': 2, 'b': 'x'}, {'a': None, 'b': 'y'}])
+        assert_matching_tables(tbl, expected)
+        self.assertTrue(tbl.table.spilled)
+        self.assertEqual(tbl.num_rows, 3)
+
+        # Reading the table again doesn't consume the pages again
+        assert_matching_tables(tbl, expected)
+        self.assertEqual(len(requested), 2)
+
+        # Empty
+        self.assertEqual(Table.from_pages(iter([])).num_rows, 0)
+
+        # A failed page request is raised again by every later read, rather than returning
+        # the pages read before it
+        def failing_pages():
+            yield [{'a': 1}, {'a': 2}]
+            raise ValueError('boom')
+
+        for spill_threshold in [None, 1]:
+            tbl = Table.from_pages(failing_pages(), spill_threshold=spill_threshold)
+            for _ in range(2):
+                with self.assertRaisesRegex(ValueError, 'boom'):
+                    tbl.num_rows
+                with self.assertRaisesRegex(ValueError, 'boom'):
+                    list(tbl.table)
+
     # Removing this test since it is an optional dependency.
     """
     def test_from_datafame(self):
@@ -370,6 +445,134 @@ class TestParsonsTable(unittest.TestCase):
         self.tbl.convert_table('upper')
         self.assertEqual(self.tbl[0], {'first': 'BOB', 'last': 'SMITH'})
 
+    def test_parallel_workers(self):
+        # Test converting and adding columns in worker processes
+        tbl = Table(self.lst)
+        tbl.add_column('d', _sum_ab, index=1, workers=2)
+        tbl.convert_column(['a', 'c'], str, workers=2)
+        self.assertEqual(tbl.columns, ['a', 'd', 'b', 'c'])
+        self.assertEqual(tbl[0], {'a': '1', 'd': 3, 'b': 2, 'c': '3'})
+        self.assertEqual(tbl.num_rows, 5)
+
+        tbl = Table(self.lst_dicts)
+        tbl.convert_table(str.upper, workers=2)
+        self.assertEqual(tbl[0], {'first': 'BOB', 'last': 'SMITH'})
+
+        # Test that order is kept across many blocks, and short rows are padded
+        rows = [['x', 'y']] + [[i] for i in range(50)]
+        view = parallel_convert(petl.wrap(rows), 'x', abs, workers=3, block_size=4)
+        self.assertEqual(list(view), [('x', 'y')] + [(i, None) for i in range(50)])
+
+        # Test that only a single function is supported
+        self.assertRaises(ValueError, self.tbl.convert_column, 'first', 'upper', workers=2)
+        self.assertRaises(petl.errors.FieldSelectionError, parallel_convert,
+                          petl.wrap(rows), 'z', abs, 2)
+
+    def test_joins(self):
+        left = Table([['id', 'name'], [1, 'Bob'], [2, 'Jane'], [3, 'Mary'], [2, 'Jan']])
+        right = Table([['person_id', 'name', 'van_id'], [2, 'J', 'b'], [1, 'B', 'a'],
+                       [2, 'J2', 'c'], [4, 'X', 'd']])
+
+        for memory_rows in [100, 1]:
+            joined = left.join(right, left_on='id', right_on='person_id',
+                               memory_rows=memory_rows)
+            self.assertEqual(joined.columns, ['id', 'name', 'right_name', 'van_id'])
+            self.assertEqual(sorted(joined.data), [
+                (1, 'Bob', 'B', 'a'), (2, 'Jan', 'J', 'b'), (2, 'Jan', 'J2', 'c'),
+                (2, 'Jane', 'J', 'b'), (2, 'Jane', 'J2', 'c')])
+            self.assertEqual(joined.table.stats, {
+                'left_rows': 4, 'right_rows': 4, 'matched_rows': 3, 'output_rows': 5,
+                'spilled': memory_rows == 1})
+
+            left_joined = left.left_join(right, left_on='id', right_on='person_id',
+                                         memory_rows=memory_rows)
+            self.assertEqual(left_joined.num_rows, 6)
+            self.assertIn((3, 'Mary', None, None), list(left_joined.data))
+
+            anti = left.anti_join(right, left_on='id', right_on='person_id',
+                                  memory_rows=memory_rows)
+            self.assertEqual(anti.columns, ['id', 'name'])
+            self.assertEqual(list(anti.data), [(3, 'Mary')])
+
+            looked_up = left.lookup(right, left_on='id', right_on='person_id',
+                                    memory_rows=memory_rows)
+            self.assertEqual(sorted(looked_up.data), [
+                (1, 'Bob', 'B', 'a'), (2, 'Jan', 'J', 'b'), (2, 'Jane', 'J', 'b'),
+                (3, 'Mary', None, None)])
+
+        # Test that partitions too large for memory are partitioned again
+        big_left = [['id', 'x']] + [[i, i * 2] for i in range(200)]
+        big_right = [['id', 'y']] + [[i, -i] for i in range(0, 200, 2)]
+        build_sizes = []
+        join = HashJoinView._join
+
+        def sized_join(self, build_rows, *args, **kwargs):
+            build_rows = list(build_rows)
+            build_sizes.append(len(build_rows))
+            return join(self, build_rows, *args, **kwargs)
+
+        with mock.patch.object(HashJoinView, '_join', sized_join):
+            joined = HashJoinView(big_left, big_right, ['id'], ['id'], join_type='left',
+                                  memory_rows=5, partitions=4)
+            self.assertEqual(sorted(itertools.islice(iter(joined), 1, None)), [
+                (i, i * 2, -i if i % 2 == 0 else None) for i in range(200)])
+
+        self.assertEqual(sum(build_sizes), 100)
+        self.assertLessEqual(max(build_sizes), 5)
+
+        # Test building on the left table when only it fits in memory
+        joined = left.select_rows(lambda row: row.name != 'Jan').join(
+            right, left_on='id', right_on='person_id', memory_rows=3)
+        self.assertEqual(sorted(joined.data), [
+            (1, 'Bob', 'B', 'a'), (2, 'Jane', 'J', 'b'), (2, 'Jane', 'J2', 'c')])
+        self.assertEqual(joined.table.stats['matched_rows'], 2)
+        self.assertFalse(joined.table.stats['spilled'])
+
+        # Test joining on multiple columns with the same names
+        tbl = Table([['a', 'b', 'c'], [1, 2, 3], [1, 3, 4]])
+        other = Table([['a', 'b', 'd'], [1, 3, 'x']])
+        self.assertEqual(list(tbl.join(other, on=['a', 'b']).data), [(1, 3, 4, 'x')])
+
+        self.assertRaises(ValueError, tbl.join, other)
+
+    def test_deduplicate(self):
+        header = ['email', 'name']
+        rows = [['a', 1], ['b', 2], ['a', 3], ['c', 4], ['b', 5], ['d', 6]]
+
+        for kwargs in [{}, {'memory_rows': 2}, {'approximate': True}]:
+            tbl = Table([header] + rows).deduplicate('email', **kwargs)
+            self.assertEqual(sorted(tbl.data), [('a', 1), ('b', 2), ('c', 4), ('d', 6)])
+            self.assertEqual(tbl.table.stats['duplicates'], 2)
+            self.assertEqual(tbl.table.stats['spilled'], kwargs.get('memory_rows') == 2)
+
+            tbl = Table([header] + rows).deduplicate('email', keep='last', **kwargs)
+            self.assertEqual(sorted(tbl.data), [('a', 3), ('b', 5), ('c', 4), ('d', 6)])
+
+        # Test that order is kept when the keys fit in memory
+        tbl = Table([header] + rows).deduplicate('email')
+        self.assertEqual(tbl.column_data('name'), [1, 2, 4, 6])
+        tbl = Table([header] + rows).deduplicate('email', approximate=True, keep='last')
+        self.assertEqual(tbl.column_data('name'), [3, 4, 5, 6])
+
+        # Test that the bloom filter is sized without counting the table up front
+        with mock.patch('petl.nrows', wraps=petl.nrows) as nrows:
+            tbl = Table([header] + rows).select_rows(lambda row: row.name > 1)
+            tbl.deduplicate('email', approximate=True)
+            self.assertIsNone(tbl.table.expected_rows)
+            self.assertEqual(list(tbl.data), [('b', 2), ('a', 3), ('c', 4), ('d', 6)])
+            self.assertEqual(tbl.table.expected_rows, 5)
+            nrows.assert_not_called()
+
+        # From a known row count, or a given one
+        tbl = Table([header] + rows).deduplicate('email', approximate=True)
+        self.assertEqual(tbl.table.expected_rows, 6)
+        tbl = Table([header] + rows).deduplicate('email', approximate=True, expected_rows=100)
+        self.assertEqual(tbl.table.expected_rows, 100)
+
+        # Test deduplicating on every column
+        tbl = Table([header, ['a', 1], ['a', 1], ['a', 2]]).deduplicate()
+        self.assertEqual(list(tbl.data), [('a', 1), ('a', 2)])
+
     def test_coalesce_columns(self):
         # Test coalescing into an existing column
         test_raw = [
@@ -535,6 +738,54 @@ class TestParsonsTable(unittest.TestCase):
         tbl_keep.long_table(['id'], 'tag', retain_original=True)
         self.assertEqual(tbl_keep.columns, ['id', 'tag'])
 
+    def test_long_table_with_dicts(self):
+
+        # Test that dicts are unpacked, including keys first seen after the sample
+        tbl = Table([{'id': 1, 'tag': [{'a': 1}, {'b': 2}]}, {'id': 2, 'tag': [{'c': 3}]}])
+        lt = tbl.long_table('id', 'tag', key_rename={'id': 'person_id'})
+        self.assertEqual(lt.columns, ['person_id', 'tag_a', 'tag_b', 'tag_c'])
+        self.assertEqual(list(lt.data), [(1, 1, None, None), (1, None, 2, None),
+                                         (2, None, None, 3)])
+
+    def test_flatten(self):
+
+        tbl = Table([
+            {'id': 1, 'address': {'city': 'Austin', 'geo': {'lat': 30}}, 'name': 'Jane',
+             'emails': [{'type': 'home', 'labels': ['a', 'b']}, {'type': 'work'}]},
+            {'id': 2, 'address': None, 'name': 'Bob', 'emails': ['bob@gmail.com']},
+            {'id': 3, 'address': {'zip': '78701'}, 'name': 'Mary', 'emails': None}])
+
+        children = tbl.flatten('id', sample_size=2)
+
+        # Test that keys first seen after the sample are added at the end
+        self.assertEqual(tbl.columns, ['id', 'address_city', 'address_geo_lat', 'name',
+                                       'address_zip'])
+        self.assertEqual(list(tbl.data), [(1, 'Austin', 30, 'Jane', None),
+                                          (2, None, None, 'Bob', None),
+                                          (3, None, None, 'Mary', '78701')])
+
+        self.assertEqual(sorted(children), ['emails', 'emails_labels'])
+        self.assertEqual(children['emails'].columns, ['id', 'emails_index', 'type', 'value'])
+        self.assertEqual(list(children['emails'].data), [
+            (1, 0, 'home', None), (1, 1, 'work', None), (2, 0, None, 'bob@gmail.com')])
+        self.assertEqual(list(children['emails_labels'].table), [
+            ('id', 'emails_index', 'emails_labels_index', 'value'),
+            (1, 0, 0, 'a'), (1, 0, 1, 'b')])
+
+        # Test that item fields with the same name as a key don't replace it
+        tbl = Table([{'id': 1, 'emails': [{'id': 55, 'address': 'a@x'}]}])
+        children = tbl.flatten('id')
+        self.assertEqual(list(children['emails'].table), [
+            ('id', 'emails_index', 'emails_id', 'address'), (1, 0, 55, 'a@x')])
+
+        # Test that lists directly within lists are named
+        tbl = Table([{'id': 1, 'm': [[1, 2], [3]]}])
+        children = tbl.flatten('id')
+        self.assertEqual(sorted(children), ['m', 'm_value'])
+        self.assertEqual(list(children['m_value'].table), [
+            ('id', 'm_index', 'm_value_index', 'value'),
+            (1, 0, 0, 1), (1, 0, 1, 2), (1, 1, 0, 3)])
+
     def test_rows(self):
         # Test that there is only one row in the table
         self.assertEqual(self.tbl.num_rows, 1)
@@ -608,6 +859,24 @@ class TestParsonsTable(unittest.TestCase):
         # Assert last table is 99
         self.assertEqual(99, chunks[4].num_rows)
 
+    def test_iter_chunks(self):
+
+        # The table is only read once, no matter how many chunks there are
+        reads = []
+        test_table = Table(petl.randomtable(3, 499, seed=42))
+        test_table.table = test_table.table.addfield('read', lambda row: reads.append(1))
+
+        chunks = test_table.iter_chunks(100)
+        first = next(chunks)
+        self.assertEqual(first.columns, ['f0', 'f1', 'f2', 'read'])
+        self.assertEqual([c.num_rows for c in chunks], [100, 100, 100, 99])
+        self.assertEqual(len(reads), 499)
+
+        # Chunks match the original rows
+        assert_matching_tables(first, Table(petl.head(test_table.table, 100)))
+
+        self.assertEqual(list(Table([['a']]).iter_chunks(10)), [])
+
     def test_match_columns(self):
         raw = [
             {'first name': 'Mary', 'LASTNAME': 'Nichols', 'Middle__Name': 'D'},
@@ -762,6 +1031,62 @@ class TestParsonsTable(unittest.TestCase):
         # Evaluates based on byte length rather than char length
         self.assertEqual(tbl.get_column_max_width('c'), 33)
 
+    def test_num_rows(self):
+
+        with mock.patch('petl.nrows', wraps=petl.nrows) as nrows:
+            # Known without counting for tables built from lists
+            tbl = Table([['a', 'b'], [1, 2], [3, 4], [5, 6]])
+            self.assertEqual(tbl.num_rows, 3)
+            self.assertEqual(Table([{'a': 1}]).num_rows, 1)
+            self.assertEqual(Table().num_rows, 0)
+
+            # And for transformations that don't change the number of rows
+            tbl.convert_column('a', str).add_column('c', 1).rename_column('b', 'd')
+            self.assertEqual(tbl.num_rows, 3)
+            nrows.assert_not_called()
+
+            # Filtering changes the number of rows, so the table is counted once
+            tbl = tbl.select_rows(lambda row: row.d > 2)
+            self.assertEqual(tbl.num_rows, 2)
+            tbl.add_column('e', 1)
+            self.assertEqual(tbl.num_rows, 2)
+            self.assertEqual(nrows.call_count, 1)
+
+    def test_profile(self):
+
+        tbl = Table([['a', 'b', 'c'], [1, 'x', None], [3, 'yz', None], [2, 5, None]])
+
+        profile = tbl.profile()
+        self.assertEqual(profile[0], {'name': 'a', 'type': ['int'], 'null_count': 0,
+                                      'max_width': 1, 'min': 1, 'max': 3, 'distinct_count': 3})
+        self.assertEqual(sorted(profile[1]['type']), ['int', 'str'])
+        # Mixed types can't be compared
+        self.assertEqual((profile[1]['min'], profile[1]['max']), (None, None))
+        self.assertEqual(profile[1]['max_width'], 2)
+        self.assertEqual(profile[2]['null_count'], 3)
+        self.assertEqual(profile[2]['distinct_count'], 0)
+
+        # The profile is cached and shared until the table changes
+        with mock.patch('parsons.etl.etl.profile_table', wraps=profile_table) as profiler:
+            tbl.get_columns_type_stats()
+            tbl.get_column_max_width('b')
+            self.assertTrue(tbl.empty_column('c'))
+            profiler.assert_not_called()
+
+            # The helpers only need a light profile, without min, max or distinct counts
+            tbl.fillna_column('c', 'z')
+            self.assertFalse(tbl.empty_column('c'))
+            self.assertEqual(tbl.get_column_types('c'), ['str'])
+            self.assertEqual(profiler.call_count, 1)
+            profiler.assert_called_with(tbl.table, full=False)
+            self.assertNotIn('distinct_count', tbl._column_profile('c'))
+
+            # Which is upgraded to a full profile when one is asked for
+            self.assertEqual(tbl.profile()[2]['distinct_count'], 1)
+            self.assertEqual(profiler.call_count, 2)
+            tbl.get_column_max_width('c')
+            self.assertEqual(profiler.call_count, 2)
+
     def test_sort(self):
 
         # Test basic sort
@@ -779,6 +1104,16 @@ class TestParsonsTable(unittest.TestCase):
         sorted_tbl = unsorted_tbl.sort(reverse=True)
         self.assertEqual(sorted_tbl[0], {'a': 3, 'b': 1})
 
+        # Test sorting in runs on disk matches petl's sort, including None values
+        rows = [[i % 7 or None, i % 3, i] for i in range(40)]
+        for reverse in [False, True]:
+            expected = list(petl.sort([['a', 'b', 'c']] + rows, ['a', 'b'], reverse=reverse))
+            for workers in [None, 2]:
+                tbl = Table([['a', 'b', 'c']] + rows).sort(
+                    ['a', 'b'], reverse=reverse, memory_rows=6, workers=workers)
+                self.assertEqual(list(tbl.table), expected)
+                self.assertTrue(tbl.table.spilled)
+
     def test_set_header(self):
 
         # Rename columns
@@ -142,6 +142,39 @@ class TestGoogleBigQuery(unittest.TestCase):
             bq.copy(self.default_table, 'dataset.table', tmp_gcs_bucket=self.tmp_gcs_bucket,
                     if_exists='foo', gcs_client=gcs_client)
 
+    def test_copy__avro(self):
+        gcs_client = self._build_mock_cloud_storage_client()
+        staged = []
+        gcs_client.put_blob_stream.side_effect = (
+            lambda bucket, blob, parts, content_type: staged.append(b''.join(parts)))
+        bq = self._build_mock_client_for_copying(table_exists=False)
+
+        bq.copy(self.default_table, 'dataset.table', tmp_gcs_bucket=self.tmp_gcs_bucket,
+                gcs_client=gcs_client, source_format='avro')
+
+        # The table is streamed to GCS as an Avro file, rather than uploaded as a CSV
+        self.assertEqual(gcs_client.upload_table.call_count, 0)
+        tmp_blob_name = gcs_client.put_blob_stream.call_args[0][1]
+        self.assertTrue(staged[0].startswith(b'Obj\x01'))
+
+        load_call_args = bq.client.load_table_from_uri.call_args
+        self.assertEqual(load_call_args[0][0], f'gs://{self.tmp_gcs_bucket}/{tmp_blob_name}')
+        job_config = load_call_args[1]['job_config']
+        self.assertEqual(job_config.source_format, bigquery.SourceFormat.AVRO)
+        self.assertIsNone(job_config.schema)
+
+        gcs_client.delete_blob.assert_called_once_with(self.tmp_gcs_bucket, tmp_blob_name)
+
+        # Columns that can't be Avro field names are staged as CSV
+        gcs_client = self._build_mock_cloud_storage_client()
+        bq.copy(Table([{'first name': 'Jim'}]), 'dataset.table',
+                tmp_gcs_bucket=self.tmp_gcs_bucket, gcs_client=gcs_client, source_format='avro')
+        self.assertEqual(gcs_client.upload_table.call_count, 1)
+
+        with self.assertRaises(ValueError):
+            bq.copy(self.default_table, 'dataset.table', tmp_gcs_bucket=self.tmp_gcs_bucket,
+                    gcs_client=gcs_client, source_format='parquet')
+
     def _build_mock_client_for_querying(self, results):
         # Create a mock that will play the role of the cursor
         cursor = mock.MagicMock()
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 from parsons import GoogleCloudStorage, Table
 from test.utils import assert_matching_tables
 from parsons.utilities import files
@@ -116,3 +117,33 @@ class TestGoogleStorageBuckets(unittest.TestCase):
         url = self.cloud.get_url(TEMP_BUCKET_NAME, file_name)
         download_tbl = Table.from_csv(url)
         assert_matching_tables(input_tbl, download_tbl)
+
+
+class TestGoogleStorageStreaming(unittest.TestCase):
+
+    def setUp(self):
+
+        os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = 'foo'
+        with mock.patch('parsons.google.google_cloud_storage.storage.Client'):
+            self.cloud = GoogleCloudStorage()
+
+    def failing_parts(self):
+        yield b'a,b\n'
+        raise ValueError('Encoding failed')
+
+    @mock.patch('parsons.google.google_cloud_storage.storage.Blob')
+    def test_put_blob_stream__error(self, blob):
+
+        # Older releases finish the upload when the writer closes, so the blob is removed
+        writer = mock.MagicMock(spec=['write', 'close', '__enter__', '__exit__'])
+        blob.return_value.open.return_value = writer
+        with self.assertRaisesRegex(ValueError, 'Encoding failed'):
+            self.cloud.put_blob_stream('bucket', 'blob.csv', self.failing_parts())
+        blob.return_value.delete.assert_called_once()
+
+        # Newer releases cancel the upload, so an existing blob is left alone
+        blob.reset_mock()
+        blob.return_value.open.return_value = mock.MagicMock()
+        with self.assertRaisesRegex(ValueError, 'Encoding failed'):
+            self.cloud.put_blob_stream('bucket', 'blob.csv', self.failing_parts())
+        blob.return_value.delete.assert_not_called()
@@ -1,3 +1,4 @@
+import datetime
 import unittest
 import requests_mock
 from test.utils import assert_matching_tables
@@ -68,6 +69,33 @@ class TestHustle(unittest.TestCase):
         ids = self.hustle.create_leads(tbl, group_id='cMCH0hxwGt')
         assert_matching_tables(ids, Table(expected_json.leads['items']))
 
+        # An expired token is refreshed once, not by every thread
+        m.post(HUSTLE_URI + 'oauth/token', json=expected_json.auth_token)
+        self.hustle.token_expiration = datetime.datetime.now()
+        self.hustle.create_leads(tbl, group_id='cMCH0hxwGt')
+        token_requests = [r for r in m.request_history if r.url.endswith('oauth/token')]
+        self.assertEqual(len(token_requests), 1)
+
+    @requests_mock.Mocker()
+    def test_create_leads_errors(self, m):
+
+        m.post(HUSTLE_URI + 'groups/cMCH0hxwGt/leads', [
+            {'json': expected_json.leads_tbl_01},
+            {'json': {'error': 'Invalid phone number'}, 'status_code': 400}])
+
+        tbl = Table([['phone_number', 'ln', 'first_name'],
+                     ['4435705355', 'Warren', 'Elizabeth'],
+                     ['0', 'Obama', 'Barack']])
+
+        # The failed row is skipped
+        ids = self.hustle.create_leads(tbl, group_id='cMCH0hxwGt', max_workers=1,
+                                       raise_on_error=False)
+        self.assertEqual(ids.num_rows, 1)
+
+        # Or raises after every row has been tried
+        m.post(HUSTLE_URI + 'groups/cMCH0hxwGt/leads', status_code=400, json={})
+        self.assertRaises(ValueError, self.hustle.create_leads, tbl, group_id='cMCH0hxwGt')
+
     @requests_mock.Mocker()
     def test_update_lead(self, m):
 
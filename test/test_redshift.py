@@ -1,10 +1,14 @@
 from parsons import Redshift, S3, Table
+from parsons.utilities import files
 from test.utils import assert_matching_tables
 import unittest
 import os
 import re
 from test.utils import validate_list
 from testfixtures import LogCapture
+from unittest import mock
+import gzip
+import json
 
 # The name of the schema and will be temporarily created for the tests
 TEMP_SCHEMA = 'parsons_test2'
@@ -157,6 +161,11 @@ class TestRedshift(unittest.TestCase):
         exp_sql = """create table tmc.test (\n  "id" int,\n  "name" varchar(5)) \ndistkey(ID) ;"""  # noqa: E501
         self.assertEqual(sql, exp_sql)
 
+        # Columns of only nulls are varchars as wide as 'None'
+        tbl = Table([['id', 'empty'], [1, None], [2, None]])
+        sql = self.rs.create_statement(tbl, 'tmc.test', distkey='id')
+        self.assertIn('"empty" varchar(4)', sql)
+
         # Assert that an error is raised by an empty table
         empty_table = Table([['Col_1', 'Col_2']])
         self.assertRaises(ValueError, self.rs.create_statement, empty_table, 'tmc.test')
@@ -188,6 +197,123 @@ class TestRedshift(unittest.TestCase):
                    'aws_secret_access_key=*HIDDEN*\'', s)
         return s
 
+    def test_temp_s3_copy_sliced(self):
+
+        self.rs.s3_temp_bucket = 'temp-bucket'
+        tbl = Table([['id', 'name']] + [[i, f'name {i}'] for i in range(25)])
+
+        # Capture the contents of each file as it is "uploaded"
+        uploaded = {}
+
+        def put_file(bucket, key, local_path):
+            with open(local_path, 'rb') as f:
+                uploaded[key] = f.read()
+
+        with mock.patch('parsons.databases.redshift.rs_copy_table.S3') as s3, \
+                mock.patch('parsons.databases.redshift.rs_copy_table.SLICE_BLOCK_ROWS', 10):
+            s3.return_value.put_file.side_effect = put_file
+            keys = self.rs.temp_s3_copy_sliced(tbl, 4, max_workers=2)
+
+        # The 25 rows make three blocks, so only three of the four parts get rows
+        manifest_key, part_keys = keys[0], keys[1:]
+        self.assertEqual(len(part_keys), 3)
+
+        manifest = json.loads(uploaded[manifest_key])
+        self.assertEqual([entry['url'] for entry in manifest['entries']],
+                         [f's3://temp-bucket/{key}' for key in part_keys])
+
+        rows = []
+        for key in part_keys:
+            lines = gzip.decompress(uploaded[key]).decode('utf-8').splitlines()
+            self.assertEqual(lines[0], 'id,name')
+            rows.extend(lines[1:])
+
+        self.assertEqual(sorted(rows), sorted(f'{i},name {i}' for i in range(25)))
+
+    def test_temp_s3_copy_sliced_upload_error(self):
+
+        self.rs.s3_temp_bucket = 'temp-bucket'
+        tbl = Table([['id', 'name']] + [[i, f'name {i}'] for i in range(25)])
+
+        # One of the parts fails to upload
+        def put_file(bucket, key, local_path):
+            if key.endswith('part_0001.csv.gz'):
+                raise ValueError('Upload failed')
+
+        with mock.patch('parsons.databases.redshift.rs_copy_table.S3') as s3, \
+                mock.patch('parsons.databases.redshift.rs_copy_table.SLICE_BLOCK_ROWS', 10), \
+                mock.patch('parsons.databases.redshift.rs_copy_table.files'
+                           '.cleanup_temp_directory') as cleanup:
+            s3.return_value.put_file.side_effect = put_file
+            with self.assertRaises(ValueError):
+                self.rs.temp_s3_copy_sliced(tbl, 4, max_workers=2)
+
+        # The parts that were uploaded are removed, along with the local parts
+        bucket, removed = s3.return_value.remove_files.call_args[0]
+        self.assertEqual(bucket, 'temp-bucket')
+        self.assertEqual(sorted(key.rsplit('/', 1)[1] for key in removed),
+                         ['part_0000.csv.gz', 'part_0002.csv.gz'])
+        cleanup.assert_called_once()
+
+    def test_query_via_unload(self):
+
+        self.rs.s3_temp_bucket = 'temp-bucket'
+
+        # The unloaded parts, as Redshift writes them with ADDQUOTES and ESCAPE
+        parts = {
+            'part_00.gz': b'"id"|"name"\n"1"|"Jim"\n"2"|"Pipe\\|Quote\\""\n',
+            'part_01.gz': b'"id"|"name"\n"3"|""\n',
+            'part_02.gz': b'"id"|"name"\n',
+            'part_03.gz': b'',
+        }
+        paths = []
+        for key, data in parts.items():
+            path = files.create_temp_file(suffix='.gz')
+            with open(path, 'wb') as f:
+                f.write(gzip.compress(data))
+            paths.append(path)
+
+        with mock.patch('parsons.databases.redshift.redshift.S3') as s3, \
+                mock.patch.object(self.rs, 'unload') as unload:
+            s3.return_value.get_file.return_value = files.string_to_temp_file(json.dumps({
+                'entries': [{'url': f's3://temp-bucket/prefix/{key}'} for key in parts]}))
+            s3.return_value.get_files.return_value = paths
+
+            tbl = self.rs.query('select * from test', via_unload=True)
+
+            unload.assert_called_once()
+            key_prefix = unload.call_args[0][2]
+            s3.return_value.remove_files.assert_called_once_with(
+                'temp-bucket', [f'{key_prefix}manifest'] + [f'prefix/{key}' for key in parts])
+
+        assert_matching_tables(tbl, Table([['id', 'name'], ['1', 'Jim'],
+                                           ['2', 'Pipe|Quote"'], ['3', '']]))
+
+        # If no part has any rows, there is no table
+        with mock.patch('parsons.databases.redshift.redshift.S3') as s3, \
+                mock.patch.object(self.rs, 'unload'):
+            s3.return_value.get_file.return_value = files.string_to_temp_file(json.dumps({
+                'entries': [{'url': f's3://temp-bucket/prefix/{key}'}
+                            for key in ['part_02.gz', 'part_03.gz']]}))
+            s3.return_value.get_files.return_value = paths[2:]
+
+            self.assertIsNone(self.rs.query('select * from test', via_unload=True))
+
+        # If the manifest can't be read, every file under the prefix is removed
+        with mock.patch('parsons.databases.redshift.redshift.S3') as s3, \
+                mock.patch.object(self.rs, 'unload') as unload:
+            s3.return_value.get_file.side_effect = ValueError('Missing manifest')
+            s3.return_value.list_keys.return_value = {'prefix/part_00.gz': {},
+                                                      'prefix/part_01.gz': {}}
+
+            with self.assertRaisesRegex(ValueError, 'Missing manifest'):
+                self.rs.query('select * from test', via_unload=True)
+
+            key_prefix = unload.call_args[0][2]
+            s3.return_value.list_keys.assert_called_once_with('temp-bucket', prefix=key_prefix)
+            s3.return_value.remove_files.assert_called_once_with(
+                'temp-bucket', ['prefix/part_00.gz', 'prefix/part_01.gz'])
+
     def test_copy_statement_default(self):
 
         sql = self.rs.copy_statement('test_schema.test', 'buck', 'file.csv',
@@ -423,6 +549,12 @@ class TestRedshiftDB(unittest.TestCase):
         # Copy to the same table, to verify that the "drop" flag works.
         self.rs.copy(self.tbl, f'{self.temp_schema}.test_copy', if_exists='drop')
 
+        # Copy the table staged in slices
+        self.rs.copy(self.tbl, f'{self.temp_schema}.test_copy', if_exists='truncate',
+                     slices='auto')
+        rows = self.rs.query(f"select count(*) from {self.temp_schema}.test_copy")
+        self.assertEqual(rows[0]['count'], 3)
+
         # Verify that a warning message prints when a DIST/SORT key is omitted
         with LogCapture() as lc:
             self.rs.copy(
@@ -504,6 +636,15 @@ class TestRedshiftDB(unittest.TestCase):
         # Check that files are there
         self.assertTrue(self.s3.key_exists(self.temp_s3_bucket, 'unload_test'))
 
+    def test_query_via_unload(self):
+
+        self.rs.copy(self.tbl, f'{self.temp_schema}.test_copy', if_exists='drop')
+
+        tbl = self.rs.query(f'select * from {self.temp_schema}.test_copy where name != %s',
+                            parameters=['Jim'], via_unload=True)
+        self.assertEqual(tbl.columns, ['id', 'name'])
+        self.assertEqual(sorted(tbl['name']), ['John', 'Sarah'])
+
     def test_to_from_redshift(self):
 
         # Test the parsons table methods
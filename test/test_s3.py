@@ -1,8 +1,12 @@
 import unittest
+import gzip
+import io
 import os
+from unittest import mock
 from datetime import datetime
 import pytz
 from parsons import S3, Table
+from parsons.aws.s3_stream import S3CSVView, _ChunkReader
 import urllib
 import time
 from test.utils import assert_matching_tables
@@ -134,6 +138,19 @@ class TestS3(unittest.TestCase):
         result_tbl = Table.from_csv(path)
         assert_matching_tables(self.tbl, result_tbl)
 
+    def test_put_stream(self):
+
+        # Random values barely compress, so this is uploaded in more than one part
+        tbl = Table([{'id': str(i), 'name': os.urandom(100).hex()} for i in range(150000)])
+        tbl.to_s3_csv(self.test_bucket, 'stream.csv.gz')
+
+        # Multipart uploads have an ETag ending in the number of parts
+        etag = self.s3.client.head_object(Bucket=self.test_bucket, Key='stream.csv.gz')['ETag']
+        self.assertRegex(etag, r'-\d+"$')
+
+        path = self.s3.get_file(self.test_bucket, 'stream.csv.gz')
+        assert_matching_tables(tbl, Table.from_csv(path))
+
     def test_get_url(self):
 
         # Test that you can download from URL
@@ -173,3 +190,178 @@ class TestS3(unittest.TestCase):
         result_tbl_2 = Table.from_csv(path_2)
         assert_matching_tables(self.tbl_2, result_tbl_2)
         self.assertFalse(self.s3.key_exists(self.test_bucket, self.test_key_2))
+
+    def test_from_s3_csv_stream(self):
+
+        self.tbl.to_s3_csv(self.test_bucket, 'stream.csv.gz')
+        tbl = Table.from_s3_csv(self.test_bucket, 'stream.csv.gz', stream=True)
+        assert_matching_tables(self.tbl, tbl)
+
+
+class TestS3Streaming(unittest.TestCase):
+
+    def setUp(self):
+
+        self.s3 = S3(aws_access_key_id='key', aws_secret_access_key='secret')
+        self.s3.client = mock.MagicMock()
+        self.objects = {
+            'a.csv': b'first,last\r\nBob,Smith\r\nJane,Doe\r\n',
+            'b.csv.gz': gzip.compress(b'first,last\r\nJim\r\n'),
+            'c.csv': b'',
+        }
+
+        def get_object(Bucket, Key, Range):
+            start, end = map(int, Range[len('bytes='):].split('-'))
+            return {'Body': io.BytesIO(self.objects[Key][start:end + 1])}
+
+        self.s3.client.get_object.side_effect = get_object
+        self.s3.client.head_object.side_effect = lambda Bucket, Key: {
+            'ContentLength': len(self.objects[Key])}
+
+    def test_iter_ranges(self):
+
+        objects = [('bucket', 'a.csv'), ('bucket', 'c.csv'), ('bucket', 'b.csv.gz')]
+        ranges = list(self.s3.iter_ranges(objects, range_size=4, prefetch=3))
+
+        # Ranges come back in order, and join up into each object
+        self.assertEqual([index for index, _ in ranges][0], 0)
+        for index, (_, key) in enumerate(objects):
+            data = b''.join(data for i, data in ranges if i == index)
+            self.assertEqual(data, self.objects[key])
+
+    def test_chunk_reader(self):
+
+        # Reads smaller than a chunk are served from it in turn, and empty chunks are skipped
+        reader = _ChunkReader(iter([b'abcdefgh', b'', b'ij']))
+        buffer = bytearray(3)
+        reads = []
+        while True:
+            size = reader.readinto(buffer)
+            if not size:
+                break
+            reads.append(bytes(buffer[:size]))
+
+        self.assertEqual(reads, [b'abc', b'def', b'gh', b'ij'])
+
+    def test_put_stream(self):
+
+        self.s3.client.create_multipart_upload.return_value = {'UploadId': 'upload'}
+        self.s3.client.upload_part.side_effect = lambda PartNumber, **kwargs: {
+            'ETag': f'etag-{PartNumber}'}
+
+        self.s3.put_stream('bucket', 'key', iter([b'a', b'b', b'c']), workers=2)
+
+        # The parts are numbered from 1, in order, and the upload is completed with them
+        bodies = {call[1]['PartNumber']: call[1]['Body']
+                  for call in self.s3.client.upload_part.call_args_list}
+        self.assertEqual(bodies, {1: b'a', 2: b'b', 3: b'c'})
+        self.s3.client.complete_multipart_upload.assert_called_once_with(
+            Bucket='bucket', Key='key', UploadId='upload',
+            MultipartUpload={'Parts': [{'ETag': f'etag-{i}', 'PartNumber': i}
+                                       for i in range(1, 4)]})
+        self.s3.client.abort_multipart_upload.assert_not_called()
+
+        # A single part is uploaded with a single request
+        self.s3.put_stream('bucket', 'small', [b'a'])
+        self.s3.client.put_object.assert_called_once_with(
+            Bucket='bucket', Key='small', Body=b'a', ACL='bucket-owner-full-control')
+        self.s3.client.create_multipart_upload.assert_called_once()
+
+    def test_put_stream_error(self):
+
+        self.s3.client.create_multipart_upload.return_value = {'UploadId': 'upload'}
+
+        def upload_part(PartNumber, **kwargs):
+            if PartNumber == 2:
+                raise ValueError('Upload failed')
+            return {'ETag': f'etag-{PartNumber}'}
+
+        self.s3.client.upload_part.side_effect = upload_part
+
+        # A failed part aborts the upload
+        with self.assertRaises(ValueError):
+            self.s3.put_stream('bucket', 'key', [b'a', b'b', b'c'], workers=2)
+
+        self.s3.client.abort_multipart_upload.assert_called_once_with(
+            Bucket='bucket', Key='key', UploadId='upload')
+        self.s3.client.complete_multipart_upload.assert_not_called()
+
+    def test_s3_csv_view(self):
+
+        objects = [('bucket', 'a.csv'), ('bucket', 'c.csv'), ('bucket', 'b.csv.gz')]
+        view = S3CSVView(self.s3, objects, range_size=5, prefetch=2)
+
+        # Empty files are skipped, short rows are padded and gzip files are decompressed
+        self.assertEqual(list(view), [('first', 'last'), ('Bob', 'Smith'), ('Jane', 'Doe'),
+                                      ('Jim', None)])
+
+        self.objects['c.csv'] = b'id\r\n1\r\n'
+        with self.assertRaises(ValueError):
+            list(view)
+
+        with self.assertRaises(ValueError):
+            S3CSVView(self.s3, [('bucket', 'd.zip')])
+
+
+class TestS3Concurrency(unittest.TestCase):
+
+    def setUp(self):
+
+        self.s3 = S3(aws_access_key_id='key', aws_secret_access_key='secret')
+        self.s3.client = mock.MagicMock()
+        self.keys = sorted(['a.csv', 'b/1.csv', 'b/2.csv', 'b/3.csv', 'b/A.csv', 'b/_',
+                            'b/~', 'b/é', 'c.csv'])
+
+        def list_objects_v2(Bucket, Prefix='', StartAfter='', ContinuationToken=None):
+            # Pages of two keys, with the token holding the offset of the next page
+            keys = [key for key in self.keys if key.startswith(Prefix) and key > StartAfter]
+            offset = int(ContinuationToken or 0)
+            resp = {'Contents': [{'Key': key, 'LastModified': datetime(2020, 1, 1)}
+                                 for key in keys[offset:offset + 2]]}
+            if offset + 2 < len(keys):
+                resp['NextContinuationToken'] = str(offset + 2)
+            return resp
+
+        self.s3.client.list_objects_v2.side_effect = list_objects_v2
+
+    def test_list_keys_workers(self):
+
+        keys = self.s3.list_keys('bucket', prefix='b/', workers=4)
+        self.assertEqual(list(keys), [key for key in self.keys if key.startswith('b/')])
+        self.assertEqual(list(self.s3.list_keys('bucket', workers=4)), self.keys)
+        self.assertEqual(list(self.s3.list_keys('bucket', suffix='.csv', workers=4)),
+                         list(self.s3.list_keys('bucket', suffix='.csv')))
+
+    def test_remove_files(self):
+
+        keys = [f'key_{i}' for i in range(2500)]
+        self.s3.client.delete_objects.side_effect = lambda Bucket, Delete: (
+            {'Errors': [{'Key': 'key_0', 'Message': 'Access Denied'}]}
+            if Delete['Objects'][0]['Key'] == 'key_0' else {})
+
+        failed = self.s3.remove_files('bucket', keys)
+
+        # Deleted in batches of 1,000 keys
+        batches = [call[1]['Delete']['Objects']
+                   for call in self.s3.client.delete_objects.call_args_list]
+        self.assertEqual(sorted(len(batch) for batch in batches), [500, 1000, 1000])
+        self.assertEqual(failed, ['key_0'])
+
+    def test_transfer_bucket(self):
+
+        # The first copy fails, and is retried
+        self.s3.client.copy.side_effect = [Exception('Slow Down')] + [None] * 7
+
+        with mock.patch('time.sleep'), \
+                mock.patch.object(self.s3, 'list_keys', wraps=self.s3.list_keys) as list_keys:
+            self.s3.transfer_bucket('bucket', 'b/', 'destination', 'new/', remove_original=True,
+                                    workers=2)
+
+        # The keys are listed sequentially unless list_workers is set
+        self.assertEqual(list_keys.call_args[1]['workers'], 1)
+
+        copied = [call[0][2] for call in self.s3.client.copy.call_args_list]
+        self.assertEqual(len(copied), 8)
+        self.assertEqual(sorted(set(copied)), ['new/1.csv', 'new/2.csv', 'new/3.csv',
+                                               'new/A.csv', 'new/_', 'new/~', 'new/é'])
+        self.s3.client.delete_objects.assert_called_once()
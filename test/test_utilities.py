@@ -1,8 +1,15 @@
 import unittest
+import gzip
+import io
+import json
 import os
+import struct
+import zlib
 import pytest
 import shutil
 import datetime
+import time
+import requests_mock
 from unittest import mock
 from parsons import Table
 from parsons.utilities.datetime import date_to_timestamp, parse_date
@@ -10,6 +17,13 @@ from parsons.utilities import files
 from parsons.utilities import check_env
 from parsons.utilities import json_format
 from parsons.utilities import sql_helpers
+from parsons.utilities import spill
+from parsons.utilities import multipart
+from parsons.utilities import avro
+from parsons.utilities.csv_stream import CSVStream
+from parsons.utilities.api_connector import APIConnector
+from parsons.utilities.rate_limiter import TokenBucket
+from parsons.utilities.paginator import paginate, prefetch_pages
 from test.conftest import xfail_value_error
 
 
@@ -110,6 +124,286 @@ def test_empty_file():
     shutil.rmtree('tmp')
 
 
+#
+# Spill file tests
+#
+
+
+def test_spill_round_trip():
+    path = files.create_temp_file()
+
+    with spill.SpillWriter(path, ['id', 'name'], block_size=2) as writer:
+        writer.write_rows([[1, None], [2, 'b']])
+        writer.write_rows([(3, 'c')])
+
+    metadata = spill.read_spill_metadata(path)
+    assert metadata['num_rows'] == 3
+    assert metadata['columns'] == ('id', 'name')
+    assert metadata['column_types'] == {'id': 'int', 'name': 'str'}
+    assert len(metadata['blocks']) == 2
+
+    tbl = Table(spill.fromspill(path))
+    assert tbl.num_rows == 3
+    assert list(tbl.data) == [(1, None), (2, 'b'), (3, 'c')]
+    assert [len(block) for block in tbl.table.blocks()] == [2, 1]
+
+
+def test_spill_empty():
+    path = files.create_temp_file()
+    spill.SpillWriter(path, ['id']).close()
+
+    tbl = Table(spill.fromspill(path))
+    assert tbl.columns == ['id']
+    assert tbl.num_rows == 0
+
+
+def test_spill_invalid_file():
+    path = files.string_to_temp_file('not a spill file', suffix='.txt')
+
+    with pytest.raises(ValueError):
+        spill.read_spill_metadata(path)
+
+
+def test_csv_stream():
+    tbl = Table([['id', 'name'], [1, 'Jim'], [2, 'Sarah, Jr.'], [3, None]])
+
+    # Read in small pieces, so the stream has to encode several chunks
+    stream = CSVStream(tbl.table, chunk_rows=1)
+    pieces = []
+    while True:
+        piece = stream.read(5)
+        if not piece:
+            break
+        pieces.append(piece)
+
+    assert b''.join(pieces) == b'id,name\r\n1,Jim\r\n2,"Sarah, Jr."\r\n3,\r\n'
+    assert stream.num_rows == 3
+
+    # The stream matches the output of to_csv
+    with open(tbl.to_csv(), 'rb') as csv_file:
+        assert CSVStream(tbl.table).read() == csv_file.read()
+
+    # Without a header
+    assert CSVStream(tbl.table, write_header=False).readline() == b'1,Jim\r\n'
+
+
+def test_csv_parts():
+    tbl = Table([{'id': i, 'name': f'name {i}'} for i in range(1000)])
+    with open(tbl.to_csv(), 'rb') as csv_file:
+        expected = csv_file.read()
+
+    # Every part but the last is at least the part size, and they join into the full CSV
+    parts = list(multipart.csv_parts(tbl.table, part_size=1000))
+    assert len(parts) > 1
+    assert all(len(part) >= 1000 for part in parts[:-1])
+    assert b''.join(parts) == expected
+
+    # Gzip parts join into a single gzip file
+    parts = list(multipart.csv_parts(tbl.table, part_size=1000, compression='gzip'))
+    assert gzip.decompress(b''.join(parts)) == expected
+
+    # A table with no rows is still one part
+    assert list(multipart.csv_parts(Table([['id']]).table)) == [b'id\r\n']
+
+    with pytest.raises(ValueError):
+        list(multipart.csv_parts(tbl.table, compression='zip'))
+
+
+def test_upload_parts():
+    uploaded = []
+
+    def upload_part(number, part):
+        # Finish out of order
+        time.sleep(0.01 * (number % 3))
+        uploaded.append(number)
+        return part.upper()
+
+    results = multipart.upload_parts(iter(['a', 'b', 'c', 'd', 'e']), upload_part, workers=2)
+    assert results == ['A', 'B', 'C', 'D', 'E']
+    assert sorted(uploaded) == [1, 2, 3, 4, 5]
+
+    def fail_part(number, part):
+        if number == 2:
+            raise ValueError(part)
+
+    with pytest.raises(ValueError):
+        multipart.upload_parts(iter('abcdefgh'), fail_part, workers=1)
+
+
+def test_prefetch_parts():
+    assert list(multipart.prefetch(iter(range(10)), size=2)) == list(range(10))
+
+    def broken():
+        yield 1
+        raise ValueError()
+
+    parts = multipart.prefetch(broken())
+    assert next(parts) == 1
+    with pytest.raises(ValueError):
+        next(parts)
+
+    # Stopping early doesn't leave the producer waiting
+    parts = multipart.prefetch(iter(range(100)), size=1)
+    assert next(parts) == 0
+    parts.close()
+
+
+def test_avro_parts():
+    tbl = Table([['id', 'name', 'score'], [1, 'a', 1], [None, 'é', 2.5]])
+    data = b''.join(avro.avro_parts(tbl.table))
+
+    def read_long(stream):
+        shift = value = 0
+        while True:
+            byte = stream.read(1)[0]
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return (value >> 1) ^ -(value & 1)
+
+    stream = io.BytesIO(data)
+    assert stream.read(4) == b'Obj\x01'
+    metadata = {}
+    for _ in range(read_long(stream)):
+        key = stream.read(read_long(stream)).decode()
+        metadata[key] = stream.read(read_long(stream))
+    assert read_long(stream) == 0
+    sync = stream.read(16)
+
+    # The schema is inferred from the values, and every field is nullable
+    schema = json.loads(metadata['avro.schema'])
+    assert [(field['name'], field['type']) for field in schema['fields']] == [
+        ('id', ['null', 'long']), ('name', ['null', 'string']), ('score', ['null', 'double'])]
+    assert metadata['avro.codec'] == b'deflate'
+
+    # One block holding both rows, each value prefixed by its union branch
+    assert read_long(stream) == 2
+    block = zlib.decompress(stream.read(read_long(stream)), -15)
+    assert block == (b'\x02\x02' + b'\x02\x02a' + b'\x02' + struct.pack('<d', 1) +
+                     b'\x00' + b'\x02\x04' + 'é'.encode() + b'\x02' + struct.pack('<d', 2.5))
+    assert stream.read() == sync
+
+    assert avro.valid_field_names(['id', '_name2'])
+    assert not avro.valid_field_names(['first name'])
+    assert not avro.valid_field_names(['id', 'id'])
+    with pytest.raises(ValueError):
+        list(avro.avro_parts(Table([['2nd']]).table))
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=1000, capacity=2)
+
+    # The first two tokens are available right away, then callers wait on the refill
+    with mock.patch('time.sleep') as sleep:
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.acquire() > 0
+        sleep.assert_called_once()
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_api_connector_session():
+    api = APIConnector('http://myapi.com/v1', pool_size=4, max_retries=2)
+
+    adapter = api.session.get_adapter('https://myapi.com/v1/')
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+    assert 429 in adapter.max_retries.status_forcelist
+    # Writes are never retried
+    assert 'POST' not in adapter.max_retries.allowed_methods
+    assert 'PUT' not in adapter.max_retries.allowed_methods
+
+    # By default, requests aren't retried
+    default = APIConnector('http://myapi.com/v1').session.get_adapter('http://myapi.com/v1/')
+    assert default.max_retries.total == 0
+
+    # Every request, including pages of a paginated call, goes through the same session
+    with requests_mock.Mocker() as m:
+        m.get('http://myapi.com/v1/things', json={'items': [1]})
+        with mock.patch.object(api.session, 'request', wraps=api.session.request) as request:
+            api.get_request('things')
+            api.get_request('things', params={'page': 2})
+            assert request.call_count == 2
+
+    api.close()
+
+
+def test_concurrent_requests():
+    api = APIConnector('http://myapi.com/v1', rate_limit=1000)
+
+    with requests_mock.Mocker() as m:
+        m.post('http://myapi.com/v1/things/1', json={'id': 1})
+        # Rate limited once, then succeeds
+        m.post('http://myapi.com/v1/things/2', [{'status_code': 429}, {'json': {'id': 2}}])
+        m.post('http://myapi.com/v1/things/3', status_code=400)
+
+        results = api.concurrent_requests(lambda i: api.post_request(f'things/{i}'), [1, 2, 3],
+                                          backoff_factor=0)
+
+        assert results.columns == ['index', 'status', 'error', 'result']
+        assert results['status'] == ['success', 'success', 'error']
+        assert results['result'][:2] == [{'id': 1}, {'id': 2}]
+        assert 'HTTP error occurred (400)' in results[2]['error']
+        assert m.call_count == 4
+
+    assert api.concurrent_requests(lambda i: i, []).num_rows == 0
+
+
+def test_paginate():
+    responses = {1: {'items': [1, 2]}, 2: {'items': [3, 4]}, 3: {'items': []}}
+
+    # Page numbers, stopping at the first empty page
+    def pages(**kwargs):
+        return list(paginate(get_page=lambda page: responses[page],
+                             get_items=lambda response: response['items'],
+                             get_next=lambda response, page: page + 1,
+                             start=1, **kwargs))
+
+    assert pages() == [[1, 2], [3, 4]]
+    assert pages(limit=3) == [[1, 2], [3]]
+
+    # Next page links, stopping when there is no next page
+    responses = {'a': {'data': [1], 'next': 'b'}, 'b': {'data': [2], 'next': None}}
+    assert list(paginate(get_page=lambda url: responses[url],
+                         get_items=lambda response: response['data'],
+                         get_next=lambda response, url: response['next'],
+                         start='a')) == [[1], [2]]
+
+
+def test_prefetch_pages():
+    requested = []
+
+    def get_page(offset):
+        requested.append(offset)
+        # Earlier pages are slower, so they finish out of order
+        time.sleep(0.02 if offset < 30 else 0)
+        return list(range(offset, min(offset + 10, 45)))
+
+    def pages(**kwargs):
+        return list(prefetch_pages(get_page, lambda items: items, start=0, step=10, **kwargs))
+
+    # Offsets, in order, stopping at the first empty page
+    assert [item for page in pages(prefetch=3) for item in page] == list(range(45))
+    assert len(requested) <= 5 + 3
+
+    assert pages(prefetch=2, limit=15) == [list(range(10)), list(range(10, 15))]
+
+
+def test_api_connector_max_concurrent_requests():
+    api = APIConnector('http://myapi.com/v1', max_concurrent_requests=2)
+
+    with requests_mock.Mocker() as m:
+        m.get('http://myapi.com/v1/things', json={})
+        api.get_request('things')
+
+        # All of the connector's slots are in use, so the next request would have to wait
+        api.request_slots.acquire()
+        api.request_slots.acquire()
+        assert not api.request_slots.acquire(blocking=False)
+
+
 def test_json_format():
     assert json_format.arg_format('my_arg') == 'myArg'
 
@@ -0,0 +1,117 @@
+# ### METADATA
+
+# Connectors: MySQL
+# Description: Compares the speed of the ways MySQL.copy can load a table into MySQL
+
+# ### CONFIGURATION
+
+# Set the configuration variables below or set environmental variables of the same name and leave
+# these with empty strings.  We recommend using environmental variables if possible.
+
+config_vars = {
+    # MySQL
+    "MYSQL_USERNAME": "",
+    "MYSQL_PASSWORD": "",
+    "MYSQL_HOST": "",
+    "MYSQL_DB": "",
+    "MYSQL_PORT": "",
+}
+
+# The number of rows in the generated test table
+NUM_ROWS = 100000
+# The table the benchmark will create (and drop) in the database
+TABLE_NAME = 'parsons_copy_benchmark'
+
+
+# ### CODE
+
+import datetime  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+import random  # noqa: E402
+import string  # noqa: E402
+import time  # noqa: E402
+
+from parsons import MySQL, Table  # noqa: E402
+
+# Setup
+
+# if variables specified above, sets them as environmental variables
+for name, value in config_vars.items():
+    if value.strip() != "":
+        os.environ[name] = value
+
+logger = logging.getLogger(__name__)
+_handler = logging.StreamHandler()
+_formatter = logging.Formatter('%(levelname)s %(message)s')
+_handler.setFormatter(_formatter)
+logger.addHandler(_handler)
+logger.setLevel('INFO')
+
+mysql = MySQL()
+
+
+def build_table(num_rows):
+    # Build a table with a mix of column types, similar to a typical contact list
+
+    rows = []
+    for i in range(num_rows):
+        name = ''.join(random.choices(string.ascii_letters, k=random.randint(5, 20)))
+        rows.append([i, name, f'{name}@example.com', random.random() * 1000,
+                     datetime.date(2020, 1, 1) + datetime.timedelta(days=i % 365)])
+
+    tbl = Table([['id', 'name', 'email', 'score', 'signup_date']] + rows)
+    tbl.materialize()
+    return tbl
+
+
+def legacy_copy(tbl, table_name, chunk_size=1000):
+    # The previous implementation of MySQL.copy, which built each insert statement from the
+    # string representation of the rows. Kept here only for comparison. It doesn't escape
+    # values, so it is only safe to use on this benchmark's generated data.
+
+    with mysql.connection() as connection:
+        for t in tbl.chunk(chunk_size):
+            values = [str(tuple(str(value) for value in row)) for row in t.data]
+            sql = f"""INSERT INTO {table_name}
+                      ({','.join(t.columns)})
+                      VALUES {",".join(values)};"""
+            mysql.query_with_connection(sql, connection, commit=False)
+
+
+def time_copy(label, copy_func):
+    mysql.query(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+
+    start = time.monotonic()
+    copy_func()
+    elapsed = time.monotonic() - start
+
+    count = mysql.query(f"SELECT COUNT(*) FROM {TABLE_NAME}").first
+    logger.info(f"{label}: {count} rows in {elapsed:.2f} seconds "
+                f"({count / elapsed:,.0f} rows/sec)")
+
+
+def main():
+    logger.info(f"Building a {NUM_ROWS} row table")
+    tbl = build_table(NUM_ROWS)
+
+    def create_and_legacy_copy():
+        mysql.query(mysql.create_statement(tbl, TABLE_NAME))
+        legacy_copy(tbl, TABLE_NAME)
+
+    time_copy('Legacy string inserts', create_and_legacy_copy)
+    time_copy('Parameterized inserts, 1000 rows per batch',
+              lambda: mysql.copy(tbl, TABLE_NAME, chunk_size=1000))
+    time_copy('Parameterized inserts, batches sized by max_allowed_packet',
+              lambda: mysql.copy(tbl, TABLE_NAME))
+
+    try:
+        time_copy('LOAD DATA LOCAL INFILE', lambda: mysql.copy(tbl, TABLE_NAME, load_data=True))
+    except Exception as e:
+        logger.info(f"LOAD DATA LOCAL INFILE is not available on this server: {e}")
+
+    mysql.query(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+
+
+if __name__ == '__main__':
+    main()